@@ -0,0 +1,171 @@
+"""Capture raw stream data and replay it through an event manager.
+
+A capture file starts with a magic header followed by records of a fixed
+size record header and the raw payload. The record header holds arrival
+time as seconds since epoch, record kind and payload length, all little
+endian. Capture files are read through a memory map so large captures are
+never loaded into memory as a whole.
+"""
+
+import asyncio
+import enum
+import mmap
+import struct
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple, Self
+
+from .websocket import parse_notify_frame
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from os import PathLike
+    from types import TracebackType
+
+    from .interfaces.event_manager import EventManager
+
+MAGIC = b"AXISCAP1"
+RECORD_HEADER = struct.Struct("<dBI")
+
+
+class CaptureKind(enum.IntEnum):
+    """Origin of captured data."""
+
+    RTP = 1
+    WEBSOCKET = 2
+
+
+class CaptureRecord(NamedTuple):
+    """Captured data with its arrival time."""
+
+    timestamp: float
+    kind: CaptureKind
+    data: bytes
+
+
+class CaptureWriter:
+    """Append raw stream data to a capture file."""
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """Create capture file."""
+        self.path = path
+        self.records = 0
+        self._file = open(path, "wb")  # noqa: SIM115
+        self._file.write(MAGIC)
+
+    def write(
+        self, kind: CaptureKind, data: bytes, timestamp: float | None = None
+    ) -> None:
+        """Write a record, timestamp defaults to now."""
+        if timestamp is None:
+            timestamp = time.time()
+        self._file.write(RECORD_HEADER.pack(timestamp, kind, len(data)))
+        self._file.write(data)
+        self.records += 1
+
+    def write_rtp(self, data: bytes) -> None:
+        """Write a reassembled RTP payload."""
+        self.write(CaptureKind.RTP, data)
+
+    def write_websocket(self, data: str | bytes) -> None:
+        """Write a websocket notification frame."""
+        if isinstance(data, str):
+            data = data.encode()
+        self.write(CaptureKind.WEBSOCKET, data)
+
+    def close(self) -> None:
+        """Flush and close capture file."""
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close capture file when leaving context manager."""
+        self.close()
+
+
+class CaptureReader:
+    """Read records from a memory mapped capture file."""
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """Memory map capture file."""
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            msg = f"{path} is not a capture file"
+            raise ValueError(msg)
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        """Iterate over records, a truncated trailing record is ignored."""
+        buffer = self._mmap
+        size = len(buffer)
+        offset = len(MAGIC)
+        while offset + RECORD_HEADER.size <= size:
+            timestamp, kind, length = RECORD_HEADER.unpack_from(buffer, offset)
+            offset += RECORD_HEADER.size
+            if offset + length > size:
+                return
+            yield CaptureRecord(
+                timestamp, CaptureKind(kind), buffer[offset : offset + length]
+            )
+            offset += length
+
+    def close(self) -> None:
+        """Close memory map."""
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close memory map when leaving context manager."""
+        self.close()
+
+
+def decode_record(record: CaptureRecord) -> bytes | dict[str, Any] | None:
+    """Convert record to data accepted by EventManager.handler."""
+    if record.kind == CaptureKind.WEBSOCKET:
+        return parse_notify_frame(record.data)
+    return record.data
+
+
+async def replay(
+    path: str | PathLike[str],
+    event_manager: EventManager,
+    speed: float | None = 1.0,
+) -> int:
+    """Feed a capture through event manager, return number of events replayed.
+
+    Speed 1.0 replays at original pace, other values scale the pace and None
+    replays as fast as possible.
+    """
+    replayed = 0
+    with CaptureReader(path) as reader:
+        start: tuple[float, float] | None = None
+        for record in reader:
+            if (data := decode_record(record)) is None:
+                continue
+            if speed is not None:
+                if start is None:
+                    start = (record.timestamp, time.monotonic())
+                delay = (record.timestamp - start[0]) / speed - (
+                    time.monotonic() - start[1]
+                )
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            event_manager.handler(data)
+            replayed += 1
+    return replayed
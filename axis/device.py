@@ -17,8 +17,8 @@ class AxisDevice:
         """Initialize device functionality."""
         self.config = configuration
         self.vapix = Vapix(self)
-        self.stream = StreamManager(self)
         self.event = EventManager()
+        self.stream = StreamManager(self)
 
     def enable_events(self) -> None:
         """Enable events for stream."""
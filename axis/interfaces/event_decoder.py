@@ -0,0 +1,183 @@
+"""Decode event data in a worker pool and deliver events in order."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+from xml.parsers import expat
+
+from ..models.configuration import DEFAULT_BUFFER_SIZE, EventDecodeMode, OverflowPolicy
+from ..models.event import Event, event_key
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from .event_manager import EventManager
+
+type EventData = bytes | dict[str, Any] | Event
+
+LOGGER = logging.getLogger(__name__)
+
+_NO_KEY = object()
+
+_EXECUTORS: dict[EventDecodeMode, Executor] = {}
+
+
+def get_executor(mode: EventDecodeMode) -> Executor:
+    """Get worker pool shared by all devices using decode mode."""
+    if (executor := _EXECUTORS.get(mode)) is None:
+        if mode == EventDecodeMode.PROCESS:
+            executor = ProcessPoolExecutor()
+        else:
+            executor = ThreadPoolExecutor(thread_name_prefix="axis-event-decode")
+        _EXECUTORS[mode] = executor
+    return executor
+
+
+def shutdown_executors() -> None:
+    """Shut down shared worker pools."""
+    while _EXECUTORS:
+        _, executor = _EXECUTORS.popitem()
+        executor.shutdown(cancel_futures=True)
+
+
+@dataclass
+class EventDecoderStats:
+    """Metrics of event decode pipeline."""
+
+    submitted: int = 0
+    delivered: int = 0
+    failed: int = 0
+    dropped: int = 0
+    collapsed: int = 0
+    max_depth: int = 0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+
+
+class EventDecoder:
+    """Decode event data off the event loop.
+
+    Decoded events are handed to the event manager on the event loop in the
+    order data was submitted, regardless of which worker finishes first.
+    No more than "maxlen" data wait to be delivered, the overflow policy
+    decides which data is dropped once decoding falls behind. With
+    backpressure nothing is dropped, submitters are expected to hold data
+    back while the decoder is full and resume on a room callback.
+    """
+
+    def __init__(
+        self,
+        event_manager: EventManager,
+        mode: EventDecodeMode = EventDecodeMode.THREAD,
+        maxlen: int = DEFAULT_BUFFER_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ) -> None:
+        """Initialize event decoder."""
+        self.event_manager = event_manager
+        self.mode = mode
+        self.maxlen = maxlen
+        self.policy = policy
+        self.stats = EventDecoderStats()
+        self.room_callbacks: list[Callable[[], None]] = []
+        self._pending: deque[tuple[float, asyncio.Future[Event], EventData]] = deque()
+        self._keys: dict[int, Hashable] = {}
+
+    @property
+    def depth(self) -> int:
+        """Number of submitted data not yet delivered."""
+        return len(self._pending)
+
+    @property
+    def full(self) -> bool:
+        """Whether as much data as allowed is waiting to be delivered."""
+        return len(self._pending) >= self.maxlen
+
+    def submit(self, data: EventData) -> None:
+        """Queue data for decoding in worker pool, events only wait their turn."""
+        self.stats.submitted += 1
+        if self.full and self.policy != OverflowPolicy.BACKPRESSURE:
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                return
+            if self.policy != OverflowPolicy.LATEST_PER_KEY or not self._collapse(data):
+                self.stats.dropped += 1
+                self._discard(self._pending.popleft()[1])
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Event]
+        if isinstance(data, Event):
+            future = loop.create_future()
+            future.set_result(data)
+        else:
+            future = loop.run_in_executor(
+                get_executor(self.mode),
+                Event.decode,
+                data,
+                self.event_manager.retain_data,
+            )
+        self._pending.append((time.monotonic(), future, data))
+        self.stats.max_depth = max(self.stats.max_depth, len(self._pending))
+        future.add_done_callback(self._deliver_ready)
+
+    def cancel(self) -> None:
+        """Drop data not yet delivered."""
+        while self._pending:
+            _, future, _ = self._pending.popleft()
+            future.cancel()
+        self._keys.clear()
+
+    def _discard(self, future: asyncio.Future[Event]) -> None:
+        """Stop waiting for data dropped from pending data."""
+        future.cancel()
+        self._keys.pop(id(future), None)
+
+    def _collapse(self, data: EventData) -> bool:
+        """Drop pending data with the same key as data.
+
+        Keys are cached for pending data, malformed data has no key.
+        """
+        if (key := _event_key(data)) is _NO_KEY:
+            return False
+        for index in range(len(self._pending) - 1, -1, -1):
+            _, future, pending = self._pending[index]
+            if (pending_key := self._keys.get(id(future))) is None:
+                pending_key = self._keys[id(future)] = _event_key(pending)
+            if pending_key == key:
+                del self._pending[index]
+                self._discard(future)
+                self.stats.collapsed += 1
+                return True
+        return False
+
+    def _deliver_ready(self, _future: asyncio.Future[Event]) -> None:
+        """Deliver decoded events up to the first one still being decoded."""
+        was_full = self.full
+        while self._pending and self._pending[0][1].done():
+            submitted, future, _ = self._pending.popleft()
+            if self._keys:
+                self._keys.pop(id(future), None)
+            if (err := future.exception()) is not None:
+                self.stats.failed += 1
+                LOGGER.warning("Failed to decode event data: %s", err)
+                continue
+            latency = time.monotonic() - submitted
+            self.stats.last_latency = latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            self.stats.delivered += 1
+            self.event_manager.dispatch(future.result())
+
+        if was_full and not self.full:
+            for callback in self.room_callbacks:
+                callback()
+
+
+def _event_key(data: EventData) -> Hashable:
+    """Return key of event data, a key matching nothing if data can not be parsed."""
+    try:
+        return event_key(data)
+    except expat.ExpatError:
+        return _NO_KEY
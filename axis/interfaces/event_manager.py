@@ -1,6 +1,8 @@
 """Python library to enable Axis devices to integrate with Home Assistant."""
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 import logging
 from typing import Any
 
@@ -13,8 +15,11 @@ type SubscriptionType = tuple[
     tuple[EventOperation, ...] | None,
 ]
 type UnsubscribeType = Callable[[], None]
+type RouteKey = tuple[str, EventTopic, EventOperation]
+type StateKey = tuple[EventTopic, str]
 
 ID_FILTER_ALL = "*"
+MAX_TRACKED_STATES = 1024
 
 BLACK_LISTED_TOPICS = [
     "tns1:RuleEngine/tnsaxis:VideoMotionDetection/timer",
@@ -25,18 +30,56 @@ BLACK_LISTED_TOPICS = [
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class EventManagerStats:
+    """Counters of events held back from subscribers."""
+
+    coalesced: int = 0
+    failed: int = 0
+    unchanged: int = 0
+
+
 class EventManager:
     """Initialize new events and update states of existing events."""
 
-    def __init__(self) -> None:
-        """Ready information about events."""
-        self._known_topics: set[str] = set()
+    def __init__(self, retain_data: bool = True) -> None:
+        """Ready information about events.
+
+        "retain_data" - keep the raw event dict on events passed to subscribers.
+        "suppress_unchanged" - drop changed events repeating the current state.
+        "debounce" - per topic window in seconds where only the latest event
+        of a topic and id is passed along once the window closes.
+        """
+        self.retain_data = retain_data
+        self.suppress_unchanged = False
+        self.debounce: dict[EventTopic, float] = {}
+        self.stats = EventManagerStats()
+        self._states: dict[StateKey, Event] = {}
+        self._pending: dict[StateKey, Event] = {}
+        self._debounce_timers: dict[StateKey, asyncio.TimerHandle] = {}
         self._unsupported_topics: set[str] = set()
         self._subscribers: dict[str, list[SubscriptionType]] = {ID_FILTER_ALL: []}
+        self._routes: dict[RouteKey, tuple[SubscriptionCallback, ...]] = {}
+        self.subscription_callbacks: list[Callable[[], None]] = []
 
-    def handler(self, data: bytes | dict[str, Any]) -> None:
+    def handler(self, data: bytes | dict[str, Any] | Event) -> None:
         """Create event and pass it along to subscribers."""
-        event = Event.decode(data)
+        self.dispatch(Event.decode(data, self.retain_data))
+
+    def handle_batch(self, data: Iterable[bytes | dict[str, Any] | Event]) -> None:
+        """Create events from a batch of data and pass them along in order."""
+        for event in Event.decode_many(
+            data, self.retain_data, on_error=self._decode_failed
+        ):
+            self.dispatch(event)
+
+    def _decode_failed(self, data: bytes, err: Exception) -> None:
+        """Log event data that could not be decoded, batch continues."""
+        self.stats.failed += 1
+        LOGGER.warning("Failed to decode event data: %s", err)
+
+    def dispatch(self, event: Event) -> None:
+        """Pass a decoded event along to subscribers."""
         if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug(event)
 
@@ -49,25 +92,120 @@ class EventManager:
         if event.topic in BLACK_LISTED_TOPICS:
             return
 
-        known = (unique_topic := f"{event.topic}_{event.id}") not in self._known_topics
-        self._known_topics.add(unique_topic)
-
+        state_key = (event.topic_base, event.id)
         if event.operation == EventOperation.UNKNOWN:
             # MQTT events does not report operation
             event.operation = (
-                EventOperation.INITIALIZED if known else EventOperation.CHANGED
+                EventOperation.CHANGED
+                if state_key in self._states
+                else EventOperation.INITIALIZED
             )
+        self._deliver(state_key, event)
 
-        subscribers: list[SubscriptionType] = (
-            self._subscribers.get(event.id, []) + self._subscribers[ID_FILTER_ALL]
-        )
-        for callback, topic_filter, operation_filter in subscribers:
-            if topic_filter is not None and event.topic_base not in topic_filter:
-                continue
-            if operation_filter is not None and event.operation not in operation_filter:
-                continue
+    def _deliver(self, state_key: StateKey, event: Event) -> None:
+        """Apply change suppression and debounce before calling subscribers."""
+        if (
+            self.suppress_unchanged
+            and event.operation == EventOperation.CHANGED
+            and (current := self._pending.get(state_key) or self._states.get(state_key))
+            and current.state == event.state
+        ):
+            self.stats.unchanged += 1
+            return
+
+        if (window := self.debounce.get(event.topic_base)) is not None:
+            if state_key in self._debounce_timers:
+                if state_key in self._pending:
+                    self.stats.coalesced += 1
+                self._pending[state_key] = event
+                return
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass  # No event loop to close a window, pass event along as is
+            else:
+                self._debounce_timers[state_key] = loop.call_later(
+                    window, self._debounce_expired, state_key
+                )
+
+        self._update_state(state_key, event)
+
+        route = (event.id, event.topic_base, event.operation)
+        if (callbacks := self._routes.get(route)) is None:
+            callbacks = self._routes[route] = self._build_route(route)
+        for callback in callbacks:
             callback(event)
 
+    def _debounce_expired(self, state_key: StateKey) -> None:
+        """Pass along latest event held back during debounce window."""
+        del self._debounce_timers[state_key]
+        if (event := self._pending.pop(state_key, None)) is not None:
+            self._deliver(state_key, event)
+
+    def cancel_debounce(self) -> None:
+        """Close all debounce windows, dropping events held back by them."""
+        for timer in self._debounce_timers.values():
+            timer.cancel()
+        self._debounce_timers.clear()
+        self._pending.clear()
+
+    def _update_state(self, state_key: StateKey, event: Event) -> None:
+        """Store event as last state, evicting the least recently updated state."""
+        if (
+            self._states.pop(state_key, None) is None
+            and len(self._states) >= MAX_TRACKED_STATES
+        ):
+            del self._states[next(iter(self._states))]
+        self._states[state_key] = event
+
+    def get_state(self, topic_base: EventTopic, obj_id: str) -> Event | None:
+        """Return last event of topic and id, None if not yet seen."""
+        return self._states.get((topic_base, obj_id))
+
+    def snapshot(self) -> dict[StateKey, Event]:
+        """Return a copy of the last event per topic and id."""
+        return dict(self._states)
+
+    def topic_filter(self) -> tuple[EventTopic, ...] | None:
+        """Topics of interest to subscribers, None when all topics are."""
+        topics: set[EventTopic] = set()
+        for subscriptions in self._subscribers.values():
+            for _, topic_filter, _ in subscriptions:
+                if topic_filter is None:
+                    return None
+                topics.update(topic_filter)
+        return tuple(sorted(topics)) if topics else None
+
+    def _subscriptions_changed(self) -> None:
+        """Tell listeners that subscriptions changed."""
+        for callback in self.subscription_callbacks:
+            callback()
+
+    def _build_route(self, route: RouteKey) -> tuple[SubscriptionCallback, ...]:
+        """List callbacks of subscriptions matching an event route."""
+        obj_id, topic_base, operation = route
+        return tuple(
+            callback
+            for callback, topic_filter, operation_filter in (
+                *self._subscribers.get(obj_id, ()),
+                *self._subscribers[ID_FILTER_ALL],
+            )
+            if (topic_filter is None or topic_base in topic_filter)
+            and (operation_filter is None or operation in operation_filter)
+        )
+
+    def _invalidate_routes(self, obj_id: str, subscription: SubscriptionType) -> None:
+        """Drop cached routes that a subscription change affects."""
+        _, topic_filter, operation_filter = subscription
+        for route in [
+            route
+            for route in self._routes
+            if obj_id in (route[0], ID_FILTER_ALL)
+            and (topic_filter is None or route[1] in topic_filter)
+            and (operation_filter is None or route[2] in operation_filter)
+        ]:
+            del self._routes[route]
+
     def subscribe(
         self,
         callback: SubscriptionCallback,
@@ -98,14 +236,21 @@ class EventManager:
             if obj_id not in self._subscribers:
                 self._subscribers[obj_id] = []
             self._subscribers[obj_id].append(subscription)
+            self._invalidate_routes(obj_id, subscription)
+        self._subscriptions_changed()
 
         def unsubscribe() -> None:
+            changed = False
             for obj_id in _id_filter:
                 if obj_id not in self._subscribers:
                     continue
                 if subscription not in self._subscribers[obj_id]:
                     continue
                 self._subscribers[obj_id].remove(subscription)
+                self._invalidate_routes(obj_id, subscription)
+                changed = True
+            if changed:
+                self._subscriptions_changed()
 
         return unsubscribe
 
@@ -11,6 +11,9 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_BUFFER_SIZE = 200
+ANY_INTERFACE = "0.0.0.0"  # noqa: S104
+
 
 class AuthScheme(enum.StrEnum):
     """Supported HTTP authentication schemes."""
@@ -39,11 +42,73 @@ class WebProtocol(enum.StrEnum):
         return WebProtocol.HTTP
 
 
+class EventDecodeMode(enum.StrEnum):
+    """Supported ways of decoding event data."""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    @classmethod
+    def _missing_(cls, value: object) -> EventDecodeMode:
+        """Set default enum member if an unknown value is provided."""
+        LOGGER.debug("Unsupported event decode mode '%s'", value)
+        return EventDecodeMode.INLINE
+
+
+class RtspTransport(enum.StrEnum):
+    """Supported lower transports of RTP over RTSP."""
+
+    UDP = "udp"
+    TCP = "tcp"
+    MULTICAST = "multicast"
+
+    @classmethod
+    def _missing_(cls, value: object) -> RtspTransport:
+        """Set default enum member if an unknown value is provided."""
+        LOGGER.debug("Unsupported RTSP transport '%s'", value)
+        return RtspTransport.UDP
+
+
+class OverflowPolicy(enum.StrEnum):
+    """What to do with new event data when the event buffer is full.
+
+    Latest per key replaces buffered data of the same topic and source,
+    falling back to dropping the oldest data. Backpressure stops reading
+    websocket streams until there is room, RTSP streams drop the oldest data.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    LATEST_PER_KEY = "latest_per_key"
+    BACKPRESSURE = "backpressure"
+
+    @classmethod
+    def _missing_(cls, value: object) -> OverflowPolicy:
+        """Set default enum member if an unknown value is provided."""
+        LOGGER.debug("Unsupported overflow policy '%s'", value)
+        return OverflowPolicy.DROP_OLDEST
+
+
 @dataclass
 class Configuration:
     """Device configuration.
 
     A port value of 0 means use the default port for the configured protocol.
+    Event decode mode "thread" or "process" moves decoding of event data off
+    the event loop, events are still delivered in order on the event loop.
+    Event buffer size bounds event data received but not yet handled, the
+    overflow policy decides what is dropped when it is full.
+    RTSP transport "tcp" interleaves RTP with the RTSP connection instead of
+    receiving it on a UDP socket, "multicast" joins the multicast group the
+    device streams to, sharing one stream between all its clients.
+    Multicast interface is the local address multicast groups are joined on.
+    Stream timeout fails an RTSP stream after that many seconds without RTP
+    or RTCP data, 0 leaves detection to RTSP keep-alive.
+    Shared RTP receiver serves the RTP of all devices from one pair of UDP
+    sockets instead of a pair per device.
+    RTSP event filter limits RTSP event streams to the topics of event
+    subscriptions on the device, applied when the stream connects.
     """
 
     session: ClientSession
@@ -58,6 +123,14 @@ class Configuration:
     auth_scheme: AuthScheme = AuthScheme.AUTO
     websocket_enabled: bool = False
     websocket_force: bool = False
+    event_decode: EventDecodeMode = EventDecodeMode.INLINE
+    event_buffer_size: int = DEFAULT_BUFFER_SIZE
+    event_overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    rtsp_transport: RtspTransport = RtspTransport.UDP
+    stream_timeout: float = 0
+    shared_rtp_receiver: bool = False
+    multicast_interface: str = ANY_INTERFACE
+    rtsp_event_filter: bool = False
 
     def __post_init__(self) -> None:
         """Normalize auth and protocol values to enums and resolve default port."""
@@ -66,6 +139,12 @@ class Configuration:
         if self.port == 0:
             self.port = 443 if self.web_proto == WebProtocol.HTTPS else 80
         self.auth_scheme = AuthScheme(self.auth_scheme)
+        self.event_decode = EventDecodeMode(self.event_decode)
+        self.event_overflow_policy = OverflowPolicy(self.event_overflow_policy)
+        self.rtsp_transport = RtspTransport(self.rtsp_transport)
+        if self.event_buffer_size < 1:
+            msg = "Event buffer size must be at least 1"
+            raise ValueError(msg)
 
     def _validate_host(self) -> None:
         """Validate that host is a plain hostname or IP address."""
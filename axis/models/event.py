@@ -2,9 +2,13 @@
 
 from dataclasses import dataclass
 import enum
-from typing import Any, Self
+from functools import lru_cache
+import sys
+from typing import TYPE_CHECKING, Any, Self
+from xml.parsers import expat
 
-import xmltodict
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
 
 
 class EventOperation(enum.StrEnum):
@@ -53,6 +57,8 @@ class EventTopic(enum.StrEnum):
         return EventTopic.UNKNOWN
 
 
+TOPIC_CACHE_SIZE = 1024
+
 TOPIC_TO_STATE = {
     EventTopic.LIGHT_STATUS: "ON",
     EventTopic.RELAY: "active",
@@ -76,7 +82,6 @@ EVENT_VALUE = "value"
 NOTIFICATION_MESSAGE = ("MetadataStream", "Event", "NotificationMessage")
 MESSAGE = (*NOTIFICATION_MESSAGE, "Message", "Message")
 TOPIC = (*NOTIFICATION_MESSAGE, "Topic", "#text")
-OPERATION = (*MESSAGE, "PropertyOperation")
 SOURCE = (*MESSAGE, "Source")
 DATA = (*MESSAGE, "Data")
 
@@ -86,6 +91,11 @@ XML_NAMESPACES = {
 }
 
 
+TOPIC_ELEMENT = TOPIC[:-1]
+SOURCE_ITEM = (*SOURCE, "SimpleItem")
+DATA_ITEM = (*DATA, "SimpleItem")
+
+
 def traverse(data: Any, keys: tuple[str, ...] | list[str]) -> Any:
     """Traverse dictionary using keys to retrieve last item."""
     if not isinstance(data, dict):
@@ -96,21 +106,128 @@ def traverse(data: Any, keys: tuple[str, ...] | list[str]) -> Any:
     return traverse(item, tail) if tail else item
 
 
-def extract_name_value(
-    data: dict[str, list[dict[str, str]] | dict[str, str]], prefer: str | None = None
-) -> tuple[str, str]:
-    """Extract name and value from a simple item, take first dictionary if it is a list."""
-    item = data.get("SimpleItem", {})
-    if isinstance(item, list):
-        if not item:
-            return "", ""
-        if prefer is None:
-            item = item[0]
-        else:
-            item = next(
-                (item for item in item if item.get("Name", "") == prefer), item[0]
-            )
-    return item.get("Name", ""), item.get("Value", "")
+@lru_cache(maxsize=TOPIC_CACHE_SIZE)
+def resolve_topic(topic: str) -> tuple[EventTopic, str]:
+    """Resolve a raw topic to its topic base and trailing source index.
+
+    Indexed topics like ".../IO/Port/3" resolve through their parent topic.
+    Results are memoized, resolve_topic.cache_info() reports hits and misses.
+    """
+    if (topic_base := EventTopic(topic)) is not EventTopic.UNKNOWN:
+        return topic_base, ""
+    _topic_base, _, source_idx = topic.rpartition("/")
+    return EventTopic(_topic_base), sys.intern(source_idx)
+
+
+def element_key(name: str) -> str:
+    """Map an expat namespaced element name to its xmltodict style key.
+
+    Elements in one of XML_NAMESPACES or without namespace keep their local name,
+    other elements are prefixed with their namespace URI.
+    """
+    namespace, _, local_name = name.rpartition(" ")
+    if not namespace or namespace in XML_NAMESPACES:
+        return local_name
+    return f"{namespace}:{local_name}"
+
+
+class EventXmlParser:
+    """Streaming parser extracting event fields from ONVIF metadata XML.
+
+    Only topic, property operation and the source and data simple items are
+    collected, no document tree is built while parsing. A packet carrying
+    several notification messages is represented by its first message.
+    """
+
+    def __init__(self) -> None:
+        """Initialize parser state."""
+        self._path: list[str] = []
+        self._has_content = False
+        self._is_stream = False
+        self._message_done = False
+        self._topic: list[str] = []
+        self._operation: str | None = None
+        self._source_items: list[tuple[str, str]] = []
+        self._data_items: list[tuple[str, str]] = []
+
+    def parse(self, data: bytes) -> dict[str, str]:
+        """Parse metadata XML into the internal event dict format.
+
+        Return an empty dict if the metadata stream carries no content.
+        """
+        self._path.clear()
+        self._has_content = self._is_stream = self._message_done = False
+        self._topic.clear()
+        self._operation = None
+        self._source_items.clear()
+        self._data_items.clear()
+
+        parser = expat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._character_data
+        parser.Parse(data, True)
+
+        if not (self._is_stream and self._has_content):
+            return {}
+
+        source, source_idx = next(iter(self._source_items), ("", ""))
+        data_type, data_value = next(
+            (item for item in self._data_items if item[0] == "active"),
+            next(iter(self._data_items), ("", "")),
+        )
+
+        return {
+            EVENT_OPERATION: self._operation or "",
+            EVENT_TOPIC: "".join(self._topic).strip(),
+            EVENT_SOURCE: source,
+            EVENT_SOURCE_IDX: source_idx,
+            EVENT_TYPE: data_type,
+            EVENT_VALUE: data_value,
+        }
+
+    def _start_element(self, name: str, attributes: dict[str, str]) -> None:
+        """Track element path and collect attributes of interest."""
+        path = self._path
+        path.append(element_key(name))
+        if (depth := len(path)) == 1:
+            self._is_stream = path[0] == NOTIFICATION_MESSAGE[0]
+            self._has_content = bool(attributes)
+            return
+        if depth == 2:
+            self._has_content = True
+        if not self._is_stream or self._message_done or depth < len(MESSAGE):
+            return
+
+        if depth == len(MESSAGE):
+            if self._operation is None and tuple(path) == MESSAGE:
+                self._operation = attributes.get("PropertyOperation", "")
+        elif depth == len(SOURCE_ITEM):
+            item = (attributes.get("Name", ""), attributes.get("Value", ""))
+            if (current := tuple(path)) == SOURCE_ITEM:
+                self._source_items.append(item)
+            elif current == DATA_ITEM:
+                self._data_items.append(item)
+
+    def _end_element(self, name: str) -> None:
+        """Step out of current element, ignore messages after the first one."""
+        path = self._path
+        if (
+            len(path) == len(NOTIFICATION_MESSAGE)
+            and tuple(path) == NOTIFICATION_MESSAGE
+        ):
+            self._message_done = True
+        path.pop()
+
+    def _character_data(self, data: str) -> None:
+        """Collect topic text."""
+        if (
+            len(self._path) == len(TOPIC_ELEMENT)
+            and not self._message_done
+            and tuple(self._path) == TOPIC_ELEMENT
+        ):
+            self._topic.append(data)
 
 
 def is_tripped(value: object, topic_base: EventTopic, event_type: object) -> bool:
@@ -135,9 +252,22 @@ def is_tripped(value: object, topic_base: EventTopic, event_type: object) -> boo
     return bool(value_text)
 
 
-@dataclass
+def event_key(data: bytes | dict[str, Any] | Event) -> tuple[str, str]:
+    """Identify which state event data updates, by topic and source index."""
+    if isinstance(data, Event):
+        return data.topic, data.id
+    if not isinstance(data, dict):
+        data = EventXmlParser().parse(data)
+    return data.get(EVENT_TOPIC, ""), data.get(EVENT_SOURCE_IDX, "")
+
+
+@dataclass(slots=True)
 class Event:
-    """Event data from Axis device."""
+    """Event data from Axis device.
+
+    Data holds the raw event dict the event was decoded from, it is left empty
+    when decoding with retain_data disabled.
+    """
 
     id: str
     is_tripped: bool
@@ -149,27 +279,21 @@ class Event:
     data: dict[str, Any]
 
     @classmethod
-    def decode(cls, data: bytes | dict[str, Any]) -> Self:
-        """Decode data to an event object."""
-        if isinstance(data, dict):
-            return cls._decode_from_dict(data)
-        return cls._decode_from_bytes(data)
-
-    @classmethod
-    def _decode_from_dict(cls, data: dict[str, Any]) -> Self:
-        """Create event instance from dict."""
-        operation = EventOperation(data.get(EVENT_OPERATION, ""))
-        topic = data.get(EVENT_TOPIC, "")
-        source = data.get(EVENT_SOURCE, "")
-        source_idx = data.get(EVENT_SOURCE_IDX, "")
-        event_type = data.get(EVENT_TYPE, "")
-        value = data.get(EVENT_VALUE, "")
-
-        if (topic_base := EventTopic(topic)) is EventTopic.UNKNOWN:
-            _topic_base, _, _source_idx = topic.rpartition("/")
-            topic_base = EventTopic(_topic_base)
-            if source_idx == "":
-                source_idx = _source_idx
+    def create(
+        cls,
+        topic: str,
+        source: str,
+        source_idx: str,
+        event_type: str,
+        value: str,
+        *,
+        operation: EventOperation = EventOperation.UNKNOWN,
+        data: dict[str, Any] | None = None,
+    ) -> Self:
+        """Create event from its fields, resolving topic base and id."""
+        topic_base, _source_idx = resolve_topic(topic)
+        if source_idx == "":
+            source_idx = _source_idx
 
         if source_idx == "-1":
             source_idx = "ANY" if source != "port" else ""
@@ -182,44 +306,64 @@ class Event:
             state=value,
             topic=topic,
             topic_base=topic_base,
-            data=data,
+            data=data if data is not None else {},
         )
 
     @classmethod
-    def _decode_from_bytes(cls, data: bytes) -> Self:
-        """Parse metadata xml."""
-        raw = xmltodict.parse(
-            data,
-            attr_prefix="",  # Remove "@" prefix from XML attributes for easier access
-            process_namespaces=True,
-            namespaces=XML_NAMESPACES,
-        )
+    def decode(
+        cls, data: bytes | dict[str, Any] | Self, retain_data: bool = True
+    ) -> Self:
+        """Decode data to an event object, events are passed through."""
+        if isinstance(data, bytes):
+            return cls._decode_from_bytes(data, retain_data)
+        if isinstance(data, dict):
+            return cls._decode_from_dict(data, retain_data)
+        return data
+
+    @classmethod
+    def decode_many(
+        cls,
+        data: Iterable[bytes | dict[str, Any] | Self],
+        retain_data: bool = True,
+        *,
+        on_error: Callable[[bytes, expat.ExpatError], None] | None = None,
+    ) -> Iterator[Self]:
+        """Decode a batch of data to event objects, in order.
+
+        One XML parser is shared by all metadata payloads in the batch.
+        Malformed metadata is passed to "on_error" and skipped so the rest of
+        the batch is still decoded, without "on_error" the error is raised.
+        """
+        parser = EventXmlParser()
+        for item in data:
+            if isinstance(item, bytes):
+                try:
+                    parsed = parser.parse(item)
+                except expat.ExpatError as err:
+                    if on_error is None:
+                        raise
+                    on_error(item, err)
+                    continue
+                yield cls._decode_from_dict(parsed, retain_data)
+            elif isinstance(item, dict):
+                yield cls._decode_from_dict(item, retain_data)
+            else:
+                yield item
 
-        # Normalize the ONVIF metadata root: always use a dict, drop any stray
-        # XML namespace attribute ("xmlns") added by xmltodict, and bail out
-        # early if the payload is empty.
-        stream = raw.get("MetadataStream") or {}
-        if not stream or not any(key != "xmlns" for key in stream):
-            return cls._decode_from_dict({})
-
-        topic = traverse(raw, TOPIC)
-        operation = traverse(raw, OPERATION)
-
-        source = source_idx = ""
-        if match := traverse(raw, SOURCE):
-            source, source_idx = extract_name_value(match)
-
-        data_type = data_value = ""
-        if match := traverse(raw, DATA):
-            data_type, data_value = extract_name_value(match, "active")
-
-        return cls._decode_from_dict(
-            {
-                EVENT_OPERATION: operation,
-                EVENT_TOPIC: topic,
-                EVENT_SOURCE: source,
-                EVENT_SOURCE_IDX: source_idx,
-                EVENT_TYPE: data_type,
-                EVENT_VALUE: data_value,
-            }
+    @classmethod
+    def _decode_from_dict(cls, data: dict[str, Any], retain_data: bool = True) -> Self:
+        """Create event instance from dict."""
+        return cls.create(
+            data.get(EVENT_TOPIC, ""),
+            data.get(EVENT_SOURCE, ""),
+            data.get(EVENT_SOURCE_IDX, ""),
+            data.get(EVENT_TYPE, ""),
+            data.get(EVENT_VALUE, ""),
+            operation=EventOperation(data.get(EVENT_OPERATION, "")),
+            data=data if retain_data else None,
         )
+
+    @classmethod
+    def _decode_from_bytes(cls, data: bytes, retain_data: bool = True) -> Self:
+        """Parse metadata xml."""
+        return cls._decode_from_dict(EventXmlParser().parse(data), retain_data)
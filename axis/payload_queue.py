@@ -0,0 +1,118 @@
+"""Bounded queue of stream payloads waiting to be consumed."""
+
+from collections import deque
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, cast
+
+from .models.configuration import DEFAULT_BUFFER_SIZE, OverflowPolicy
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+_LOGGER = logging.getLogger(__name__)
+
+_NO_KEY = object()
+
+
+@dataclass
+class PayloadQueueStats:
+    """Counters of a payload queue."""
+
+    enqueued: int = 0
+    dropped: int = 0
+    collapsed: int = 0
+    unkeyed: int = 0
+    max_depth: int = 0
+    paused: int = 0
+
+
+class PayloadQueue[T]:
+    """FIFO queue with a bound and an overflow policy.
+
+    Keys are only computed once the queue is full, and cached for queued
+    payloads, so the key function can afford to parse the payload. A payload
+    the key function fails on is never collapsed.
+    """
+
+    def __init__(
+        self,
+        maxlen: int = DEFAULT_BUFFER_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key: Callable[[T], Hashable] | None = None,
+    ) -> None:
+        """Initialize queue."""
+        if maxlen < 1:
+            msg = "Queue size must be at least 1"
+            raise ValueError(msg)
+        if policy == OverflowPolicy.LATEST_PER_KEY and key is None:
+            msg = "Overflow policy latest per key requires a key function"
+            raise ValueError(msg)
+        self.maxlen = maxlen
+        self.policy = policy
+        self.key = key
+        self.stats = PayloadQueueStats()
+        self._items: deque[T] = deque()
+        self._keys: dict[int, Hashable] = {}
+
+    def __len__(self) -> int:
+        """Return number of queued payloads."""
+        return len(self._items)
+
+    def append(self, item: T) -> None:
+        """Queue payload, applying overflow policy when full."""
+        self.stats.enqueued += 1
+        if len(self._items) >= self.maxlen:
+            if self.policy == OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                return
+            if self.policy != OverflowPolicy.LATEST_PER_KEY or not self._collapse(item):
+                self.stats.dropped += 1
+                self._keys.pop(id(self._items.popleft()), None)
+        self._items.append(item)
+        self.stats.max_depth = max(self.stats.max_depth, len(self._items))
+
+    def popleft(self) -> T:
+        """Remove and return oldest payload, raise IndexError if empty."""
+        item = self._items.popleft()
+        if self._keys:
+            self._keys.pop(id(item), None)
+        return item
+
+    def drain(self, limit: int | None = None) -> list[T]:
+        """Remove and return all payloads, or the oldest "limit" ones, oldest first."""
+        if limit is not None and limit < len(self._items):
+            return [self.popleft() for _ in range(limit)]
+        items = list(self._items)
+        self.clear()
+        return items
+
+    def clear(self) -> None:
+        """Remove all payloads."""
+        self._items.clear()
+        self._keys.clear()
+
+    def _collapse(self, item: T) -> bool:
+        """Remove a queued payload with the same key as item."""
+        if (key := self._key(item)) is _NO_KEY:
+            return False
+        for index in range(len(self._items) - 1, -1, -1):
+            queued = self._items[index]
+            if (queued_key := self._keys.get(id(queued))) is None:
+                queued_key = self._keys[id(queued)] = self._key(queued)
+            if queued_key == key:
+                del self._items[index]
+                self._keys.pop(id(queued), None)
+                self.stats.collapsed += 1
+                return True
+        return False
+
+    def _key(self, item: T) -> Hashable:
+        """Return key of payload, or a key matching nothing if it fails."""
+        key_func = cast("Callable[[T], Hashable]", self.key)
+        try:
+            return key_func(item)
+        except Exception as err:  # noqa: BLE001
+            self.stats.unkeyed += 1
+            _LOGGER.debug("Payload can not be keyed: %s", err)
+            return _NO_KEY
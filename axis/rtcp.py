@@ -0,0 +1,124 @@
+"""RTCP sender report parsing and receiver report generation.
+
+https://datatracker.ietf.org/doc/html/rfc3550#section-6.4
+"""
+
+from dataclasses import dataclass
+import random
+import struct
+from typing import TYPE_CHECKING
+
+from .rtp import SEQUENCE_MOD
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .rtp import RtpStream
+
+RTCP_VERSION = 2
+SENDER_REPORT = 200
+RECEIVER_REPORT = 201
+MAX_REPORT_BLOCKS = 31
+
+RTCP_HEADER = struct.Struct("!BBH")
+SENDER_INFO = struct.Struct("!IQIII")
+REPORT_HEADER = struct.Struct("!BBHI")
+REPORT_BLOCK = struct.Struct("!IIIIII")
+
+
+@dataclass(slots=True)
+class SenderReport:
+    """Sender information of an RTCP sender report."""
+
+    ssrc: int
+    ntp_timestamp: int
+    rtp_timestamp: int
+    packet_count: int
+    octet_count: int
+
+
+def decode(data: bytes) -> list[SenderReport]:
+    """Parse sender reports of a compound RTCP packet, skip other packets."""
+    reports: list[SenderReport] = []
+    offset = 0
+    while offset < len(data):
+        if offset + RTCP_HEADER.size > len(data):
+            msg = "RTCP packet too short"
+            raise ValueError(msg)
+        first, packet_type, length = RTCP_HEADER.unpack_from(data, offset)
+        if first >> 6 != RTCP_VERSION:
+            msg = f"Unsupported RTCP version {first >> 6}"
+            raise ValueError(msg)
+        end = offset + 4 * (length + 1)
+        if end > len(data):
+            msg = "RTCP packet exceeds datagram"
+            raise ValueError(msg)
+        if packet_type == SENDER_REPORT:
+            if offset + RTCP_HEADER.size + SENDER_INFO.size > end:
+                msg = "RTCP sender report too short"
+                raise ValueError(msg)
+            reports.append(
+                SenderReport(*SENDER_INFO.unpack_from(data, offset + RTCP_HEADER.size))
+            )
+        offset = end
+    return reports
+
+
+class ReceiverReporter:
+    """Receiver reports with one report block per RTP stream.
+
+    Fraction lost covers the interval since the previous report about the
+    same stream, delay since last sender report is in units of 1/65536 s.
+    """
+
+    def __init__(self, ssrc: int | None = None) -> None:
+        """Initialize reporter, picking a random SSRC unless given."""
+        self.ssrc = ssrc if ssrc is not None else random.getrandbits(32)
+        self.sender_reports: dict[int, tuple[SenderReport, float]] = {}
+        self._prior: dict[int, tuple[int, int]] = {}
+
+    def sender_report(self, report: SenderReport, arrival: float) -> None:
+        """Store sender report, arrival in seconds."""
+        self.sender_reports[report.ssrc] = (report, arrival)
+
+    def report(self, streams: Sequence[RtpStream], now: float) -> bytes:
+        """Build receiver report about streams, now in seconds."""
+        blocks = b"".join(
+            self._report_block(stream, now) for stream in streams[:MAX_REPORT_BLOCKS]
+        )
+        header = REPORT_HEADER.pack(
+            RTCP_VERSION << 6 | len(blocks) // REPORT_BLOCK.size,
+            RECEIVER_REPORT,
+            (REPORT_HEADER.size + len(blocks)) // 4 - 1,
+            self.ssrc,
+        )
+        return header + blocks
+
+    def _report_block(self, stream: RtpStream, now: float) -> bytes:
+        """Build report block about a single stream."""
+        stats = stream.stats
+        expected = stream.expected
+        expected_prior, received_prior = self._prior.get(stream.ssrc, (0, 0))
+        self._prior[stream.ssrc] = (expected, stats.received)
+
+        expected_interval = expected - expected_prior
+        lost_interval = expected_interval - (stats.received - received_prior)
+        fraction_lost = 0
+        if expected_interval > 0 and lost_interval > 0:
+            fraction_lost = min((lost_interval << 8) // expected_interval, 0xFF)
+
+        last_sr = delay = 0
+        if (sender_report := self.sender_reports.get(stream.ssrc)) is not None:
+            report, arrival = sender_report
+            last_sr = report.ntp_timestamp >> 16 & 0xFFFFFFFF
+            delay = int((now - arrival) * 65536) & 0xFFFFFFFF
+
+        highest = stream.cycles * SEQUENCE_MOD + (stream.next_sequence or 0) - 1
+        return REPORT_BLOCK.pack(
+            stream.ssrc,
+            fraction_lost << 24 | min(stats.lost, 0x7FFFFF),
+            highest & 0xFFFFFFFF,
+            int(stats.jitter * stream.clock_rate),
+            last_sr,
+            delay,
+        )
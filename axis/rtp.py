@@ -0,0 +1,252 @@
+"""RTP packet parsing, sequence tracking and payload reassembly.
+
+https://datatracker.ietf.org/doc/html/rfc3550
+"""
+
+from dataclasses import dataclass
+import logging
+import struct
+from typing import Self
+
+_LOGGER = logging.getLogger(__name__)
+
+RTP_HEADER_SIZE = 12
+RTP_HEADER = struct.Struct("!BBHII")
+EXTENSION_HEADER = struct.Struct("!HH")
+
+CLOCK_RATE = 90000  # vnd.onvif.metadata/90000
+SEQUENCE_MOD = 1 << 16
+MAX_DROPOUT = 3000
+MAX_MISORDER = 100
+REORDER_BUFFER_SIZE = 8
+MAX_PAYLOAD_SIZE = 4 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class RtpPacket:
+    """RTP packet with header fields and a view of the payload."""
+
+    marker: bool
+    payload_type: int
+    sequence: int
+    timestamp: int
+    ssrc: int
+    csrc: tuple[int, ...]
+    extension: memoryview | None
+    payload: memoryview
+
+    @classmethod
+    def decode(cls, data: bytes) -> Self:
+        """Parse RTP header, CSRC list, header extension and padding.
+
+        Version is not verified since some devices don't set it.
+        """
+        if len(data) < RTP_HEADER_SIZE:
+            msg = f"RTP packet too short ({len(data)} bytes)"
+            raise ValueError(msg)
+
+        first, second, sequence, timestamp, ssrc = RTP_HEADER.unpack_from(data)
+        view = memoryview(data)
+        offset = RTP_HEADER_SIZE
+        end = len(data)
+
+        csrc: tuple[int, ...] = ()
+        if csrc_count := first & 0x0F:
+            if offset + 4 * csrc_count > end:
+                msg = "RTP CSRC list exceeds packet"
+                raise ValueError(msg)
+            csrc = struct.unpack_from(f"!{csrc_count}I", data, offset)
+            offset += 4 * csrc_count
+
+        extension = None
+        if first & 0x10:
+            if offset + EXTENSION_HEADER.size > end:
+                msg = "RTP header extension exceeds packet"
+                raise ValueError(msg)
+            _, length = EXTENSION_HEADER.unpack_from(data, offset)
+            offset += EXTENSION_HEADER.size
+            extension = view[offset : offset + 4 * length]
+            offset += 4 * length
+
+        if first & 0x20:
+            end -= data[-1]
+
+        if offset > end:
+            msg = "RTP header exceeds packet"
+            raise ValueError(msg)
+
+        return cls(
+            bool(second & 0x80),
+            second & 0x7F,
+            sequence,
+            timestamp,
+            ssrc,
+            csrc,
+            extension,
+            view[offset:end],
+        )
+
+
+@dataclass
+class RtpStreamStats:
+    """Counters of a single RTP stream.
+
+    Jitter is the RFC 3550 interarrival jitter estimate in seconds.
+    """
+
+    received: int = 0
+    lost: int = 0
+    reordered: int = 0
+    late: int = 0
+    duplicates: int = 0
+    discarded_messages: int = 0
+    jitter: float = 0.0
+
+
+class RtpStream:
+    """Sequence tracking and payload reassembly of one RTP source.
+
+    Packets arriving ahead of the expected sequence number are held in a
+    small reorder buffer. When the buffer is full, or when flushed, missing
+    packets are counted as lost and the message they belonged to is
+    discarded rather than passed along corrupt.
+    """
+
+    def __init__(self, ssrc: int, clock_rate: int = CLOCK_RATE) -> None:
+        """Initialize stream state."""
+        self.ssrc = ssrc
+        self.clock_rate = clock_rate
+        self.stats = RtpStreamStats()
+        self.next_sequence: int | None = None
+        self.base_sequence = 0
+        self.cycles = 0
+        self.reorder_buffer: dict[int, RtpPacket] = {}
+        self.fragments: list[memoryview] = []
+        self.fragments_size = 0
+        self.discard = False
+        self._timestamp: int | None = None
+        self._transit = 0.0
+        self._jitter = 0.0
+
+    def receive(self, packet: RtpPacket, arrival: float) -> list[bytes]:
+        """Add packet, arrival in seconds, and return completed payloads."""
+        self.stats.received += 1
+        self._update_jitter(packet, arrival)
+
+        if self.next_sequence is None:
+            self.next_sequence = self.base_sequence = packet.sequence
+        delta = (packet.sequence - self.next_sequence) % SEQUENCE_MOD
+
+        if delta == 0:
+            if not self.reorder_buffer:
+                if (sequence := (packet.sequence + 1) % SEQUENCE_MOD) == 0:
+                    self.cycles += 1
+                self.next_sequence = sequence
+                return self._reassemble(packet, gap=False)
+            self.stats.reordered += 1
+            payloads = self._reassemble(packet, gap=False)
+            return payloads + self._drain((packet.sequence + 1) % SEQUENCE_MOD)
+
+        return self._out_of_sequence(packet, delta)
+
+    def _out_of_sequence(self, packet: RtpPacket, delta: int) -> list[bytes]:
+        """Hold back early packets, drop late packets and resync on jumps."""
+        if delta < MAX_DROPOUT:
+            if packet.sequence in self.reorder_buffer:
+                self.stats.duplicates += 1
+                return []
+            self.reorder_buffer[packet.sequence] = packet
+            if len(self.reorder_buffer) > REORDER_BUFFER_SIZE:
+                return self.flush()
+            return []
+
+        if delta > SEQUENCE_MOD - MAX_MISORDER:
+            self.stats.late += 1
+            return []
+
+        # Sequence jumped, source restarted or a long outage
+        _LOGGER.debug("RTP stream %08x resynchronized", self.ssrc)
+        self.reorder_buffer.clear()
+        payloads = self._reassemble(packet, gap=True)
+        self.next_sequence = (packet.sequence + 1) % SEQUENCE_MOD
+        self.base_sequence = packet.sequence
+        self.cycles = 0
+        return payloads
+
+    @property
+    def expected(self) -> int:
+        """Number of packets expected since first or resynchronized packet."""
+        if self.next_sequence is None:
+            return 0
+        return self.cycles * SEQUENCE_MOD + self.next_sequence - self.base_sequence
+
+    def flush(self) -> list[bytes]:
+        """Stop waiting for missing packets and pass along buffered packets."""
+        if not self.reorder_buffer or self.next_sequence is None:
+            return []
+        expected = self.next_sequence
+        sequence = min(
+            self.reorder_buffer, key=lambda seq: (seq - expected) % SEQUENCE_MOD
+        )
+        self.stats.lost += (sequence - expected) % SEQUENCE_MOD
+        payloads = self._reassemble(self.reorder_buffer.pop(sequence), gap=True)
+        return payloads + self._drain((sequence + 1) % SEQUENCE_MOD)
+
+    def _drain(self, sequence: int) -> list[bytes]:
+        """Pass along buffered packets following in sequence."""
+        payloads: list[bytes] = []
+        while (packet := self.reorder_buffer.pop(sequence, None)) is not None:
+            payloads += self._reassemble(packet, gap=False)
+            sequence = (sequence + 1) % SEQUENCE_MOD
+        if sequence < self.next_sequence:  # type: ignore [operator]
+            self.cycles += 1
+        self.next_sequence = sequence
+        return payloads
+
+    def _reassemble(self, packet: RtpPacket, gap: bool) -> list[bytes]:
+        """Collect payload fragments and join them on the marker bit.
+
+        A gap in sequence numbers discards the message being collected and
+        every packet up to the next marker bit.
+        """
+        if gap:
+            if self.fragments or not self.discard:
+                self.stats.discarded_messages += 1
+            self.fragments.clear()
+            self.fragments_size = 0
+            self.discard = True
+
+        if not self.discard:
+            self.fragments.append(packet.payload)
+            self.fragments_size += len(packet.payload)
+            if self.fragments_size > MAX_PAYLOAD_SIZE:
+                _LOGGER.warning(
+                    "Discarding RTP payload exceeding %d bytes", MAX_PAYLOAD_SIZE
+                )
+                self.stats.discarded_messages += 1
+                self.fragments.clear()
+                self.fragments_size = 0
+                self.discard = True
+
+        if not packet.marker:
+            return []
+
+        if self.discard:
+            self.discard = False
+            return []
+
+        payload = b"".join(self.fragments)
+        self.fragments.clear()
+        self.fragments_size = 0
+        return [payload]
+
+    def _update_jitter(self, packet: RtpPacket, arrival: float) -> None:
+        """Update interarrival jitter using the first packet of each message."""
+        if packet.timestamp == self._timestamp:
+            return
+        transit = arrival * self.clock_rate - packet.timestamp
+        if self._timestamp is not None:
+            self._jitter += (abs(transit - self._transit) - self._jitter) / 16
+            self.stats.jitter = self._jitter / self.clock_rate
+        self._timestamp = packet.timestamp
+        self._transit = transit
@@ -0,0 +1,138 @@
+"""RTP and RTCP sockets shared by many RTSP sessions."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .rtsp import bind_port_pair
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .rtsp import RTPClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_RECEIVERS: dict[asyncio.AbstractEventLoop, RTPReceiver] = {}
+
+
+def get_receiver() -> RTPReceiver:
+    """Get RTP receiver shared by all sessions on the running event loop."""
+    loop = asyncio.get_running_loop()
+    if (receiver := _RECEIVERS.get(loop)) is None:
+        receiver = _RECEIVERS[loop] = RTPReceiver()
+    return receiver
+
+
+def close_receivers() -> None:
+    """Close shared RTP receivers."""
+    while _RECEIVERS:
+        _, receiver = _RECEIVERS.popitem()
+        receiver.close()
+
+
+class DatagramEndpoint(asyncio.DatagramProtocol):
+    """Pass datagrams received on a socket to handler."""
+
+    def __init__(self, handler: Callable[[bytes, Any], None]) -> None:
+        """Initialize endpoint."""
+        self.handler = handler
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:  # type: ignore [override]
+        """Save reference to transport."""
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """Pass datagram to handler."""
+        self.handler(data, addr)
+
+
+class RTPReceiver:
+    """One pair of RTP and RTCP sockets serving many RTSP sessions.
+
+    Datagrams are routed to a session by source host and SSRC. A host with
+    a single session gets all its datagrams, the SSRC is only needed to
+    tell several sessions to the same host apart.
+    """
+
+    def __init__(self) -> None:
+        """Bind sockets."""
+        self.sock, self.rtcp_sock = bind_port_pair()
+        self.port: int = self.sock.getsockname()[1]
+        self.rtcp_port = self.port + 1
+        self.rtp_endpoint = DatagramEndpoint(self.rtp_received)
+        self.rtcp_endpoint = DatagramEndpoint(self.rtcp_received)
+        self.hosts: dict[str, list[RTPClient]] = {}
+        self.routes: dict[tuple[str, int], RTPClient] = {}
+        self.unrouted = 0
+        self.started = False
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Start receiving datagrams, once for all sessions."""
+        async with self._lock:
+            if self.started:
+                return
+            loop = asyncio.get_running_loop()
+            await loop.create_datagram_endpoint(
+                lambda: self.rtp_endpoint, sock=self.sock
+            )
+            if self.rtcp_sock is not None:
+                await loop.create_datagram_endpoint(
+                    lambda: self.rtcp_endpoint, sock=self.rtcp_sock
+                )
+            self.started = True
+
+    def close(self) -> None:
+        """Close sockets."""
+        for endpoint in (self.rtp_endpoint, self.rtcp_endpoint):
+            if endpoint.transport is not None:
+                endpoint.transport.close()
+        self.sock.close()
+        if self.rtcp_sock is not None:
+            self.rtcp_sock.close()
+
+    def register(self, host: str, client: RTPClient) -> None:
+        """Route datagrams from host to RTP client."""
+        self.hosts.setdefault(host, []).append(client)
+        client.rtcp.transport = self.rtcp_endpoint.transport
+
+    def add_route(self, host: str, ssrc: int, client: RTPClient) -> None:
+        """Route datagrams from host with SSRC to RTP client."""
+        self.routes[host, ssrc] = client
+
+    def unregister(self, client: RTPClient) -> None:
+        """Stop routing datagrams to RTP client."""
+        for host, clients in list(self.hosts.items()):
+            if client in clients:
+                clients.remove(client)
+                if not clients:
+                    del self.hosts[host]
+        self.routes = {
+            key: routed for key, routed in self.routes.items() if routed is not client
+        }
+        client.rtcp.transport = None
+
+    def route(self, host: str, ssrc: int) -> RTPClient | None:
+        """Find RTP client of host and SSRC, learning SSRC of single sessions."""
+        if (client := self.routes.get((host, ssrc))) is not None:
+            return client
+        if (clients := self.hosts.get(host)) is not None and len(clients) == 1:
+            client = self.routes[host, ssrc] = clients[0]
+            return client
+        return None
+
+    def rtp_received(self, data: bytes, addr: Any) -> None:
+        """Route RTP packet by source host and SSRC."""
+        if (client := self.route(addr[0], int.from_bytes(data[8:12]))) is None:
+            self.unrouted += 1
+            return
+        client.client.datagram_received(data, addr)
+
+    def rtcp_received(self, data: bytes, addr: Any) -> None:
+        """Route RTCP packet by source host and sender SSRC."""
+        if (client := self.route(addr[0], int.from_bytes(data[4:8]))) is None:
+            self.unrouted += 1
+            return
+        client.rtcp.datagram_received(data, addr)
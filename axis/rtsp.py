@@ -6,16 +6,34 @@
 
 import asyncio
 from base64 import b64encode
-from collections import deque
+from dataclasses import dataclass
 import enum
 from hashlib import md5
 import logging
+import re
+import secrets
 import socket
+import struct
+import time
 from typing import TYPE_CHECKING, Any
 
+from .models.configuration import (
+    ANY_INTERFACE,
+    DEFAULT_BUFFER_SIZE,
+    OverflowPolicy,
+    RtspTransport,
+)
+from .models.event import event_key
+from .payload_queue import PayloadQueue, PayloadQueueStats
+from .rtcp import ReceiverReporter, decode as decode_rtcp
+from .rtp import RtpPacket, RtpStream, RtpStreamStats
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from .capture import CaptureWriter
+    from .rtp_receiver import RTPReceiver
+
 _LOGGER = logging.getLogger(__name__)
 
 RTSP_PORT = 554
@@ -25,6 +43,7 @@ class Signal(enum.StrEnum):
     """What is the content of the callback."""
 
     DATA = "data"
+    DATA_BATCH = "data_batch"
     FAILED = "failed"
     PLAYING = "playing"
 
@@ -38,8 +57,98 @@ class State(enum.StrEnum):
     STOPPED = "stopped"
 
 
+@dataclass(slots=True)
+class SessionResume:
+    """Parameters negotiated with a device to resume a stream from SETUP."""
+
+    url: str
+    control_url: str
+    sdp: list[str] | None
+    basic: bool
+    digest: bool
+    realm: str | None
+    nonce: str | None
+    qop: str | None
+    opaque: str | None
+
+
 TIME_OUT_LIMIT = 5
-RTP_HEADER_SIZE = 12
+REORDER_TIMEOUT = 0.05
+PORT_PAIR_ATTEMPTS = 10
+
+# RFC 2326 10.12, "$", channel and length precede interleaved binary data
+INTERLEAVED_MARKER = 0x24
+INTERLEAVED_HEADER = struct.Struct("!BBH")
+
+RESPONSE_START = b"RTSP/"
+HEADER_END = b"\r\n\r\n"
+CONTENT_LENGTH = re.compile(
+    rb"^[ \t]*content-length[ \t]*:[ \t]*(\d+)", re.IGNORECASE | re.MULTILINE
+)
+AUTH_PARAM = re.compile(r'(\w+)=(?:"([^"]*)"|([^\s,]*))')
+
+
+def response_length(buffer: bytes | bytearray) -> int | None:
+    """Length of the RTSP response leading buffer, None until complete.
+
+    A response ends with an empty line followed by Content-Length bytes of
+    body. Data not starting like a response runs up to the next response or
+    interleaved packet, so the session can still act on it.
+    """
+    if not buffer.startswith(RESPONSE_START):
+        if RESPONSE_START.startswith(buffer):
+            return None
+        ends = (buffer.find(RESPONSE_START, 1), buffer.find(b"$", 1))
+        return min((end for end in ends if end != -1), default=len(buffer))
+
+    if (header_end := buffer.find(HEADER_END)) == -1:
+        return None
+    end = header_end + len(HEADER_END)
+    if match := CONTENT_LENGTH.search(buffer, 0, header_end):
+        end += int(match[1])
+    return end if len(buffer) >= end else None
+
+
+def bind_port_pair() -> tuple[socket.socket, socket.socket | None]:
+    """Bind RTP socket on a free port and RTCP socket on the port above.
+
+    RTCP socket is left out if no free pair of ports is found.
+    """
+    for _ in range(PORT_PAIR_ATTEMPTS):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("", 0))
+        rtcp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            rtcp_sock.bind(("", sock.getsockname()[1] + 1))
+        except OSError, OverflowError:
+            sock.close()
+            rtcp_sock.close()
+            continue
+        return sock, rtcp_sock
+
+    _LOGGER.debug("No free pair of ports found, not receiving RTCP")
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("", 0))
+    return sock, None
+
+
+def bind_multicast(group: str, port: int, interface: str) -> socket.socket:
+    """Bind socket on port shared with other receivers and join multicast group."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(("", port))
+        sock.setsockopt(
+            socket.IPPROTO_IP,
+            socket.IP_ADD_MEMBERSHIP,
+            socket.inet_aton(group) + socket.inet_aton(interface),
+        )
+    except OSError:
+        sock.close()
+        raise
+    return sock
 
 
 class RTSPClient(asyncio.Protocol):
@@ -52,26 +161,63 @@ class RTSPClient(asyncio.Protocol):
         username: str,
         password: str,
         callback: Callable[[Signal], None],
+        *,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        transport: RtspTransport = RtspTransport.UDP,
+        stream_timeout: float = 0,
+        receiver: RTPReceiver | None = None,
+        multicast_interface: str = ANY_INTERFACE,
+        resume: SessionResume | None = None,
     ) -> None:
-        """RTSP."""
+        """RTSP.
+
+        A stream timeout fails the stream when no RTP or RTCP data has been
+        received for that many seconds while playing, 0 disables it.
+        A shared receiver replaces the RTP and RTCP sockets of the session
+        when using UDP transport.
+        Multicast groups are joined on the multicast interface address.
+        Resuming a previous session of the same URL skips OPTIONS and DESCRIBE.
+        """
         self.loop = asyncio.get_running_loop()
         self.callback = callback
+        self.stream_timeout = stream_timeout
+        self.multicast_interface = multicast_interface
+        self.receiver = receiver if transport == RtspTransport.UDP else None
 
-        self.rtp = RTPClient(self.loop, callback)
+        self.rtp = RTPClient(
+            self.loop,
+            callback,
+            PayloadQueue(buffer_size, overflow_policy, event_key),
+            bind=transport == RtspTransport.UDP and self.receiver is None,
+        )
 
         self.session = RTSPSession(url, host, username, password)
+        self.session.interleaved = transport == RtspTransport.TCP
+        self.session.multicast = transport == RtspTransport.MULTICAST
+        if resume is not None and resume.url == url:
+            self.session.resume(resume)
         self.session.rtp_port = self.rtp.port
         self.session.rtcp_port = self.rtp.rtcp_port
+        if self.receiver is not None:
+            self.session.rtp_port = self.receiver.port
+            self.session.rtcp_port = self.receiver.rtcp_port
+        self.peer_host = ""
+        self._buffer = bytearray()
 
         self.method = RTSPMethods(self.session)
 
         self.transport: asyncio.BaseTransport | None = None
         self.keep_alive_handle: asyncio.TimerHandle | None = None
         self.time_out_handle: asyncio.TimerHandle | None = None
+        self.liveness_handle: asyncio.TimerHandle | None = None
+        self.join_task: asyncio.Task[None] | None = None
 
     async def start(self) -> None:
         """Start RTSP session."""
         await self.rtp.start()
+        if self.receiver is not None:
+            await self.receiver.start()
 
         try:
             await self.loop.create_connection(
@@ -89,6 +235,8 @@ class RTSPClient(asyncio.Protocol):
             self.transport.write(self.method.message.encode())  # type: ignore [attr-defined]
             self.transport.close()
         self.rtp.stop()
+        if self.receiver is not None:
+            self.receiver.unregister(self.rtp)
 
         if self.keep_alive_handle is not None:
             self.keep_alive_handle.cancel()
@@ -96,11 +244,36 @@ class RTSPClient(asyncio.Protocol):
         if self.time_out_handle is not None:
             self.time_out_handle.cancel()
 
+        if self.liveness_handle is not None:
+            self.liveness_handle.cancel()
+
+        if self.join_task is not None:
+            self.join_task.cancel()
+
     @property
     def data(self) -> bytes:
         """Return latest RTP payload."""
         return self.rtp.data
 
+    def drain(self, limit: int | None = None) -> list[bytes]:
+        """Return and remove buffered RTP payloads in arrival order."""
+        return self.rtp.client.data.drain(limit)
+
+    @property
+    def queue_stats(self) -> PayloadQueueStats:
+        """Counters of RTP payloads waiting to be consumed."""
+        return self.rtp.queue_stats
+
+    @property
+    def capture(self) -> CaptureWriter | None:
+        """Capture writer receiving reassembled RTP payloads."""
+        return self.rtp.client.capture
+
+    @capture.setter
+    def capture(self, capture: CaptureWriter | None) -> None:
+        """Set capture writer receiving reassembled RTP payloads."""
+        self.rtp.client.capture = capture
+
     def connection_made(self, transport: asyncio.BaseTransport) -> None:
         """Connect to device is successful.
 
@@ -108,10 +281,48 @@ class RTSPClient(asyncio.Protocol):
         Schedule time out handle in case device doesn't respond.
         """
         self.transport = transport
+        if self.receiver is not None:
+            self.peer_host = transport.get_extra_info("peername")[0]
+            self.receiver.register(self.peer_host, self.rtp)
         self.transport.write(self.method.message.encode())  # type: ignore [attr-defined]
         self.time_out_handle = self.loop.call_later(TIME_OUT_LIMIT, self.time_out)
 
     def data_received(self, data: bytes) -> None:
+        """Got data on RTSP connection.
+
+        Data is buffered until a complete response is received, a single
+        read may also hold several responses. With interleaved transport
+        RTP packets share the connection with RTSP responses, each packet
+        framed by "$", channel and length. Packets on the RTP channel are
+        passed to the RTP client.
+        """
+        buffer = self._buffer
+        buffer += data
+        while buffer:
+            if buffer[0] != INTERLEAVED_MARKER:
+                if (end := response_length(buffer)) is None:
+                    return
+                response = bytes(buffer[:end])
+                del buffer[:end]
+                self._response_received(response)
+                continue
+
+            if len(buffer) < INTERLEAVED_HEADER.size:
+                return
+            _, channel, length = INTERLEAVED_HEADER.unpack_from(buffer)
+            if len(buffer) < (end := INTERLEAVED_HEADER.size + length):
+                return
+            if channel == self.session.rtp_channel:
+                self.rtp.client.datagram_received(
+                    bytes(buffer[INTERLEAVED_HEADER.size : end]), None
+                )
+            elif channel == self.session.rtp_channel + 1:
+                self.rtp.rtcp.datagram_received(
+                    bytes(buffer[INTERLEAVED_HEADER.size : end]), None
+                )
+            del buffer[:end]
+
+    def _response_received(self, data: bytes) -> None:
         """Got response on RTSP session.
 
         Manage time out handle since response came in a reasonable time.
@@ -120,6 +331,10 @@ class RTSPClient(asyncio.Protocol):
         """
         self.time_out_handle.cancel()  # type: ignore [union-attr]
         self.session.update(data.decode())
+        if self.receiver is not None and self.session.ssrc is not None:
+            self.receiver.add_route(self.peer_host, self.session.ssrc, self.rtp)
+        if self.session.destination is not None and self.join_task is None:
+            self.join_task = self.loop.create_task(self.join_multicast())
 
         if self.session.state == State.STARTING:
             self.transport.write(self.method.message.encode())  # type: ignore [union-attr]
@@ -132,9 +347,30 @@ class RTSPClient(asyncio.Protocol):
                 interval = self.session.session_timeout - 5
                 self.keep_alive_handle = self.loop.call_later(interval, self.keep_alive)
 
+            if self.stream_timeout and self.liveness_handle is None:
+                self.rtp.client.last_received = time.monotonic()
+                self.liveness_handle = self.loop.call_later(
+                    self.stream_timeout, self.check_liveness
+                )
+
         else:
             self.stop()
 
+    async def join_multicast(self) -> None:
+        """Join multicast group the device acknowledged in SETUP response."""
+        try:
+            await self.rtp.join(
+                self.session.destination,  # type: ignore [arg-type]
+                self.session.multicast_port,  # type: ignore [arg-type]
+                self.multicast_interface,
+            )
+        except OSError as err:
+            _LOGGER.warning(
+                "Failed to join multicast group %s: %s", self.session.destination, err
+            )
+            self.stop()
+            self.callback(Signal.FAILED)
+
     def keep_alive(self) -> None:
         """Keep RTSP session alive per negotiated time interval."""
         self.transport.write(self.method.message.encode())  # type: ignore [union-attr]
@@ -149,9 +385,29 @@ class RTSPClient(asyncio.Protocol):
         self.stop()
         self.callback(Signal.FAILED)
 
+    def check_liveness(self) -> None:
+        """Fail stream if no RTP or RTCP data arrived within stream timeout."""
+        idle = time.monotonic() - self.rtp.client.last_received
+        if idle < self.stream_timeout:
+            self.liveness_handle = self.loop.call_later(
+                self.stream_timeout - idle, self.check_liveness
+            )
+            return
+
+        _LOGGER.warning(
+            "No stream data from %s for %s seconds", self.session.host, round(idle)
+        )
+        self.liveness_handle = None
+        self.stop()
+        self.callback(Signal.FAILED)
+
     def connection_lost(self, exc: Exception | None) -> None:
         """Happens when device closes connection or stop() has been called."""
         _LOGGER.debug("RTSP session lost connection")
+        if self.receiver is not None:
+            self.receiver.unregister(self.rtp)
+        if self.session.interleaved or self.receiver is not None:
+            self.rtp.client.connection_lost(exc)
 
 
 class RTPClient:
@@ -161,29 +417,62 @@ class RTPClient:
     """
 
     def __init__(
-        self, loop: Any, callback: Callable[[Signal], None] | None = None
+        self,
+        loop: Any,
+        callback: Callable[[Signal], None] | None = None,
+        queue: PayloadQueue[bytes] | None = None,
+        bind: bool = True,
     ) -> None:
         """Configure and bind socket.
 
         We need to bind the port for RTSP before setting up the endpoint
         since it will block until a connection has been set up and
         the port is needed for setting up the RTSP session.
+        Without binding, packets interleaved with the RTSP connection are
+        passed to the client by the RTSP client.
         """
         self.loop = loop
-        self.client = self.UDPClient(callback)
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.sock.bind(("", 0))
-        self.port = self.sock.getsockname()[1]
-        self.rtcp_port = self.port + 1
+        self.client = self.UDPClient(callback, queue)
+        self.rtcp = self.ControlClient(self.client)
+        self.sock: socket.socket | None = None
+        self.rtcp_sock: socket.socket | None = None
+        self.port: int | None = None
+        self.rtcp_port: int | None = None
+        if bind:
+            self.sock, self.rtcp_sock = bind_port_pair()
+            self.port = self.sock.getsockname()[1]
+            self.rtcp_port = self.port + 1
 
     async def start(self) -> None:
         """Start RTP client."""
+        if self.sock is None:
+            return
         await self.loop.create_datagram_endpoint(lambda: self.client, sock=self.sock)
+        if self.rtcp_sock is not None:
+            await self.loop.create_datagram_endpoint(
+                lambda: self.rtcp, sock=self.rtcp_sock
+            )
+
+    async def join(self, group: str, port: int, interface: str = ANY_INTERFACE) -> None:
+        """Receive RTP and RTCP sent to multicast group on port and port above.
+
+        RTCP is left out if its port can not be bound.
+        """
+        self.sock = bind_multicast(group, port, interface)
+        try:
+            self.rtcp_sock = bind_multicast(group, port + 1, interface)
+        except OSError as err:
+            _LOGGER.debug("Not receiving multicast RTCP: %s", err)
+        self.port = port
+        self.rtcp_port = port + 1 if self.rtcp_sock is not None else None
+        await self.start()
 
     def stop(self) -> None:
         """Close transport from receiving any more packages."""
         if self.client.transport:
             self.client.transport.close()
+        if self.rtcp.transport and self.rtcp_sock is not None:
+            self.rtcp.transport.close()
 
     @property
     def data(self) -> bytes:
@@ -193,15 +482,36 @@ class RTPClient:
         except IndexError:
             return b""
 
+    @property
+    def stats(self) -> dict[int, RtpStreamStats]:
+        """Counters of each RTP stream by SSRC."""
+        return {ssrc: stream.stats for ssrc, stream in self.client.streams.items()}
+
+    @property
+    def queue_stats(self) -> PayloadQueueStats:
+        """Counters of payloads waiting to be consumed."""
+        return self.client.data.stats
+
     class UDPClient:
         """Datagram recepient for device data."""
 
-        def __init__(self, callback: Callable[[Signal], None] | None) -> None:
-            """Signal events to subscriber using callback."""
+        def __init__(
+            self,
+            callback: Callable[[Signal], None] | None,
+            queue: PayloadQueue[bytes] | None = None,
+        ) -> None:
+            """Signal events to subscriber using callback.
+
+            Completed payloads wait in a bounded queue until consumed.
+            """
             self.callback = callback
-            self.data: deque[bytes] = deque()
+            self.data = queue if queue is not None else PayloadQueue[bytes]()
             self.transport: asyncio.BaseTransport | None = None
-            self.fragment: bool = False
+            self.streams: dict[int, RtpStream] = {}
+            self.malformed = 0
+            self.capture: CaptureWriter | None = None
+            self.last_received = 0.0
+            self._flush_handles: dict[int, asyncio.TimerHandle] = {}
 
         def connection_made(self, transport: asyncio.BaseTransport) -> None:
             """Execute when port is up and listening.
@@ -214,23 +524,99 @@ class RTPClient:
         def connection_lost(self, exc: Exception | None) -> None:
             """Signal retry if RTSP session fails to get a response."""
             _LOGGER.debug("Stream recepient offline")
+            for handle in self._flush_handles.values():
+                handle.cancel()
+            self._flush_handles.clear()
+
+        def datagram_received(self, data: bytes, addr: Any) -> None:
+            """Signals when new data is available.
+
+            Packets are put in sequence order per source before payload
+            fragments are reassembled. Packets held back waiting for a
+            missing packet are passed along after REORDER_TIMEOUT.
+            """
+            if not self.callback:
+                return
+
+            try:
+                packet = RtpPacket.decode(data)
+            except ValueError as err:
+                self.malformed += 1
+                _LOGGER.debug("Ignoring RTP packet: %s", err)
+                return
+
+            if (stream := self.streams.get(packet.ssrc)) is None:
+                stream = self.streams[packet.ssrc] = RtpStream(packet.ssrc)
+
+            self.last_received = arrival = time.monotonic()
+            self._deliver(stream.receive(packet, arrival))
+
+            if stream.reorder_buffer and packet.ssrc not in self._flush_handles:
+                self._schedule_flush(packet.ssrc)
+
+        def _schedule_flush(self, ssrc: int) -> None:
+            """Pass along held back packets of stream after REORDER_TIMEOUT."""
+            self._flush_handles[ssrc] = asyncio.get_running_loop().call_later(
+                REORDER_TIMEOUT, self._flush, ssrc
+            )
+
+        def _flush(self, ssrc: int) -> None:
+            """Stop waiting for packets missing from stream.
+
+            Packets still held back behind a later gap get a new timeout.
+            """
+            del self._flush_handles[ssrc]
+            stream = self.streams[ssrc]
+            self._deliver(stream.flush())
+            if stream.reorder_buffer:
+                self._schedule_flush(ssrc)
+
+        def _deliver(self, payloads: list[bytes]) -> None:
+            """Signal completed payloads."""
+            for payload in payloads:
+                self.data.append(payload)
+                if self.capture is not None:
+                    self.capture.write_rtp(payload)
+                self.callback(Signal.DATA)  # type: ignore [misc]
+
+    class ControlClient:
+        """Datagram recepient for device RTCP reports.
+
+        Sender reports are answered with a receiver report about the RTP
+        streams, reports received interleaved on RTSP are not answered.
+        """
+
+        def __init__(self, client: RTPClient.UDPClient) -> None:
+            """Report on streams received by RTP client."""
+            self.client = client
+            self.reporter = ReceiverReporter()
+            self.transport: asyncio.DatagramTransport | None = None
+            self.malformed = 0
+
+        def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+            """Save reference to transport for sending receiver reports."""
+            self.transport = transport
+
+        def connection_lost(self, exc: Exception | None) -> None:
+            """RTCP socket closed."""
+            _LOGGER.debug("RTCP recepient offline")
 
         def datagram_received(self, data: bytes, addr: Any) -> None:
-            """Signals when new data is available."""
-            if self.callback:
-                payload = data[RTP_HEADER_SIZE:]
+            """Store sender reports and answer with a receiver report."""
+            self.client.last_received = arrival = time.monotonic()
+            try:
+                reports = decode_rtcp(data)
+            except ValueError as err:
+                self.malformed += 1
+                _LOGGER.debug("Ignoring RTCP packet: %s", err)
+                return
 
-                # if the previous packet was a fragment, then merge it
-                if self.fragment:
-                    previous = self.data.pop()
-                    self.data.append(previous + payload)
-                else:
-                    self.data.append(payload)
+            for report in reports:
+                self.reporter.sender_report(report, arrival)
 
-                # check whether the RTP marker bit is set, if not it is a fragment
-                self.fragment = (data[1] & 0b1 << 7) == 0
-                if not self.fragment:
-                    self.callback(Signal.DATA)
+            if reports and addr is not None and self.transport is not None:
+                streams = list(self.client.streams.values())
+                self.transport.sendto(self.reporter.report(streams, arrival), addr)
 
 
 class RTSPSession:
@@ -242,6 +628,8 @@ class RTSPSession:
     def __init__(self, url: str, host: str, username: str, password: str) -> None:
         """Session parameters."""
         self._basic_auth: str | None = None
+        self._ha1: dict[str | None, str] = {}
+        self._digest_prefix: str | None = None
         self.sequence = 0
 
         self.url = url
@@ -250,8 +638,14 @@ class RTSPSession:
         self.username = username
         self.password = password
         self.user_agent = "HASS Axis"
-        self.rtp_port = None
-        self.rtcp_port = None
+        self.rtp_port: int | None = None
+        self.rtcp_port: int | None = None
+        self.interleaved = False
+        self.rtp_channel = 0
+        self.ssrc: int | None = None
+        self.multicast = False
+        self.destination: str | None = None
+        self.multicast_port: int | None = None
         self.methods = [
             "OPTIONS",
             "DESCRIBE",
@@ -273,6 +667,10 @@ class RTSPSession:
         self.realm: str | None = None
         self.nonce: str | None = None
         self.stale: bool | None = None
+        self.qop: str | None = None
+        self.opaque: str | None = None
+        self.nonce_count = 0
+        self.cnonce = secrets.token_hex(8)
         self.content_type: str | None = None
         self.content_base: str | None = None
         self.content_length: int | None = None
@@ -283,6 +681,7 @@ class RTSPSession:
         self.rtp_info: str | None = None
         self.sdp: list[str] | None = None
         self.control_url: str | None = None
+        self.resumed = False
 
     @property
     def method(self) -> str:
@@ -313,57 +712,30 @@ class RTSPSession:
     def update(self, response: str) -> None:
         """Update session information from device response.
 
+        Status line, headers and body are parsed in a single pass, header
+        names are case-insensitive.
         Increment sequence number when starting stream, not when playing.
         If device requires authentication resend previous message with auth.
         """
-        data = response.splitlines()
-        _LOGGER.debug("Received data %s from %s", data, self.host)
-        while data:
-            line = data.pop(0)
-            if "RTSP/1.0" in line:
-                self.rtsp_version = int(line.split(" ")[0][5])
-                self.status_code = int(line.split(" ")[1])
-                self.status_text = line.split(" ")[2]
-            elif "CSeq" in line:
-                self.sequence_ack = int(line.split(": ")[1])
-            elif "Date" in line:
-                self.date = line.split(": ")[1]
-            elif "Public" in line:
-                self.methods_ack = line.split(": ")[1].split(", ")
-            elif "WWW-Authenticate: Basic" in line:
-                self.basic = True
-                self.realm = line.split('"')[1]
-            elif "WWW-Authenticate: Digest" in line:
-                self.digest = True
-                self.realm = line.split('"')[1]
-                self.nonce = line.split('"')[3]
-                self.stale = line.split("stale=")[1] == "TRUE"
-            elif "Content-Type" in line:
-                self.content_type = line.split(": ")[1]
-            elif "Content-Base" in line:
-                self.content_base = line.split(": ")[1]
-            elif "Content-Length" in line:
-                self.content_length = int(line.split(": ")[1])
-            elif "Session" in line:
-                self.session_id = line.split(": ")[1].split(";")[0]
-                if "=" in line:
-                    self.session_timeout = int(line.split(": ")[1].split("=")[1])
-            elif "Transport" in line:
-                self.transport_ack = line.split(": ")[1]
-            elif "Range" in line:
-                self.range = line.split(": ")[1]
-            elif "RTP-Info" in line:
-                self.rtp_info = line.split(": ")[1]
-            elif not line:
-                if data:
-                    self.sdp = data
-                    break
-        if self.sdp:
+        head, _, body = response.partition("\r\n\r\n")
+        lines = head.splitlines()
+        _LOGGER.debug("Received data %s from %s", lines, self.host)
+        if lines and lines[0].startswith("RTSP/"):
+            version, _, status = lines.pop(0).partition(" ")
+            self.rtsp_version = int(version[5])
+            status_code, _, self.status_text = status.partition(" ")
+            self.status_code = int(status_code)
+        for line in lines:
+            name, _, value = line.partition(":")
+            self._update_header(name.strip().lower(), value.strip())
+
+        if body:
+            self.sdp = body.splitlines()
             stream_found = False
             for param in self.sdp:
-                if not stream_found and "m=application" in param:
+                if not stream_found and param.startswith("m=application"):
                     stream_found = True
-                elif stream_found and "a=control:rtsp" in param:
+                elif stream_found and param.startswith("a=control:rtsp"):
                     self.control_url = param.split(":", 1)[1]
                     break
 
@@ -373,29 +745,160 @@ class RTSPSession:
         elif self.status_code == 401:
             # Device requires authorization, do not increment to next method
             pass
+        elif self.resumed and self.state == State.STARTING:
+            _LOGGER.debug(
+                "%s RTSP %s resuming session, restarting from OPTIONS",
+                self.host,
+                self.status_code,
+            )
+            self.resumed = False
+            self.session_id = None
+            self.sequence = 0
         else:
             # If device configuration is correct we should never get here
             _LOGGER.debug(
                 "%s RTSP %s %s", self.host, self.status_code, self.status_text
             )
 
+    def _update_header(self, name: str, value: str) -> None:
+        """Store value of a response header, name in lower case."""
+        match name:
+            case "cseq":
+                self.sequence_ack = int(value)
+            case "date":
+                self.date = value
+            case "public":
+                self.methods_ack = value.split(", ")
+            case "www-authenticate":
+                self.update_authenticate(value)
+            case "content-type":
+                self.content_type = value
+            case "content-base":
+                self.content_base = value
+            case "content-length":
+                self.content_length = int(value)
+            case "session":
+                self.session_id, *parameters = value.split(";")
+                for parameter in parameters:
+                    key, _, timeout = parameter.partition("=")
+                    if key.strip().lower() == "timeout":
+                        self.session_timeout = int(timeout)
+            case "transport":
+                self.update_transport(value)
+            case "range":
+                self.range = value
+            case "rtp-info":
+                self.rtp_info = value
+
+    @property
+    def resume_state(self) -> SessionResume | None:
+        """Parameters to resume session with, available after DESCRIBE."""
+        if self.control_url is None:
+            return None
+        return SessionResume(
+            self.url,
+            self.control_url,
+            self.sdp,
+            self.basic,
+            self.digest,
+            self.realm,
+            self.nonce,
+            self.qop,
+            self.opaque,
+        )
+
+    def resume(self, state: SessionResume) -> None:
+        """Start from SETUP with parameters of a previous session.
+
+        A device rejecting the resumed session is retried from OPTIONS.
+        """
+        self.control_url = state.control_url
+        self.sdp = state.sdp
+        self.basic = state.basic
+        self.digest = state.digest
+        self.realm = state.realm
+        self.nonce = state.nonce
+        self.qop = state.qop
+        self.opaque = state.opaque
+        self.sequence = 2
+        self.resumed = True
+
+    def update_authenticate(self, challenge: str) -> None:
+        """Store authentication scheme and parameters requested by device."""
+        scheme, _, parameters = challenge.partition(" ")
+        params = {
+            key.lower(): quoted or token
+            for key, quoted, token in AUTH_PARAM.findall(parameters)
+        }
+        match scheme.lower():
+            case "basic":
+                self.basic = True
+                self.realm = params.get("realm")
+            case "digest":
+                self.digest = True
+                self.realm = params.get("realm")
+                if (nonce := params.get("nonce")) != self.nonce:
+                    self.nonce = nonce
+                    self.nonce_count = 0
+                self.stale = params.get("stale", "").upper() == "TRUE"
+                qop = params.get("qop", "").replace(" ", "").split(",")
+                self.qop = "auth" if "auth" in qop else None
+                self.opaque = params.get("opaque")
+                self._digest_prefix = None
+
+    def update_transport(self, transport: str) -> None:
+        """Store transport acknowledged by device.
+
+        Includes RTP channel, SSRC and the multicast group and ports.
+        """
+        self.transport_ack = transport
+        for parameter in transport.split(";"):
+            name, _, value = parameter.partition("=")
+            match name:
+                case "interleaved":
+                    self.rtp_channel = int(value.split("-")[0])
+                case "ssrc":
+                    self.ssrc = int(value, 16)
+                case "destination" if self.multicast:
+                    self.destination = value
+                case "port" if self.multicast:
+                    self.multicast_port = int(value.split("-")[0])
+
     def generate_digest(self) -> str:
-        """RFC 2617."""
-        _ha1 = f"{self.username}:{self.realm}:{self.password}"
-        ha1 = md5(_ha1.encode("UTF-8")).hexdigest()
-        _ha2 = f"{self.method}:{self.url}"
-        ha2 = md5(_ha2.encode("UTF-8")).hexdigest()
-        encrypt_response = f"{ha1}:{self.nonce}:{ha2}"
-        response = md5(encrypt_response.encode("UTF-8")).hexdigest()
-
-        digest_auth = "Digest "
-        digest_auth += f'username="{self.username}", '
-        digest_auth += f'realm="{self.realm}", '
-        digest_auth += 'algorithm="MD5", '
-        digest_auth += f'nonce="{self.nonce}", '
-        digest_auth += f'uri="{self.url}", '
-        digest_auth += f'response="{response}"'
-        return digest_auth
+        """RFC 2617.
+
+        HA1 is cached per realm and everything but the response hash, and
+        the nonce count with qop, is cached until the next challenge.
+        """
+        if (ha1 := self._ha1.get(self.realm)) is None:
+            ha1 = self._ha1[self.realm] = md5(
+                f"{self.username}:{self.realm}:{self.password}".encode()
+            ).hexdigest()
+        ha2 = md5(f"{self.method}:{self.url}".encode()).hexdigest()
+
+        if (prefix := self._digest_prefix) is None:
+            prefix = self._digest_prefix = (
+                f'Digest username="{self.username}", '
+                f'realm="{self.realm}", '
+                'algorithm="MD5", '
+                f'nonce="{self.nonce}", '
+                f'uri="{self.url}", '
+                + (f'opaque="{self.opaque}", ' if self.opaque is not None else "")
+            )
+
+        if self.qop is None:
+            response = md5(f"{ha1}:{self.nonce}:{ha2}".encode()).hexdigest()
+            return f'{prefix}response="{response}"'
+
+        self.nonce_count += 1
+        nc = f"{self.nonce_count:08x}"
+        response = md5(
+            f"{ha1}:{self.nonce}:{nc}:{self.cnonce}:{self.qop}:{ha2}".encode()
+        ).hexdigest()
+        return (
+            f'{prefix}qop={self.qop}, nc={nc}, cnonce="{self.cnonce}", '
+            f'response="{response}"'
+        )
 
     def generate_basic(self) -> str:
         """RFC 2617."""
@@ -416,6 +919,7 @@ class RTSPMethods:
     def __init__(self, session: RTSPSession) -> None:
         """Define message methods."""
         self.session = session
+        self._templates: dict[tuple[str, str, str], tuple[str, str]] = {}
         self.message_methods: dict[str, Callable[[], str]] = {
             "OPTIONS": self.options,
             "DESCRIBE": self.describe,
@@ -438,53 +942,56 @@ class RTSPMethods:
 
     def options(self, authenticate: bool = True) -> str:
         """Request options device supports."""
-        message = f"OPTIONS {self.session.url} RTSP/1.0\r\n"
-        message += self.sequence
-        message += self.authentication if authenticate else ""
-        message += self.user_agent
-        message += self.session_id
-        message += "\r\n"
-        return message
+        return self._request(
+            "OPTIONS", self.session.url, authenticate=authenticate, session=True
+        )
 
     def describe(self) -> str:
         """Request description of what services RTSP server make available."""
-        message = f"DESCRIBE {self.session.url} RTSP/1.0\r\n"
-        message += self.sequence
-        message += self.authentication
-        message += self.user_agent
-        message += "Accept: application/sdp\r\n"
-        message += "\r\n"
-        return message
+        return self._request(
+            "DESCRIBE", self.session.url, headers="Accept: application/sdp\r\n"
+        )
 
     def setup(self) -> str:
         """Set up stream transport."""
-        message = f"SETUP {self.session.control_url} RTSP/1.0\r\n"
-        message += self.sequence
-        message += self.authentication
-        message += self.user_agent
-        message += self.transport
-        message += "\r\n"
-        return message
+        return self._request(
+            "SETUP",
+            self.session.control_url,  # type: ignore [arg-type]
+            headers=self.transport,
+        )
 
     def play(self) -> str:
         """RTSP session is ready to send data."""
-        message = f"PLAY {self.session.url} RTSP/1.0\r\n"
-        message += self.sequence
-        message += self.authentication
-        message += self.user_agent
-        message += self.session_id
-        message += "\r\n"
-        return message
+        return self._request("PLAY", self.session.url, session=True)
 
     def teardown(self) -> str:
         """Tell device to tear down session."""
-        message = f"TEARDOWN {self.session.url} RTSP/1.0\r\n"
-        message += self.sequence
-        message += self.authentication
-        message += self.user_agent
-        message += self.session_id
-        message += "\r\n"
-        return message
+        return self._request("TEARDOWN", self.session.url, session=True)
+
+    def _request(
+        self,
+        method: str,
+        uri: str,
+        headers: str = "",
+        authenticate: bool = True,
+        session: bool = False,
+    ) -> str:
+        """Fill in CSeq, authorization and session of a request template.
+
+        Request line, user agent and other headers are cached per method,
+        URI and headers.
+        """
+        if (template := self._templates.get((method, uri, headers))) is None:
+            template = self._templates[method, uri, headers] = (
+                f"{method} {uri} RTSP/1.0\r\n",
+                f"{self.user_agent}{headers}",
+            )
+        request_line, static_headers = template
+        return (
+            f"{request_line}{self.sequence}"
+            f"{self.authentication if authenticate else ''}"
+            f"{static_headers}{self.session_id if session else ''}\r\n"
+        )
 
     @property
     def sequence(self) -> str:
@@ -517,4 +1024,8 @@ class RTSPMethods:
     @property
     def transport(self) -> str:
         """Generate transport string."""
+        if self.session.interleaved:
+            return "Transport: RTP/AVP/TCP;unicast;interleaved=0-1\r\n"
+        if self.session.multicast:
+            return "Transport: RTP/AVP;multicast\r\n"
         return f"Transport: RTP/AVP;unicast;client_port={self.session.rtp_port}-{self.session.rtcp_port}\r\n"
@@ -3,25 +3,44 @@
 import asyncio
 import logging
 from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
 
-from .models.configuration import WebProtocol
-from .rtsp import RTSPClient, Signal, State
-from .websocket import WebSocketClient
+from .capture import CaptureWriter
+from .interfaces.event_decoder import EventDecoder
+from .models.configuration import EventDecodeMode, OverflowPolicy, WebProtocol
+from .rtp_receiver import get_receiver
+from .rtsp import RTSPClient, SessionResume, Signal, State
+from .websocket import WebSocketClient, topic_filter_list
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from os import PathLike
 
     from .device import AxisDevice
+    from .models.event import Event
+    from .payload_queue import PayloadQueueStats
     from .stream_transport import StreamTransport
 
 _LOGGER = logging.getLogger(__name__)
 
-RTSP_URL = "rtsp://{host}/axis-media/media.amp?video={video}&audio={audio}&event={event}{axis_orig_sw}"
+RTSP_URL = "rtsp://{host}/axis-media/media.amp?video={video}&audio={audio}&event={event}{event_topic}{axis_orig_sw}"
+RTSP_TOPIC_NAMESPACES = {"tns1": "onvif", "tnsaxis": "axis"}
 WEBSOCKET_PATH = "/vapix/ws-data-stream"
 
 RETRY_TIMER = 15
 
 
+def rtsp_event_topic(topic: str) -> str:
+    """Write topic with the namespace prefixes of RTSP event topic filters."""
+    parts = []
+    for part in topic.split("/"):
+        prefix, separator, name = part.partition(":")
+        if separator:
+            prefix = RTSP_TOPIC_NAMESPACES.get(prefix, prefix)
+        parts.append(f"{prefix}{separator}{name}")
+    return "/".join(parts)
+
+
 class StreamManager:
     """Setup, start, stop and retry stream."""
 
@@ -32,12 +51,25 @@ class StreamManager:
         self.audio = None  # Unsupported
         self.event = False
         self.stream: StreamTransport | None = None
+        self.capture: CaptureWriter | None = None
+        self.event_decoder: EventDecoder | None = None
+        if device.config.event_decode != EventDecodeMode.INLINE:
+            self.event_decoder = EventDecoder(
+                device.event,
+                device.config.event_decode,
+                device.config.event_buffer_size,
+                device.config.event_overflow_policy,
+            )
+            self.event_decoder.room_callbacks.append(self._decoder_room)
 
         self.connection_status_callback: list[Callable[[Signal], None]] = []
         self.background_tasks: set[asyncio.Task[None]] = set()
         self.retry_timer: asyncio.TimerHandle | None = None
         self._starting = False
         self._websocket_temporarily_disabled = False
+        self.resume: SessionResume | None = None
+        self._event_filter_scheduled = False
+        device.event.subscription_callbacks.append(self._subscriptions_changed)
 
     @property
     def stream_url(self) -> str:
@@ -47,6 +79,7 @@ class StreamManager:
             video=self.video_query,
             audio=self.audio_query,
             event=self.event_query,
+            event_topic=self.event_topic_query,
             axis_orig_sw="&Axis-Orig-Sw=true"
             if self.device.config.is_companion
             else "",
@@ -80,6 +113,25 @@ class StreamManager:
         """Generate event query."""
         return "on" if self.event else "off"
 
+    @property
+    def event_topic_query(self) -> str:
+        """Generate event topic query covering topics of event subscriptions.
+
+        Topic namespaces are given with the prefixes used by the device.
+        No filter is added if any subscription covers all topics.
+        Topic expressions can not exclude sub-topics, so black listed topics
+        below a subscribed topic are still streamed and dropped by the event
+        manager.
+        """
+        if (
+            not self.event
+            or not self.device.config.rtsp_event_filter
+            or (topics := self.device.event.topic_filter()) is None
+        ):
+            return ""
+        event_topic = "|".join(f"{rtsp_event_topic(topic)}//." for topic in topics)
+        return f"&eventtopic={quote(event_topic, safe=':/.')}"
+
     @property
     def use_websocket(self) -> bool:
         """Use websocket transport when event websocket API is available."""
@@ -97,6 +149,33 @@ class StreamManager:
             and WebSocketClient.supported_by_device(self.device)
         )
 
+    @property
+    def event_filter_list(self) -> list[dict[str, str]]:
+        """Websocket event filters covering topics of event subscriptions."""
+        return topic_filter_list(self.device.event.topic_filter())
+
+    def _subscriptions_changed(self) -> None:
+        """Refilter running websocket stream, once for changes in a row."""
+        if (
+            not self.use_websocket
+            or not isinstance(self.stream, WebSocketClient)
+            or self._event_filter_scheduled
+        ):
+            return
+        self._event_filter_scheduled = True
+        self.stream.loop.call_soon_threadsafe(self._update_event_filter)
+
+    def _update_event_filter(self) -> None:
+        """Send event filters over live websocket connection if they changed."""
+        self._event_filter_scheduled = False
+        if not isinstance(stream := self.stream, WebSocketClient):
+            return
+        if (event_filter_list := self.event_filter_list) == stream.event_filter_list:
+            return
+        task = asyncio.create_task(stream.reconfigure(event_filter_list))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
     def _handle_websocket_failure(self) -> None:
         """Disable websocket for runtime when TLS certificate validation fails."""
         if self.device.config.websocket_force:
@@ -123,30 +202,75 @@ class StreamManager:
 
     def _build_stream(self) -> StreamTransport:
         """Build transport based on device capabilities and manager settings."""
+        stream: StreamTransport
         if self.use_websocket:
-            return WebSocketClient(
+            stream = WebSocketClient(
                 self.device,
                 self.websocket_url,
                 self.session_callback,
+                self.event_filter_list,
             )
-
-        return RTSPClient(
-            self.stream_url,
-            self.device.config.host,
-            self.device.config.username,
-            self.device.config.password,
-            self.session_callback,
-        )
+        else:
+            stream = RTSPClient(
+                self.stream_url,
+                self.device.config.host,
+                self.device.config.username,
+                self.device.config.password,
+                self.session_callback,
+                buffer_size=self.device.config.event_buffer_size,
+                overflow_policy=self.device.config.event_overflow_policy,
+                transport=self.device.config.rtsp_transport,
+                stream_timeout=self.device.config.stream_timeout,
+                receiver=get_receiver()
+                if self.device.config.shared_rtp_receiver
+                else None,
+                multicast_interface=self.device.config.multicast_interface,
+                resume=self.resume,
+            )
+        stream.capture = self.capture
+        return stream
+
+    def start_capture(self, path: str | PathLike[str]) -> None:
+        """Capture raw stream data to file, also across reconnects."""
+        self.stop_capture()
+        self.capture = CaptureWriter(path)
+        if self.stream:
+            self.stream.capture = self.capture
+
+    def stop_capture(self) -> None:
+        """Stop capturing raw stream data."""
+        if self.capture is None:
+            return
+        if self.stream:
+            self.stream.capture = None
+        self.capture.close()
+        self.capture = None
 
     def session_callback(self, signal: Signal) -> None:
         """Signalling from stream session.
 
         Data - new data available for processing.
-        Playing - Connection is healthy.
+        Data batch - all buffered data is processed in order.
+        Playing - Connection is healthy, RTSP session parameters are kept
+        to resume the session after a reconnect.
         Retry - if there is no connection to device.
         """
         if signal == Signal.DATA and self.event:
-            self.device.event.handler(self.data)
+            if self.event_decoder is None:
+                self.device.event.handler(self.data)
+            elif not self._decoder_paused:
+                self.event_decoder.submit(self.data)
+
+        elif signal == Signal.DATA_BATCH and self.event and self.stream:
+            if self.event_decoder is None:
+                self.device.event.handle_batch(self.stream.drain())
+            else:
+                self._submit_stream_data()
+
+        elif signal == Signal.PLAYING and self.stream:
+            self.resume = getattr(self.stream.session, "resume_state", None)
+            # Filters changed while connecting are sent once playing
+            self._subscriptions_changed()
 
         elif signal == Signal.FAILED:
             self._handle_websocket_failure()
@@ -157,12 +281,52 @@ class StreamManager:
                 callback(signal)
 
     @property
-    def data(self) -> bytes | dict[str, Any]:
+    def _decoder_paused(self) -> bool:
+        """Hold data back in the stream while the decoder is full.
+
+        Only with backpressure, other overflow policies are applied by the
+        decoder.
+        """
+        return (
+            self.event_decoder is not None
+            and self.event_decoder.policy == OverflowPolicy.BACKPRESSURE
+            and self.event_decoder.full
+        )
+
+    def _decoder_room(self) -> None:
+        """Hand data held back in the stream to the decoder."""
+        if self.event:
+            self._submit_stream_data()
+
+    def _submit_stream_data(self) -> None:
+        """Hand data buffered in the stream to the decoder.
+
+        With backpressure only as much as the decoder has room for, the rest
+        is held back in the stream.
+        """
+        if self.stream is None or (decoder := self.event_decoder) is None:
+            return
+        limit: int | None = None
+        if (
+            decoder.policy == OverflowPolicy.BACKPRESSURE
+            and (limit := decoder.maxlen - decoder.depth) <= 0
+        ):
+            return
+        for data in self.stream.drain(limit):
+            decoder.submit(data)
+
+    @property
+    def data(self) -> bytes | dict[str, Any] | Event:
         """Get stream data."""
         if not self.stream:
             return b""
         return self.stream.data
 
+    @property
+    def queue_stats(self) -> PayloadQueueStats | None:
+        """Counters of stream data waiting to be handled, if tracked."""
+        return getattr(self.stream, "queue_stats", None)
+
     @property
     def state(self) -> State:
         """State of stream."""
@@ -192,6 +356,9 @@ class StreamManager:
         self._starting = False
         if self.stream and not self._is_stream_stopped:
             self.stream.stop()
+        if self.event_decoder is not None:
+            self.event_decoder.cancel()
+        self.device.event.cancel_debounce()
         self.cancel_retry()
 
     def retry(self) -> None:
@@ -3,6 +3,10 @@
 from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .capture import CaptureWriter
+    from .models.event import Event
     from .rtsp import State
 
 
@@ -17,6 +21,8 @@ class StreamSession(Protocol):
 class StreamTransport(Protocol):
     """Minimal transport contract used by StreamManager."""
 
+    capture: CaptureWriter | None
+
     @property
     def session(self) -> StreamSession:
         """Underlying transport session."""
@@ -28,5 +34,13 @@ class StreamTransport(Protocol):
         """Stop receiving stream data."""
 
     @property
-    def data(self) -> bytes | dict[str, Any]:
+    def data(self) -> bytes | dict[str, Any] | Event:
         """Return latest stream payload."""
+
+    def drain(
+        self, limit: int | None = None
+    ) -> Sequence[bytes | dict[str, Any] | Event]:
+        """Return and remove buffered stream payloads in arrival order.
+
+        All payloads unless limited to the oldest "limit" payloads.
+        """
@@ -5,12 +5,12 @@ https://developer.axis.com/vapix/network-video/event-streaming-over-websocket/
 
 Authentication uses a short-lived session token obtained from wssession.cgi.
 After connecting, an ``events:configure`` JSON-RPC call subscribes to events.
-Incoming ``events:notify`` JSON messages are parsed into the internal event
-dict format accepted by EventManager.handler().
+Incoming ``events:notify`` JSON messages are turned straight into events
+accepted by EventManager.handler(). Notifications received in the same
+event loop iteration are signalled as one batch.
 """
 
 import asyncio
-from collections import deque
 import enum
 import logging
 import ssl
@@ -21,18 +21,23 @@ import aiohttp
 import orjson
 
 from .models.api_discovery import ApiId
+from .models.configuration import OverflowPolicy
 from .models.event import (
     EVENT_SOURCE,
     EVENT_SOURCE_IDX,
     EVENT_TOPIC,
     EVENT_TYPE,
     EVENT_VALUE,
+    Event,
+    event_key,
 )
+from .payload_queue import PayloadQueue, PayloadQueueStats
 from .rtsp import Signal, State
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
+    from .capture import CaptureWriter
     from .device import AxisDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,7 +50,7 @@ HEARTBEAT_INTERVAL = 15  # Send ping every 15 seconds to keep connection fresh
 RECEIVE_TIMEOUT = (
     60  # Allow 60 seconds for device to respond (heartbeat + network margin)
 )
-BUFFER_SIZE = 200
+ALL_TOPICS_FILTER = "//."
 
 
 class WebSocketFailureReason(enum.StrEnum):
@@ -104,23 +109,89 @@ def _parse_ws_notification(notification: dict[str, Any]) -> dict[str, Any]:
 
     is mapped to the same dict keys used by Event._decode_from_dict().
     """
-    topic = notification.get("topic", "")
+    topic, source, source_idx, data_type, value = _notification_fields(notification)
+    return {
+        EVENT_TOPIC: topic,
+        EVENT_SOURCE: source,
+        EVENT_SOURCE_IDX: source_idx,
+        EVENT_TYPE: data_type,
+        EVENT_VALUE: value,
+    }
+
+
+def _notification_fields(
+    notification: dict[str, Any],
+) -> tuple[str, str, str, str, str]:
+    """Return topic, source, source index, data type and value of a notification."""
     message = notification.get("message") or {}
     source_dict = message.get("source") or {}
     data_dict = message.get("data") or {}
 
     source, source_idx = next(iter(source_dict.items()), ("", ""))
-    data_type, data_value = next(iter(data_dict.items()), ("", ""))
     if "active" in data_dict:
         data_type, data_value = "active", data_dict["active"]
+    else:
+        data_type, data_value = next(iter(data_dict.items()), ("", ""))
 
-    return {
-        EVENT_TOPIC: topic,
-        EVENT_SOURCE: source,
-        EVENT_SOURCE_IDX: str(source_idx),
-        EVENT_TYPE: data_type,
-        EVENT_VALUE: str(data_value),
-    }
+    return (
+        notification.get("topic", ""),
+        source,
+        str(source_idx),
+        data_type,
+        str(data_value),
+    )
+
+
+def notification_to_event(
+    notification: dict[str, Any], retain_data: bool = True
+) -> Event:
+    """Create event straight from a VAPIX events:notify notification.
+
+    Equal to decoding the dict of _parse_ws_notification(), which is only
+    built when the event retains its data.
+    """
+    topic, source, source_idx, data_type, value = _notification_fields(notification)
+    data = None
+    if retain_data:
+        data = {
+            EVENT_TOPIC: topic,
+            EVENT_SOURCE: source,
+            EVENT_SOURCE_IDX: source_idx,
+            EVENT_TYPE: data_type,
+            EVENT_VALUE: value,
+        }
+    return Event.create(topic, source, source_idx, data_type, value, data=data)
+
+
+def topic_filter_list(topics: Iterable[str] | None) -> list[dict[str, str]]:
+    """Build events:configure filters matching topics and their subtopics.
+
+    None subscribes to all topics.
+    """
+    if topics is None:
+        return [{"topicFilter": ALL_TOPICS_FILTER}]
+    return [{"topicFilter": f"{topic}{ALL_TOPICS_FILTER}"} for topic in topics]
+
+
+def parse_notify_frame(data: str | bytes) -> dict[str, Any] | None:
+    """Parse a JSON websocket frame, return None unless it is events:notify."""
+    if (notification := _notify_frame_notification(data)) is None:
+        return None
+    return _parse_ws_notification(notification)
+
+
+def _notify_frame_notification(data: str | bytes) -> dict[str, Any] | None:
+    """Return notification of a JSON events:notify websocket frame."""
+    try:
+        msg = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        _LOGGER.debug("Ignoring non-JSON websocket frame")
+        return None
+
+    if msg.get("method") != "events:notify":
+        return None
+
+    return (msg.get("params") or {}).get("notification") or None
 
 
 class WebSocketSession:
@@ -137,7 +208,7 @@ class WebSocketClient:
     Connects to ``/vapix/ws-data-stream?sources=events``, authenticates
     using a session token from ``/axis-cgi/wssession.cgi``, sends
     ``events:configure`` to subscribe, and converts ``events:notify``
-    JSON messages into the internal event dict format.
+    JSON messages into events.
     """
 
     def __init__(
@@ -152,7 +223,7 @@ class WebSocketClient:
         Args:
             device: Axis device with Vapix access for session-token auth.
             url: Base websocket URL, e.g. ``ws://host/vapix/ws-data-stream?sources=events``.
-            callback: Invoked on Signal events (PLAYING, DATA, FAILED).
+            callback: Invoked on Signal events (PLAYING, DATA_BATCH, FAILED).
             event_filter_list: ONVIF topic/content filter list sent with
                 ``events:configure``.  Defaults to ``[{"topicFilter": "//."}]``
                 which subscribes to all events.
@@ -161,10 +232,8 @@ class WebSocketClient:
         self.device = device
         self.url = url
         self.callback = callback
-        self.event_filter_list: list[dict[str, str]] = event_filter_list or [
-            {"topicFilter": "//."}
-        ]
-        self._configure_payload = {
+        self.event_filter_list = event_filter_list or topic_filter_list(None)
+        self._configure_payload: dict[str, Any] = {
             "apiVersion": API_VERSION,
             "context": CONTEXT,
             "method": "events:configure",
@@ -174,7 +243,15 @@ class WebSocketClient:
 
         self.loop = asyncio.get_running_loop()
         self.session = WebSocketSession()
-        self._data: deque[dict[str, Any]] = deque(maxlen=BUFFER_SIZE)
+        self._data = PayloadQueue[Event](
+            device.config.event_buffer_size,
+            device.config.event_overflow_policy,
+            event_key,
+        )
+        self._room = asyncio.Event()
+        self._room.set()
+        self._batch_handle: asyncio.Handle | None = None
+        self.capture: CaptureWriter | None = None
 
         self._ws_session: aiohttp.ClientSession | None = None
         self._owns_ws_session = False
@@ -192,12 +269,26 @@ class WebSocketClient:
         return ApiId.EVENT_STREAMING_OVER_WEBSOCKET in device.vapix.api_discovery
 
     @property
-    def data(self) -> dict[str, Any]:
-        """Return and remove the next parsed event notification from the buffer."""
+    def data(self) -> Event | dict[str, Any]:
+        """Return and remove the next event from the buffer, empty dict if none."""
         try:
-            return self._data.popleft()
+            event = self._data.popleft()
         except IndexError:
             return {}
+        self._room.set()
+        return event
+
+    def drain(self, limit: int | None = None) -> list[Event]:
+        """Return and remove buffered events in arrival order."""
+        events = self._data.drain(limit)
+        if len(self._data) < self._data.maxlen:
+            self._room.set()
+        return events
+
+    @property
+    def queue_stats(self) -> PayloadQueueStats:
+        """Counters of events waiting to be consumed."""
+        return self._data.stats
 
     @property
     def should_disable_runtime_websocket(self) -> bool:
@@ -293,7 +384,27 @@ class WebSocketClient:
         if self._ws is None:
             return
 
+        event_filter_list = self._configure_payload["params"]["eventFilterList"]
         await self._send_configure_payload(self._configure_payload)
+        self.event_filter_list = event_filter_list
+
+    async def reconfigure(self, event_filter_list: list[dict[str, str]]) -> None:
+        """Replace event filters, sent over the live connection when playing.
+
+        Otherwise they are sent with the next events:configure on connect.
+        Event filter list only reflects filters sent to the device.
+        The configure response is consumed by the receiver.
+        """
+        self._configure_payload["params"] = {"eventFilterList": event_filter_list}
+        if self._ws is None or self.session.state != State.PLAYING:
+            return
+
+        try:
+            await self._ws.send_json(self._configure_payload)
+        except (aiohttp.ClientError, OSError) as err:
+            _LOGGER.warning("Websocket reconfigure failed: %s", err)
+            return
+        self.event_filter_list = event_filter_list
 
     async def _send_configure_payload(self, payload: dict[str, Any]) -> None:
         """Send a configure payload and validate the immediate response."""
@@ -326,6 +437,11 @@ class WebSocketClient:
         self._stopped = True
         self.session.state = State.STOPPED
 
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+        self._data.clear()
+
         if self._receiver_task is not None:
             self._receiver_task.cancel()
             self._receiver_task = None
@@ -341,6 +457,8 @@ class WebSocketClient:
             async for msg in self._ws:
                 if msg.type == aiohttp.WSMsgType.TEXT:
                     self._handle_message(msg.data)
+                    if len(self._data) >= self._data.maxlen:
+                        await self._buffer_full()
                     continue
 
                 if msg.type == aiohttp.WSMsgType.BINARY:
@@ -365,12 +483,14 @@ class WebSocketClient:
                 err,
                 duration,
                 len(self._data),
-                BUFFER_SIZE,
+                self._data.maxlen,
                 exc_info=True,
             )
 
         finally:
             self._start_time = None
+            if not self._stopped:
+                self._signal_batch()
             await self._close()
             self.session.state = State.STOPPED
             if not self._stopped:
@@ -378,22 +498,44 @@ class WebSocketClient:
 
     def _handle_message(self, data: str) -> None:
         """Parse a JSON websocket frame and dispatch events:notify messages."""
-        try:
-            msg = orjson.loads(data)
-        except orjson.JSONDecodeError:
-            _LOGGER.debug("Ignoring non-JSON websocket frame")
+        if (notification := _notify_frame_notification(data)) is None:
             return
 
-        if msg.get("method") != "events:notify":
-            return
+        if self.capture is not None:
+            self.capture.write_websocket(data)
+        if len(self._data) >= self._data.maxlen:
+            # A burst of buffered frames is read without yielding to the loop
+            self._signal_batch()
+        self._data.append(
+            notification_to_event(notification, self.device.event.retain_data)
+        )
+        if self._batch_handle is None:
+            self._batch_handle = self.loop.call_soon(self._signal_batch)
 
-        notification = (msg.get("params") or {}).get("notification") or {}
-        if not notification:
-            return
+    async def _buffer_full(self) -> None:
+        """Hand buffered events to the consumer once the buffer is full.
 
-        parsed = _parse_ws_notification(notification)
-        self._data.append(parsed)
-        self._signal(Signal.DATA)
+        The overflow policy only applies if the consumer leaves events in the
+        buffer. With backpressure reading from the websocket then stops until
+        buffered events are consumed, frames not yet read are held back by
+        the connection instead.
+        """
+        self._signal_batch()
+        if (
+            self._data.policy == OverflowPolicy.BACKPRESSURE
+            and len(self._data) >= self._data.maxlen
+        ):
+            self._data.stats.paused += 1
+            self._room.clear()
+            await self._room.wait()
+
+    def _signal_batch(self) -> None:
+        """Signal notifications buffered since the previous batch."""
+        if self._batch_handle is not None:
+            self._batch_handle.cancel()
+            self._batch_handle = None
+        if self._data:
+            self._signal(Signal.DATA_BATCH)
 
     async def _close(self) -> None:
         """Close websocket connection and session (idempotent)."""
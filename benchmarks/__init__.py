@@ -0,0 +1 @@
+"""Benchmarks for the axis library hot paths."""
@@ -0,0 +1,317 @@
+"""Benchmark event decoding and dispatch.
+
+Inputs are built from the test fixtures so every input format carries the
+same events. Results are written as JSON, one entry per benchmark with
+throughput, per-event latency percentiles and peak memory allocated while
+handling a single event.
+
+python -m benchmarks.events --iterations 1000 > results.json
+"""
+
+import argparse
+from dataclasses import asdict, dataclass
+from itertools import count
+import logging
+import math
+import platform
+import struct
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from axis.interfaces.event_manager import EventManager
+from axis.models.event import Event, EventXmlParser
+from axis.models.mqtt import mqtt_json_to_event
+from axis.rtp import SEQUENCE_MOD
+from axis.rtsp import RTPClient
+from axis.websocket import (
+    _parse_ws_notification,
+    notification_to_event,
+    parse_notify_frame,
+)
+from tests import event_fixtures
+from tests.packet_fixtures import (
+    RTP_PACKET1_FULL,
+    RTP_PACKET2_FRAGMENT1,
+    RTP_PACKET2_FRAGMENT2,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+FORMAT_VERSION = 1
+PERCENTILES = (50, 90, 99)
+RTP_FRAGMENTS = (2, 16, 128)
+RTP_SEQUENCE = struct.Struct("!H")
+SUBSCRIBERS = 100
+
+
+def percentile(values: Sequence[float], percent: int) -> float:
+    """Nearest rank percentile of sorted values."""
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of a single benchmark."""
+
+    name: str
+    events: int
+    events_per_second: float
+    latency_ns: dict[str, float]
+    peak_allocated_bytes: int
+
+
+@dataclass
+class Benchmark:
+    """Callable run once per input, each call handling a number of events."""
+
+    name: str
+    func: Callable[[Any], object]
+    inputs: Sequence[Any]
+    events_per_call: int = 1
+
+    def run(self, iterations: int) -> BenchmarkResult:
+        """Time every call, then measure allocations in a separate pass."""
+        func = self.func
+        samples: list[int] = []
+        clock = time.perf_counter_ns
+        for _ in range(iterations):
+            for data in self.inputs:
+                start = clock()
+                func(data)
+                samples.append(clock() - start)
+
+        tracemalloc.start()
+        peak = 0
+        for data in self.inputs:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            func(data)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+
+        events = len(samples) * self.events_per_call
+        per_event = sorted(sample / self.events_per_call for sample in samples)
+        latency = {f"p{p}": round(percentile(per_event, p), 1) for p in PERCENTILES}
+        latency["max"] = round(per_event[-1], 1)
+        return BenchmarkResult(
+            name=self.name,
+            events=events,
+            events_per_second=round(events / (sum(samples) / 1e9), 1),
+            latency_ns=latency,
+            peak_allocated_bytes=peak,
+        )
+
+
+def xml_inputs() -> list[bytes]:
+    """Event XML payloads from the event fixtures."""
+    return [
+        value
+        for value in vars(event_fixtures).values()
+        if isinstance(value, bytes) and value.startswith(b"<?xml")
+    ]
+
+
+def websocket_notifications(xml: Sequence[bytes]) -> list[dict[str, Any]]:
+    """Websocket events:notify notifications carrying the XML events."""
+    parser = EventXmlParser()
+    notifications = []
+    for data in xml:
+        if not (event := parser.parse(data)):
+            continue
+        source = {event["source"]: event["source_idx"]} if event["source"] else {}
+        notifications.append(
+            {
+                "topic": event["topic"],
+                "timestamp": 1700000000000,
+                "message": {
+                    "source": source,
+                    "key": {},
+                    "data": {event["type"]: event["value"]},
+                },
+            }
+        )
+    return notifications
+
+
+def websocket_frames(notifications: Sequence[dict[str, Any]]) -> list[str]:
+    """Websocket text frames wrapping the notifications."""
+    return [
+        orjson.dumps(
+            {
+                "apiVersion": "1.0",
+                "method": "events:notify",
+                "params": {"notification": notification},
+            }
+        ).decode()
+        for notification in notifications
+    ]
+
+
+def mqtt_payloads(notifications: Sequence[dict[str, Any]]) -> list[bytes]:
+    """MQTT event payloads carrying the notifications."""
+    return [
+        orjson.dumps(
+            notification
+            | {
+                "topic": notification["topic"]
+                .replace("tnsaxis", "axis")
+                .replace("tns1", "onvif")
+            }
+        )
+        for notification in notifications
+    ]
+
+
+def rtp_packets() -> list[list[bytearray]]:
+    """RTP packet sequences each completing one event."""
+    return [
+        [bytearray(RTP_PACKET1_FULL)],
+        [bytearray(RTP_PACKET2_FRAGMENT1), bytearray(RTP_PACKET2_FRAGMENT2)],
+    ]
+
+
+def rtp_fragments(count: int) -> list[bytearray]:
+    """RTP packets of a payload fragmented over count packets."""
+    fragment, last = RTP_PACKET2_FRAGMENT1, RTP_PACKET2_FRAGMENT2
+    return [bytearray(fragment) for _ in range(count - 1)] + [bytearray(last)]
+
+
+def rtp_receiver(decode: bool = True) -> Callable[[list[bytearray]], object]:
+    """Reassemble RTP packets and optionally decode the completed payload.
+
+    Packets are renumbered on every call to keep the sequence unbroken.
+    """
+    client = RTPClient.UDPClient(lambda _: None)
+    sequence = count()
+
+    def receive(packets: list[bytearray]) -> bytes | Event:
+        for packet in packets:
+            RTP_SEQUENCE.pack_into(packet, 2, next(sequence) % SEQUENCE_MOD)
+            client.datagram_received(packet, None)  # type: ignore [arg-type]
+        payload = client.data.popleft()
+        return Event.decode(payload) if decode else payload
+
+    return receive
+
+
+def event_manager(subscribers: int = 0, **options: Any) -> EventManager:
+    """Event manager with subscribers of all events."""
+    manager = EventManager()
+    for name, value in options.items():
+        setattr(manager, name, value)
+    for _ in range(subscribers):
+        manager.subscribe(lambda _: None)
+    return manager
+
+
+def benchmarks() -> list[Benchmark]:
+    """All benchmarks, decoding first and dispatch configurations after."""
+    xml = xml_inputs()
+    notifications = websocket_notifications(xml)
+    frames = websocket_frames(notifications)
+    mqtt = mqtt_payloads(notifications)
+    parsed = [_parse_ws_notification(notification) for notification in notifications]
+    return [
+        Benchmark("decode.xml", Event.decode, xml),
+        Benchmark("decode.xml.no_data", lambda data: Event.decode(data, False), xml),
+        Benchmark("decode.dict", Event.decode, parsed),
+        Benchmark("decode.rtp", rtp_receiver(), rtp_packets()),
+        *(
+            Benchmark(
+                f"reassemble.rtp.{fragments}_fragments",
+                rtp_receiver(decode=False),
+                [rtp_fragments(fragments)],
+            )
+            for fragments in RTP_FRAGMENTS
+        ),
+        Benchmark(
+            "parse.websocket_notification", _parse_ws_notification, notifications
+        ),
+        Benchmark("parse.websocket_frame", parse_notify_frame, frames),
+        Benchmark(
+            "decode.websocket_notification.two_step",
+            lambda data: Event.decode(_parse_ws_notification(data)),
+            notifications,
+        ),
+        Benchmark(
+            "decode.websocket_notification.direct",
+            notification_to_event,
+            notifications,
+        ),
+        Benchmark(
+            "decode.websocket_notification.direct.no_data",
+            lambda data: notification_to_event(data, False),
+            notifications,
+        ),
+        Benchmark("parse.mqtt", mqtt_json_to_event, mqtt),
+        Benchmark("handler.xml", event_manager().handler, xml),
+        Benchmark("handler.dict", event_manager().handler, parsed),
+        Benchmark(
+            f"handler.xml.{SUBSCRIBERS}_subscribers",
+            event_manager(SUBSCRIBERS).handler,
+            xml,
+        ),
+        Benchmark(
+            "handler.xml.no_data",
+            event_manager(retain_data=False).handler,
+            xml,
+        ),
+        Benchmark(
+            "handler.xml.suppress_unchanged",
+            event_manager(suppress_unchanged=True).handler,
+            xml,
+        ),
+        Benchmark(
+            "handle_batch.xml",
+            event_manager().handle_batch,
+            [xml],
+            events_per_call=len(xml),
+        ),
+    ]
+
+
+def run(iterations: int, names: Sequence[str] = ()) -> dict[str, Any]:
+    """Run benchmarks with a name starting with any of names, or all."""
+    results = [
+        asdict(benchmark.run(iterations))
+        for benchmark in benchmarks()
+        if not names or benchmark.name.startswith(tuple(names))
+    ]
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run benchmarks and write results as JSON to stdout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument(
+        "names", nargs="*", help="Only run benchmarks with a name starting with"
+    )
+    args = parser.parse_args(argv)
+    # Unsupported fixture topics would otherwise be logged by every event manager
+    logger = logging.getLogger("axis")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        report = run(args.iterations, args.names)
+    finally:
+        logger.setLevel(level)
+    sys.stdout.write(
+        orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+        + "\n"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Test event benchmarks.
+
+pytest tests/test_benchmarks.py
+"""
+
+from typing import TYPE_CHECKING
+
+from benchmarks.events import FORMAT_VERSION, benchmarks, main, percentile, run
+import orjson
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def test_benchmarks_run() -> None:
+    """Verify every benchmark runs and reports measurements."""
+    report = run(1)
+
+    assert report["version"] == FORMAT_VERSION
+    assert report["iterations"] == 1
+    assert [result["name"] for result in report["results"]] == [
+        benchmark.name for benchmark in benchmarks()
+    ]
+    for result in report["results"]:
+        assert result["events"] > 0
+        assert result["events_per_second"] > 0
+        assert set(result["latency_ns"]) == {"p50", "p90", "p99", "max"}
+        assert result["peak_allocated_bytes"] >= 0
+
+
+def test_percentile() -> None:
+    """Verify nearest rank percentiles."""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([5.0], 50) == 5
+    assert percentile([5.0], 99) == 5
+
+
+def test_benchmarks_main(capsys: pytest.CaptureFixture[str]) -> None:
+    """Verify selected benchmarks are written as JSON."""
+    assert main(["--iterations", "2", "decode.xml", "parse.mqtt"]) == 0
+
+    report = orjson.loads(capsys.readouterr().out)
+    assert [result["name"] for result in report["results"]] == [
+        "decode.xml",
+        "decode.xml.no_data",
+        "parse.mqtt",
+    ]
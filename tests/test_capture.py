@@ -0,0 +1,181 @@
+"""Test raw stream capture and replay.
+
+pytest --cov-report term-missing --cov=axis.capture tests/test_capture.py
+"""
+
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, Mock, patch
+
+import orjson
+import pytest
+
+from axis.capture import (
+    MAGIC,
+    RECORD_HEADER,
+    CaptureKind,
+    CaptureReader,
+    CaptureRecord,
+    CaptureWriter,
+    replay,
+)
+from axis.rtp import RTP_HEADER_SIZE
+from axis.rtsp import RTSPClient
+from axis.websocket import WebSocketClient
+
+from .event_fixtures import PIR_CHANGE, PIR_INIT
+from .packet_fixtures import RTP_PACKET2_FRAGMENT1, RTP_PACKET2_FRAGMENT2
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from axis.device import AxisDevice
+
+WEBSOCKET_FRAME = orjson.dumps(
+    {
+        "apiVersion": "1.0",
+        "method": "events:notify",
+        "params": {
+            "notification": {
+                "topic": "tns1:Device/tnsaxis:IO/Port",
+                "timestamp": 1700000000000,
+                "message": {
+                    "source": {"port": "1"},
+                    "key": {},
+                    "data": {"state": "1"},
+                },
+            }
+        },
+    }
+).decode()
+
+
+def test_capture_file(tmp_path: Path) -> None:
+    """Verify records written to a capture file can be read back."""
+    path = tmp_path / "events.cap"
+    with CaptureWriter(path) as writer:
+        writer.write(CaptureKind.RTP, PIR_INIT, timestamp=10.0)
+        writer.write_websocket(WEBSOCKET_FRAME)
+        writer.write_rtp(b"")
+        assert writer.records == 3
+
+    with CaptureReader(path) as reader:
+        records = list(reader)
+    assert records[0] == CaptureRecord(10.0, CaptureKind.RTP, PIR_INIT)
+    assert records[1].kind == CaptureKind.WEBSOCKET
+    assert records[1].data == WEBSOCKET_FRAME.encode()
+    assert records[1].timestamp == pytest.approx(time.time(), abs=10)
+    assert records[2].data == b""
+
+
+def test_truncated_capture_file(tmp_path: Path) -> None:
+    """Verify a record cut short while capturing is ignored."""
+    path = tmp_path / "events.cap"
+    with CaptureWriter(path) as writer:
+        writer.write_rtp(PIR_INIT)
+        writer.write_rtp(PIR_CHANGE)
+    path.write_bytes(path.read_bytes()[:-10])
+
+    with CaptureReader(path) as reader:
+        assert [record.data for record in reader] == [PIR_INIT]
+
+    path.write_bytes(MAGIC + RECORD_HEADER.pack(0.0, CaptureKind.RTP, 1)[:-1])
+    with CaptureReader(path) as reader:
+        assert list(reader) == []
+
+
+def test_not_a_capture_file(tmp_path: Path) -> None:
+    """Verify only capture files are accepted."""
+    path = tmp_path / "events.cap"
+    path.write_bytes(b"not a capture file")
+    with pytest.raises(ValueError, match="is not a capture file"):
+        CaptureReader(path)
+
+
+async def test_replay(tmp_path: Path, axis_device: AxisDevice) -> None:
+    """Verify replay feeds captured data to event manager at requested pace."""
+    path = tmp_path / "events.cap"
+    with CaptureWriter(path) as writer:
+        writer.write(CaptureKind.RTP, PIR_INIT, timestamp=100.0)
+        writer.write(CaptureKind.WEBSOCKET, b"not-json", timestamp=100.0)
+        writer.write(CaptureKind.WEBSOCKET, WEBSOCKET_FRAME.encode(), timestamp=100.1)
+        writer.write(CaptureKind.RTP, PIR_CHANGE, timestamp=100.2)
+
+    callback = Mock()
+    axis_device.event.subscribe(callback)
+
+    with patch("axis.capture.asyncio.sleep") as mock_sleep:
+        assert await replay(path, axis_device.event, speed=None) == 3
+    mock_sleep.assert_not_called()
+    assert [call.args[0].state for call in callback.call_args_list] == ["0", "1", "1"]
+    assert callback.call_args_list[1].args[0].id == "1"
+
+    with patch("axis.capture.asyncio.sleep") as mock_sleep:
+        assert await replay(path, axis_device.event, speed=2.0) == 3
+    delays = [call.args[0] for call in mock_sleep.call_args_list]
+    assert delays == [pytest.approx(0.05, abs=0.01), pytest.approx(0.1, abs=0.01)]
+
+    start = time.monotonic()
+    assert await replay(path, axis_device.event) == 3
+    assert time.monotonic() - start >= 0.2
+
+
+async def test_stream_manager_capture(tmp_path: Path, axis_device: AxisDevice) -> None:
+    """Verify stream manager captures reassembled RTP payloads."""
+    path = tmp_path / "events.cap"
+    stream_manager = axis_device.stream
+    stream_manager.start_capture(path)
+
+    stream = stream_manager._build_stream()
+    assert isinstance(stream, RTSPClient)
+    assert stream.capture is stream_manager.capture
+    stream_manager.stream = stream
+
+    stream.rtp.client.callback = Mock()
+    stream.rtp.client.datagram_received(RTP_PACKET2_FRAGMENT1, "addr")
+    stream.rtp.client.datagram_received(RTP_PACKET2_FRAGMENT2, "addr")
+    stream_manager.stop_capture()
+    assert stream.capture is None
+    stream.rtp.sock.close()
+
+    with CaptureReader(path) as reader:
+        assert [record.data for record in reader] == [
+            RTP_PACKET2_FRAGMENT1[RTP_HEADER_SIZE:]
+            + RTP_PACKET2_FRAGMENT2[RTP_HEADER_SIZE:]
+        ]
+
+
+async def test_stream_manager_capture_running_stream(
+    tmp_path: Path, axis_device: AxisDevice
+) -> None:
+    """Verify capture started on a running stream is attached to it."""
+    stream_manager = axis_device.stream
+    stream = stream_manager.stream = Mock(capture=None)
+
+    stream_manager.start_capture(tmp_path / "first.cap")
+    first = stream_manager.capture
+    assert stream.capture is first
+
+    # Starting a new capture replaces the running one
+    stream_manager.start_capture(tmp_path / "second.cap")
+    assert stream.capture is stream_manager.capture is not first
+
+    stream_manager.stop_capture()
+    assert stream.capture is None
+
+
+async def test_websocket_capture(tmp_path: Path, axis_device: AxisDevice) -> None:
+    """Verify websocket client captures notification frames."""
+    path = tmp_path / "events.cap"
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        MagicMock(),
+    )
+    client.capture = CaptureWriter(path)
+    client._handle_message("not-json")
+    client._handle_message(WEBSOCKET_FRAME)
+    client.capture.close()
+
+    with CaptureReader(path) as reader:
+        assert [record.data for record in reader] == [WEBSOCKET_FRAME.encode()]
@@ -7,7 +7,15 @@ from typing import TYPE_CHECKING, cast
 
 import pytest
 
-from axis.models.configuration import AuthScheme, Configuration, WebProtocol
+from axis.models.configuration import (
+    ANY_INTERFACE,
+    AuthScheme,
+    Configuration,
+    EventDecodeMode,
+    OverflowPolicy,
+    RtspTransport,
+    WebProtocol,
+)
 
 if TYPE_CHECKING:
     from aiohttp import ClientSession
@@ -36,6 +44,14 @@ async def test_configuration(session: ClientSession) -> None:
     assert config.auth_scheme == AuthScheme.AUTO
     assert config.websocket_enabled is False
     assert config.websocket_force is False
+    assert config.event_decode == EventDecodeMode.INLINE
+    assert config.event_buffer_size == 200
+    assert config.event_overflow_policy == OverflowPolicy.DROP_OLDEST
+    assert config.rtsp_transport == RtspTransport.UDP
+    assert config.stream_timeout == 0
+    assert config.shared_rtp_receiver is False
+    assert config.multicast_interface == ANY_INTERFACE
+    assert config.rtsp_event_filter is False
 
 
 async def test_minimal_configuration(session: ClientSession) -> None:
@@ -58,6 +74,7 @@ async def test_minimal_configuration(session: ClientSession) -> None:
     assert config.auth_scheme == AuthScheme.AUTO
     assert config.websocket_enabled is False
     assert config.websocket_force is False
+    assert config.event_decode == EventDecodeMode.INLINE
 
 
 async def test_configuration_websocket_can_be_enabled(session: ClientSession) -> None:
@@ -114,6 +131,69 @@ async def test_configuration_web_protocol_is_normalized_to_enum(
     assert config.web_proto is WebProtocol.HTTPS
 
 
+def test_unsupported_event_decode_mode_defaults_to_inline() -> None:
+    """Test unsupported event decode mode maps to INLINE."""
+    assert EventDecodeMode("unsupported") == EventDecodeMode.INLINE
+
+
+async def test_configuration_event_decode_is_normalized_to_enum(
+    session: ClientSession,
+) -> None:
+    """Test event decode input is normalized to enum value."""
+    config = Configuration(
+        session,
+        "192.168.1.6",
+        username="root",
+        password="pass",
+        event_decode=cast("EventDecodeMode", "process"),
+    )
+
+    assert config.event_decode is EventDecodeMode.PROCESS
+
+
+def test_unsupported_rtsp_transport_defaults_to_udp() -> None:
+    """Test unsupported RTSP transport maps to UDP."""
+    assert RtspTransport("unsupported") == RtspTransport.UDP
+
+
+async def test_configuration_rtsp_transport_is_normalized_to_enum(
+    session: ClientSession,
+) -> None:
+    """Test RTSP transport input is normalized to enum value."""
+    config = Configuration(
+        session,
+        "192.168.1.6",
+        username="root",
+        password="pass",
+        rtsp_transport=cast("RtspTransport", "tcp"),
+    )
+
+    assert config.rtsp_transport is RtspTransport.TCP
+
+
+async def test_configuration_event_buffer(session: ClientSession) -> None:
+    """Test event overflow policy is normalized and buffer size validated."""
+    config = Configuration(
+        session,
+        "192.168.1.6",
+        username="root",
+        password="pass",
+        event_buffer_size=10,
+        event_overflow_policy=cast("OverflowPolicy", "latest_per_key"),
+    )
+    assert config.event_buffer_size == 10
+    assert config.event_overflow_policy is OverflowPolicy.LATEST_PER_KEY
+
+    with pytest.raises(ValueError, match="Event buffer size must be at least 1"):
+        Configuration(
+            session,
+            "192.168.1.6",
+            username="root",
+            password="pass",
+            event_buffer_size=0,
+        )
+
+
 async def test_configuration_default_https_port_is_443(session: ClientSession) -> None:
     """Test default HTTPS configuration uses port 443."""
     config = Configuration(
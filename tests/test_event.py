@@ -3,7 +3,8 @@
 pytest --cov-report term-missing --cov=axis.models.event tests/test_event.py
 """
 
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+from xml.parsers.expat import ExpatError
 
 import pytest
 
@@ -11,7 +12,10 @@ from axis.models.event import (
     Event,
     EventOperation,
     EventTopic,
-    extract_name_value,
+    EventXmlParser,
+    element_key,
+    event_key,
+    resolve_topic,
     traverse,
 )
 
@@ -459,30 +463,190 @@ def test_traverse_non_dict_data():
     assert result == {}
 
 
-def test_extract_name_value_empty_list():
-    """Test extract_name_value with empty SimpleItem list."""
-    # Empty list should return empty strings
-    data = {"SimpleItem": []}
-    name, value = extract_name_value(data)
-    assert name == ""
-    assert value == ""
-
-
-def test_extract_name_value_with_prefer():
-    """Test extract_name_value with prefer parameter finds matching item."""
-    # Test with prefer parameter that matches an item
-    data = {
-        "SimpleItem": [
-            {"Name": "State", "Value": "0"},
-            {"Name": "active", "Value": "1"},
-            {"Name": "Other", "Value": "2"},
-        ]
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("MetadataStream", "MetadataStream"),
+        ("http://www.onvif.org/ver10/schema MetadataStream", "MetadataStream"),
+        ("http://docs.oasis-open.org/wsn/b-2 Topic", "Topic"),
+        (
+            "http://www.w3.org/2005/08/addressing Address",
+            "http://www.w3.org/2005/08/addressing:Address",
+        ),
+    ],
+)
+def test_element_key(name: str, expected: str) -> None:
+    """Verify namespaced element names map to xmltodict style keys."""
+    assert element_key(name) == expected
+
+
+@pytest.mark.parametrize(
+    ("input", "expected"),
+    [
+        # Root element is not a metadata stream
+        (b"<Other><Event/></Other>", {}),
+        # Metadata stream root in an unexpected namespace
+        (b'<a:MetadataStream xmlns:a="urn:other"><a:Event/></a:MetadataStream>', {}),
+        # Message without property operation, source or data
+        (
+            (
+                b'<tt:MetadataStream xmlns:tt="http://www.onvif.org/ver10/schema">'
+                b'<tt:Event><wsnt:NotificationMessage xmlns:wsnt="http://docs.oasis-open.org/wsn/b-2">'
+                b"<wsnt:Topic>tns1:Device/tnsaxis:Sensor/PIR</wsnt:Topic>"
+                b"<wsnt:Message><tt:Message/></wsnt:Message>"
+                b"</wsnt:NotificationMessage></tt:Event></tt:MetadataStream>"
+            ),
+            {
+                "operation": "",
+                "topic": "tns1:Device/tnsaxis:Sensor/PIR",
+                "source": "",
+                "source_idx": "",
+                "type": "",
+                "value": "",
+            },
+        ),
+        # Data with several simple items prefers "active"
+        (
+            (
+                b'<tt:MetadataStream xmlns:tt="http://www.onvif.org/ver10/schema">'
+                b'<tt:Event><wsnt:NotificationMessage xmlns:wsnt="http://docs.oasis-open.org/wsn/b-2">'
+                b"<wsnt:Topic> tnsaxis:CameraApplicationPlatform/VMD/Camera1Profile1 </wsnt:Topic>"
+                b'<wsnt:Message><tt:Message PropertyOperation="Changed">'
+                b'<tt:Source><tt:SimpleItem Name="channel" Value="1"/>'
+                b'<tt:SimpleItem Name="profile" Value="2"/></tt:Source>'
+                b'<tt:Data><tt:SimpleItem Name="classTypes" Value="human"/>'
+                b'<tt:SimpleItem Name="active" Value="1"/></tt:Data>'
+                b"</tt:Message></wsnt:Message>"
+                b"</wsnt:NotificationMessage></tt:Event></tt:MetadataStream>"
+            ),
+            {
+                "operation": "Changed",
+                "topic": "tnsaxis:CameraApplicationPlatform/VMD/Camera1Profile1",
+                "source": "channel",
+                "source_idx": "1",
+                "type": "active",
+                "value": "1",
+            },
+        ),
+    ],
+)
+def test_event_xml_parser(input: bytes, expected: dict[str, str]) -> None:
+    """Verify streaming parser only extracts event fields from expected paths."""
+    assert EventXmlParser().parse(input) == expected
+
+
+def test_event_xml_parser_is_reusable() -> None:
+    """Verify parser state is reset between documents."""
+    parser = EventXmlParser()
+    assert parser.parse(PIR_INIT)["value"] == "0"
+    assert parser.parse(PIR_CHANGE)["value"] == "1"
+    assert parser.parse(FIRST_MESSAGE) == {}
+
+
+def test_event_xml_parser_several_messages() -> None:
+    """Verify a packet with several notification messages yields the first one."""
+    start = PORT_0_INIT.index(b"<wsnt:NotificationMessage")
+    end = PORT_0_INIT.index(b"</tt:Event>")
+    data = PIR_INIT.replace(b"</tt:Event>", PORT_0_INIT[start:end] + b"</tt:Event>")
+
+    assert EventXmlParser().parse(data) == EventXmlParser().parse(PIR_INIT)
+
+
+def test_event_xml_parser_malformed_xml() -> None:
+    """Verify malformed metadata raises an expat error."""
+    with pytest.raises(ExpatError):
+        Event.decode(b"<tt:MetadataStream")
+
+
+def test_decode_many() -> None:
+    """Verify batch decoding matches decoding one payload at a time."""
+    ws_event = {
+        "topic": "tns1:Device/tnsaxis:Sensor/PIR",
+        "source": "sensor",
+        "source_idx": "0",
+        "type": "state",
+        "value": "1",
     }
-    name, value = extract_name_value(data, prefer="active")
-    assert name == "active"
-    assert value == "1"
-
-    # Test with prefer parameter that doesn't match (falls back to first item)
-    name, value = extract_name_value(data, prefer="nonexistent")
-    assert name == "State"
-    assert value == "0"
+    batch = [PIR_INIT, ws_event, FIRST_MESSAGE, VMD4_ANY_CHANGE]
+
+    assert list(Event.decode_many(batch)) == [Event.decode(item) for item in batch]
+
+
+def test_decode_event_is_passed_through() -> None:
+    """Verify decoding an event returns the same event."""
+    event = Event.decode(PIR_INIT)
+    assert Event.decode(event) is event
+
+
+def test_decode_many_malformed_xml() -> None:
+    """Verify malformed metadata is skipped without losing the rest of the batch."""
+    malformed = b"<tt:MetadataStream"
+    with pytest.raises(ExpatError):
+        list(Event.decode_many([PIR_INIT, malformed, PIR_CHANGE]))
+
+    on_error = Mock()
+    events = list(
+        Event.decode_many([PIR_INIT, malformed, PIR_CHANGE], on_error=on_error)
+    )
+    assert [event.state for event in events] == ["0", "1"]
+    on_error.assert_called_once()
+    assert on_error.call_args.args[0] == malformed
+    assert isinstance(on_error.call_args.args[1], ExpatError)
+
+
+@pytest.mark.parametrize(
+    ("topic", "expected"),
+    [
+        ("tns1:Device/tnsaxis:Sensor/PIR", (EventTopic.PIR, "")),
+        ("tns1:Device/tnsaxis:IO/Port/3", (EventTopic.PORT_INPUT, "3")),
+        (
+            "tnsaxis:CameraApplicationPlatform/VMD/Camera1Profile1",
+            (EventTopic.MOTION_DETECTION_4, "Camera1Profile1"),
+        ),
+        ("tnsaxis:Storage/Alert", (EventTopic.UNKNOWN, "Alert")),
+        ("", (EventTopic.UNKNOWN, "")),
+    ],
+)
+def test_resolve_topic(topic: str, expected: tuple[EventTopic, str]) -> None:
+    """Verify topic base and trailing source index resolution."""
+    assert resolve_topic(topic) == expected
+
+
+def test_resolve_topic_cache() -> None:
+    """Verify repeated topics are served from the topic cache."""
+    resolve_topic.cache_clear()
+
+    Event.decode(VMD4_ANY_INIT)
+    Event.decode(VMD4_ANY_CHANGE)
+    Event.decode(PIR_INIT)
+
+    cache_info = resolve_topic.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 2
+    assert cache_info.currsize == 2
+
+
+def test_event_key() -> None:
+    """Verify event data and events are keyed by topic and source."""
+    assert event_key(PIR_INIT) == ("tns1:Device/tnsaxis:Sensor/PIR", "0")
+    assert event_key(PIR_CHANGE) == event_key(PIR_INIT)
+    assert event_key(
+        {"topic": "tns1:Device/tnsaxis:Sensor/PIR", "source_idx": "0"}
+    ) == event_key(PIR_INIT)
+    assert event_key({}) == ("", "")
+    assert event_key(Event.decode(PIR_INIT)) == event_key(PIR_INIT)
+
+
+def test_decode_without_retaining_data() -> None:
+    """Verify raw event data can be dropped from slotted events."""
+    event = Event.decode(PIR_CHANGE, retain_data=False)
+
+    assert not hasattr(event, "__dict__")
+    assert event.data == {}
+    assert event.topic_base == EventTopic.PIR
+    assert event.state == "1"
+    assert event.is_tripped
+
+    assert [
+        event.data for event in Event.decode_many([PIR_INIT], retain_data=False)
+    ] == [{}]
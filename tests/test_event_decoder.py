@@ -0,0 +1,348 @@
+"""Test Axis event decode pipeline.
+
+pytest --cov-report term-missing --cov=axis.interfaces.event_decoder tests/test_event_decoder.py
+"""
+
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+
+from axis.device import AxisDevice
+from axis.interfaces.event_decoder import (
+    EventDecoder,
+    get_executor,
+    shutdown_executors,
+)
+from axis.models.configuration import Configuration, EventDecodeMode, OverflowPolicy
+from axis.models.event import Event, event_key
+from axis.payload_queue import PayloadQueue
+from axis.rtsp import Signal
+
+from .conftest import HOST
+from .event_fixtures import PIR_CHANGE, PIR_INIT, PTZ_MOVE_END, PTZ_MOVE_START
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+@pytest.fixture(autouse=True)
+def shared_executors():
+    """Shut down shared worker pools after each test."""
+    yield
+    shutdown_executors()
+
+
+@pytest.fixture
+def subscriber(axis_device: AxisDevice) -> Mock:
+    """Return subscriber of all events."""
+    callback = Mock()
+    axis_device.event.subscribe(callback)
+    return callback
+
+
+async def wait_for_delivery(decoder: EventDecoder) -> None:
+    """Wait for decoder to deliver all submitted data, also data submitted meanwhile."""
+    while decoder.depth:
+        futures = [future for _, future, _ in decoder._pending]
+        await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 5)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize("mode", [EventDecodeMode.THREAD, EventDecodeMode.PROCESS])
+async def test_decode_in_worker_pool(
+    axis_device: AxisDevice, subscriber: Mock, mode: EventDecodeMode
+) -> None:
+    """Verify events decoded in worker pool are delivered in order."""
+    decoder = EventDecoder(axis_device.event, mode)
+    for data in (PIR_INIT, PTZ_MOVE_START, PIR_CHANGE, PTZ_MOVE_END):
+        decoder.submit(data)
+    assert decoder.depth == 4
+    assert subscriber.call_count == 0
+
+    await wait_for_delivery(decoder)
+    assert [
+        (call.args[0].id, call.args[0].state) for call in subscriber.call_args_list
+    ] == [
+        ("0", "0"),
+        ("1", "1"),
+        ("0", "1"),
+        ("1", "0"),
+    ]
+    assert decoder.stats.submitted == 4
+    assert decoder.stats.delivered == 4
+    assert decoder.stats.max_depth == 4
+    assert 0 < decoder.stats.last_latency <= decoder.stats.max_latency
+
+
+async def test_slow_decode_keeps_order(
+    axis_device: AxisDevice, subscriber: Mock
+) -> None:
+    """Verify an event decoded quicker waits for earlier events."""
+    decode = Event.decode
+
+    def slow_decode(data: bytes, retain_data: bool) -> Event:
+        if data == PIR_INIT:
+            time.sleep(0.05)
+        return decode(data, retain_data)
+
+    decoder = EventDecoder(axis_device.event)
+    with patch.object(Event, "decode", side_effect=slow_decode):
+        decoder.submit(PIR_INIT)
+        decoder.submit(PIR_CHANGE)
+        await wait_for_delivery(decoder)
+
+    assert [call.args[0].state for call in subscriber.call_args_list] == ["0", "1"]
+
+
+async def test_decode_failure(axis_device: AxisDevice, subscriber: Mock) -> None:
+    """Verify malformed data is dropped without blocking later events."""
+    decoder = EventDecoder(axis_device.event)
+    decoder.submit(b"<tt:MetadataStream")
+    decoder.submit(PIR_INIT)
+    await wait_for_delivery(decoder)
+
+    assert subscriber.call_count == 1
+    assert decoder.stats.failed == 1
+    assert decoder.stats.delivered == 1
+
+
+async def test_cancel(axis_device: AxisDevice, subscriber: Mock) -> None:
+    """Verify cancelled data is never delivered."""
+    decoder = EventDecoder(axis_device.event)
+    decoder.submit(PIR_INIT)
+    decoder.cancel()
+    assert decoder.depth == 0
+
+    await asyncio.sleep(0.01)
+    assert subscriber.call_count == 0
+
+
+@pytest.fixture
+def gate() -> threading.Event:
+    """Hold decoding in worker threads until the gate is opened."""
+    gate = threading.Event()
+    decode = Event.decode
+
+    def gated_decode(data: bytes, retain_data: bool) -> Event:
+        gate.wait(5)
+        return decode(data, retain_data)
+
+    with patch.object(Event, "decode", side_effect=gated_decode):
+        yield gate
+        gate.set()
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected", "stats"),
+    [
+        (OverflowPolicy.DROP_OLDEST, [("1", "1"), ("0", "1"), ("1", "0")], (1, 0)),
+        (OverflowPolicy.DROP_NEWEST, [("0", "0"), ("1", "1"), ("0", "1")], (1, 0)),
+        (OverflowPolicy.LATEST_PER_KEY, [("0", "0"), ("0", "1"), ("1", "0")], (0, 1)),
+    ],
+)
+async def test_bounded_pending(
+    axis_device: AxisDevice,
+    gate: threading.Event,
+    policy: OverflowPolicy,
+    expected: list[tuple[str, str]],
+    stats: tuple[int, int],
+) -> None:
+    """Verify overflow policy applies once decoding falls behind."""
+    callback = Mock()
+    axis_device.event.subscribe(callback)
+    decoder = EventDecoder(axis_device.event, maxlen=3, policy=policy)
+    for data in (PIR_INIT, PTZ_MOVE_START, PIR_CHANGE, PTZ_MOVE_END):
+        decoder.submit(data)
+    assert decoder.depth == 3
+    assert decoder.stats.max_depth == 3
+
+    gate.set()
+    await wait_for_delivery(decoder)
+    assert [
+        (call.args[0].id, call.args[0].state) for call in callback.call_args_list
+    ] == expected
+    assert (decoder.stats.dropped, decoder.stats.collapsed) == stats
+
+
+async def test_latest_per_key_malformed_data(
+    axis_device: AxisDevice, gate: threading.Event
+) -> None:
+    """Verify malformed data is not collapsed, oldest data is dropped instead.
+
+    Malformed pending data is only parsed once for its key.
+    """
+    malformed = b"<tt:MetadataStream"
+    decoder = EventDecoder(
+        axis_device.event, maxlen=2, policy=OverflowPolicy.LATEST_PER_KEY
+    )
+    with patch(
+        "axis.interfaces.event_decoder.event_key", side_effect=event_key
+    ) as mock_event_key:
+        for data in (malformed, PIR_INIT, malformed, PTZ_MOVE_START, PIR_CHANGE):
+            decoder.submit(data)
+
+    assert [data for _, _, data in decoder._pending] == [PTZ_MOVE_START, PIR_CHANGE]
+    assert decoder.stats.dropped == 3
+    assert decoder.stats.collapsed == 0
+    assert [call.args[0] for call in mock_event_key.call_args_list].count(
+        malformed
+    ) == 2
+
+
+async def test_shared_executor() -> None:
+    """Verify worker pools are shared per decode mode."""
+    thread_executor = get_executor(EventDecodeMode.THREAD)
+    assert get_executor(EventDecodeMode.THREAD) is thread_executor
+    assert get_executor(EventDecodeMode.PROCESS) is not thread_executor
+
+    shutdown_executors()
+    assert get_executor(EventDecodeMode.THREAD) is not thread_executor
+
+
+async def test_stream_manager_uses_decoder(session: ClientSession) -> None:
+    """Verify stream manager hands data to decoder when configured."""
+    device = AxisDevice(
+        Configuration(
+            session,
+            HOST,
+            username="root",
+            password="pass",
+            event_decode=EventDecodeMode.THREAD,
+        )
+    )
+    device.enable_events()
+    callback = Mock()
+    device.event.subscribe(callback)
+    assert device.stream.event_decoder is not None
+
+    device.stream.stream = Mock(data=PIR_INIT)
+    device.stream.session_callback(Signal.DATA)
+    await wait_for_delivery(device.stream.event_decoder)
+    assert callback.call_args.args[0].state == "0"
+
+    device.stream.stream.drain.return_value = [PIR_CHANGE, Event.decode(PIR_INIT)]
+    device.stream.session_callback(Signal.DATA_BATCH)
+    await wait_for_delivery(device.stream.event_decoder)
+    assert [call.args[0].state for call in callback.call_args_list[-2:]] == ["1", "0"]
+
+
+async def test_stream_manager_backpressure(
+    session: ClientSession, gate: threading.Event
+) -> None:
+    """Verify stream data is held back while the decoder is full."""
+    device = AxisDevice(
+        Configuration(
+            session,
+            HOST,
+            username="root",
+            password="pass",
+            event_decode=EventDecodeMode.THREAD,
+            event_buffer_size=2,
+            event_overflow_policy=OverflowPolicy.BACKPRESSURE,
+        )
+    )
+    device.enable_events()
+    callback = Mock()
+    device.event.subscribe(callback)
+    decoder = device.stream.event_decoder
+
+    device.stream.stream = Mock()
+    device.stream.stream.drain.return_value = [PIR_INIT, PTZ_MOVE_START]
+    device.stream.session_callback(Signal.DATA_BATCH)
+    assert decoder.full
+
+    device.stream.stream.drain.reset_mock()
+    device.stream.session_callback(Signal.DATA_BATCH)
+    device.stream.session_callback(Signal.DATA)
+    device.stream.stream.drain.assert_not_called()
+    assert decoder.depth == 2
+
+    # Held back data is pulled from stream once the decoder has room
+    device.stream.stream.drain.side_effect = [[PIR_CHANGE, PTZ_MOVE_END], []]
+    gate.set()
+    await wait_for_delivery(decoder)
+    assert [call.args[0].state for call in callback.call_args_list] == [
+        "0",
+        "1",
+        "1",
+        "0",
+    ]
+    assert decoder.stats.dropped == 0
+
+
+async def test_stream_manager_backpressure_limits_depth(
+    session: ClientSession, gate: threading.Event
+) -> None:
+    """Verify only as much data as the decoder has room for leaves the stream."""
+    device = AxisDevice(
+        Configuration(
+            session,
+            HOST,
+            username="root",
+            password="pass",
+            event_decode=EventDecodeMode.THREAD,
+            event_buffer_size=4,
+            event_overflow_policy=OverflowPolicy.BACKPRESSURE,
+        )
+    )
+    device.enable_events()
+    callback = Mock()
+    device.event.subscribe(callback)
+    decoder = device.stream.event_decoder
+    queue = PayloadQueue[bytes](9)
+    device.stream.stream = Mock(drain=queue.drain)
+
+    for data in (PIR_INIT, PIR_CHANGE, PIR_INIT):
+        queue.append(data)
+    device.stream.session_callback(Signal.DATA_BATCH)
+    assert decoder.depth == 3
+
+    for data in (PIR_CHANGE, PIR_INIT) * 3:
+        queue.append(data)
+    device.stream.session_callback(Signal.DATA_BATCH)
+    assert decoder.depth == 4
+    assert len(queue) == 5
+
+    gate.set()
+    await wait_for_delivery(decoder)
+    assert callback.call_count == 9
+    assert decoder.stats.max_depth == 4
+    assert len(queue) == 0
+
+    # Room made after the stream is gone is ignored
+    for data in (PIR_CHANGE, PIR_INIT) * 2:
+        decoder.submit(data)
+    device.stream.stream = None
+    await wait_for_delivery(decoder)
+    assert callback.call_count == 13
+
+
+async def test_stream_manager_stop_cancels_decoder(
+    session: ClientSession, gate: threading.Event
+) -> None:
+    """Verify events still being decoded are not delivered after stop."""
+    device = AxisDevice(
+        Configuration(
+            session,
+            HOST,
+            username="root",
+            password="pass",
+            event_decode=EventDecodeMode.THREAD,
+        )
+    )
+    device.enable_events()
+    callback = Mock()
+    device.event.subscribe(callback)
+
+    device.stream.stream = Mock(data=PIR_INIT)
+    device.stream.session_callback(Signal.DATA)
+    device.stream.stop()
+    assert device.stream.event_decoder.depth == 0
+
+    gate.set()
+    await asyncio.sleep(0.01)
+    callback.assert_not_called()
@@ -3,9 +3,10 @@
 pytest --cov-report term-missing --cov=axis.event_stream tests/test_event_stream.py
 """
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -387,6 +388,46 @@ def test_mqtt_object_analytics_mixed_data_prefers_active(
     assert event.is_tripped is False
 
 
+def test_handle_batch(event_manager: EventManager, subscriber: Mock) -> None:
+    """Verify a batch of events is dispatched to subscribers in order."""
+    event_manager.handle_batch(
+        [PIR_INIT, GLOBAL_SCENE_CHANGE, PIR_CHANGE, VMD4_C1P1_INIT]
+    )
+    assert subscriber.call_count == 3
+
+    events: list[Event] = [call.args[0] for call in subscriber.call_args_list]
+    assert [(event.topic_base, event.state) for event in events] == [
+        (EventTopic.PIR, "0"),
+        (EventTopic.PIR, "1"),
+        (EventTopic.MOTION_DETECTION_4, "0"),
+    ]
+
+
+def test_handle_batch_malformed_data(
+    event_manager: EventManager, subscriber: Mock, caplog
+) -> None:
+    """Verify malformed data is logged and the rest of the batch is delivered."""
+    with caplog.at_level(logging.WARNING):
+        event_manager.handle_batch([PIR_INIT, b"<tt:MetadataStream", PIR_CHANGE])
+
+    assert [call.args[0].state for call in subscriber.call_args_list] == ["0", "1"]
+    assert event_manager.stats.failed == 1
+    assert "Failed to decode event data" in caplog.text
+
+
+def test_event_manager_without_retaining_data(
+    event_manager: EventManager, subscriber: Mock
+) -> None:
+    """Verify event manager can drop raw event data before dispatching."""
+    event_manager.retain_data = False
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handle_batch([PIR_CHANGE])
+
+    assert [call.args[0].data for call in subscriber.call_args_list] == [{}, {}]
+    assert subscriber.call_args[0][0].state == "1"
+
+
 def test_unsupported_event(event_manager: EventManager, subscriber: Mock) -> None:
     """Verify that unsupported events aren't signalled to subscribers."""
     event_manager.handler(GLOBAL_SCENE_CHANGE)
@@ -501,6 +542,215 @@ def test_subscription(event_manager: EventManager) -> None:
     unsub_vmd4_c1p1()
 
 
+def test_event_states(event_manager: EventManager, subscriber: Mock) -> None:
+    """Verify last event per topic and id is tracked."""
+    assert event_manager.get_state(EventTopic.PIR, "0") is None
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(VMD4_C1P1_INIT)
+    event_manager.handler(PIR_CHANGE)
+    event_manager.handler(GLOBAL_SCENE_CHANGE)
+
+    pir = event_manager.get_state(EventTopic.PIR, "0")
+    assert pir is subscriber.call_args[0][0]
+    assert pir.state == "1"
+
+    snapshot = event_manager.snapshot()
+    assert list(snapshot) == [
+        (EventTopic.MOTION_DETECTION_4, "Camera1Profile1"),
+        (EventTopic.PIR, "0"),
+    ]
+    event_manager.handler(VMD4_C1P1_CHANGE)
+    assert snapshot[(EventTopic.MOTION_DETECTION_4, "Camera1Profile1")].state == "0"
+
+
+def test_event_states_are_bounded(event_manager: EventManager) -> None:
+    """Verify least recently updated state is evicted when table is full."""
+    with patch("axis.interfaces.event_manager.MAX_TRACKED_STATES", 2):
+        event_manager.handler(PIR_INIT)
+        event_manager.handler(VMD4_C1P1_INIT)
+        event_manager.handler(PIR_CHANGE)
+        event_manager.handler(VMD4_C1P2_INIT)
+
+    assert list(event_manager.snapshot()) == [
+        (EventTopic.PIR, "0"),
+        (EventTopic.MOTION_DETECTION_4, "Camera1Profile2"),
+    ]
+
+
+def test_suppress_unchanged_events(
+    event_manager: EventManager, subscriber: Mock
+) -> None:
+    """Verify changed events repeating the current state can be dropped."""
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(PIR_CHANGE)
+    event_manager.handler(PIR_CHANGE)
+    assert subscriber.call_count == 4
+    assert event_manager.stats.unchanged == 0
+
+    event_manager.suppress_unchanged = True
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(PIR_CHANGE)
+    event_manager.handler(PIR_CHANGE)
+    assert subscriber.call_count == 6
+    assert event_manager.stats.unchanged == 1
+
+
+def _pir_event(value: str) -> dict[str, str]:
+    """Build a changed PIR event dict."""
+    return {
+        "operation": "Changed",
+        "topic": "tns1:Device/tnsaxis:Sensor/PIR",
+        "source": "sensor",
+        "source_idx": "0",
+        "type": "state",
+        "value": value,
+    }
+
+
+async def test_debounce_events(event_manager: EventManager, subscriber: Mock) -> None:
+    """Verify only latest event is passed along after a debounce window."""
+    event_manager.debounce[EventTopic.PIR] = 0.01
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(_pir_event("1"))
+    event_manager.handler(_pir_event("0"))
+    event_manager.handler(_pir_event("1"))
+    event_manager.handler(VMD4_C1P1_INIT)
+    assert [call.args[0].state for call in subscriber.call_args_list] == ["0", "0"]
+    assert event_manager.get_state(EventTopic.PIR, "0").state == "0"
+
+    await asyncio.sleep(0.02)
+    assert [call.args[0].state for call in subscriber.call_args_list] == [
+        "0",
+        "0",
+        "1",
+    ]
+    assert event_manager.get_state(EventTopic.PIR, "0").state == "1"
+    assert event_manager.stats.coalesced == 2
+
+    # Window re-opened by the trailing event closes without new events
+    await asyncio.sleep(0.02)
+    assert subscriber.call_count == 3
+    assert event_manager._debounce_timers == {}
+
+
+async def test_debounce_drops_unchanged_trailing_event(
+    event_manager: EventManager, subscriber: Mock
+) -> None:
+    """Verify a trailing event returning to the current state is suppressed."""
+    event_manager.suppress_unchanged = True
+    event_manager.debounce[EventTopic.PIR] = 0.01
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(_pir_event("1"))
+    event_manager.handler(_pir_event("1"))
+    event_manager.handler(_pir_event("0"))
+
+    await asyncio.sleep(0.02)
+    assert subscriber.call_count == 1
+    assert event_manager.stats.unchanged == 2
+    assert event_manager.stats.coalesced == 1
+
+
+def test_debounce_without_event_loop(
+    event_manager: EventManager, subscriber: Mock
+) -> None:
+    """Verify events are passed along as is without an event loop to debounce."""
+    event_manager.debounce[EventTopic.PIR] = 0.01
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(_pir_event("1"))
+    assert [call.args[0].state for call in subscriber.call_args_list] == ["0", "1"]
+    assert event_manager._debounce_timers == {}
+
+
+async def test_cancel_debounce(event_manager: EventManager, subscriber: Mock) -> None:
+    """Verify cancelling debounce drops events held back by open windows."""
+    event_manager.debounce[EventTopic.PIR] = 0.01
+
+    event_manager.handler(PIR_INIT)
+    event_manager.handler(_pir_event("1"))
+    event_manager.cancel_debounce()
+    assert event_manager._debounce_timers == {}
+
+    await asyncio.sleep(0.02)
+    assert subscriber.call_count == 1
+    assert event_manager.get_state(EventTopic.PIR, "0").state == "0"
+
+
+def test_subscription_routes(event_manager: EventManager) -> None:
+    """Validate routes are updated when subscriptions change."""
+    subscriber_any = Mock()
+    subscriber_c1p1 = Mock()
+    subscriber_pir = Mock()
+
+    unsub_any = event_manager.subscribe(subscriber_any)
+    event_manager.handler(VMD4_C1P1_INIT)
+    event_manager.handler(PIR_INIT)
+    assert event_manager._routes == {
+        (
+            "Camera1Profile1",
+            EventTopic.MOTION_DETECTION_4,
+            EventOperation.INITIALIZED,
+        ): (subscriber_any,),
+        ("0", EventTopic.PIR, EventOperation.INITIALIZED): (subscriber_any,),
+    }
+
+    # Only routes matching the new subscription are rebuilt
+    unsub_c1p1 = event_manager.subscribe(
+        subscriber_c1p1,
+        id_filter="Camera1Profile1",
+        topic_filter=EventTopic.MOTION_DETECTION_4,
+    )
+    event_manager.subscribe(subscriber_pir, topic_filter=EventTopic.PIR)
+    assert list(event_manager._routes) == []
+
+    event_manager.handler(VMD4_C1P1_CHANGE)
+    event_manager.handler(PIR_CHANGE)
+    assert subscriber_any.call_count == 4
+    assert subscriber_c1p1.call_count == 1
+    assert subscriber_pir.call_count == 1
+
+    unsub_c1p1()
+    assert list(event_manager._routes) == [
+        ("0", EventTopic.PIR, EventOperation.CHANGED)
+    ]
+
+    unsub_any()
+    event_manager.handler(VMD4_C1P1_CHANGE)
+    event_manager.handler(PIR_CHANGE)
+    assert subscriber_any.call_count == 4
+    assert subscriber_c1p1.call_count == 1
+    assert subscriber_pir.call_count == 2
+
+
+def test_subscription_topic_filter(event_manager: EventManager) -> None:
+    """Verify topics of interest follow subscriptions."""
+    listener = Mock()
+    event_manager.subscription_callbacks.append(listener)
+    assert event_manager.topic_filter() is None
+
+    unsub_pir = event_manager.subscribe(Mock(), topic_filter=EventTopic.PIR)
+    event_manager.subscribe(
+        Mock(),
+        id_filter="1",
+        topic_filter=(EventTopic.RELAY, EventTopic.PIR),
+    )
+    assert event_manager.topic_filter() == (EventTopic.RELAY, EventTopic.PIR)
+    assert listener.call_count == 2
+
+    unsub_any = event_manager.subscribe(Mock())
+    assert event_manager.topic_filter() is None
+
+    unsub_any()
+    unsub_pir()
+    unsub_pir()
+    assert event_manager.topic_filter() == (EventTopic.RELAY, EventTopic.PIR)
+    assert listener.call_count == 5
+
+
 async def test_event_manager_unsubscribe_twice(event_manager: EventManager):
     """Test calling unsubscribe twice does not raise exception."""
     callback = Mock()
@@ -0,0 +1,91 @@
+"""Test bounded payload queue.
+
+pytest --cov-report term-missing --cov=axis.payload_queue tests/test_payload_queue.py
+"""
+
+import pytest
+
+from axis.models.configuration import OverflowPolicy
+from axis.models.event import event_key
+from axis.payload_queue import PayloadQueue, PayloadQueueStats
+
+from .event_fixtures import (
+    PIR_CHANGE,
+    PIR_INIT,
+    PORT_0_INIT,
+    RELAY_INIT,
+    VMD4_ANY_INIT,
+)
+
+
+def drain(queue: PayloadQueue[bytes]) -> list[bytes]:
+    """Pop all queued payloads."""
+    return [queue.popleft() for _ in range(len(queue))]
+
+
+def test_drop_oldest() -> None:
+    """Verify oldest payload is dropped when queue is full."""
+    queue = PayloadQueue[bytes](2)
+    for payload in (b"a", b"b", b"c"):
+        queue.append(payload)
+    assert drain(queue) == [b"b", b"c"]
+    assert queue.stats == PayloadQueueStats(enqueued=3, dropped=1, max_depth=2)
+
+    with pytest.raises(IndexError):
+        queue.popleft()
+
+    for payload in (b"d", b"e"):
+        queue.append(payload)
+    assert queue.drain(1) == [b"d"]
+    assert queue.drain(2) == [b"e"]
+    assert len(queue) == 0
+
+
+def test_drop_newest() -> None:
+    """Verify new payload is dropped when queue is full."""
+    queue = PayloadQueue[bytes](2, OverflowPolicy.DROP_NEWEST)
+    for payload in (b"a", b"b", b"c"):
+        queue.append(payload)
+    assert drain(queue) == [b"a", b"b"]
+    assert queue.stats.dropped == 1
+
+
+def test_latest_per_key() -> None:
+    """Verify queued payload of same topic and source is replaced."""
+    queue = PayloadQueue[bytes](3, OverflowPolicy.LATEST_PER_KEY, event_key)
+    for payload in (PIR_INIT, PORT_0_INIT, VMD4_ANY_INIT, PIR_CHANGE):
+        queue.append(payload)
+    assert drain(queue) == [PORT_0_INIT, VMD4_ANY_INIT, PIR_CHANGE]
+    assert queue.stats == PayloadQueueStats(enqueued=4, collapsed=1, max_depth=3)
+
+    # Oldest payload is dropped when no payload shares the key
+    for payload in (PORT_0_INIT, VMD4_ANY_INIT, PIR_INIT, RELAY_INIT):
+        queue.append(payload)
+    assert drain(queue) == [VMD4_ANY_INIT, PIR_INIT, RELAY_INIT]
+    assert queue.stats.dropped == 1
+    assert queue._keys == {}
+
+
+def test_latest_per_key_malformed_payload() -> None:
+    """Verify payloads that can not be keyed fall back to dropping the oldest."""
+    malformed = b"<tt:MetadataStream"
+    queue = PayloadQueue[bytes](2, OverflowPolicy.LATEST_PER_KEY, event_key)
+    for payload in (malformed, PIR_INIT, PIR_CHANGE, malformed, PORT_0_INIT):
+        queue.append(payload)
+    assert drain(queue) == [malformed, PORT_0_INIT]
+    assert queue.stats == PayloadQueueStats(
+        enqueued=5, dropped=2, collapsed=1, unkeyed=2, max_depth=2
+    )
+
+
+def test_invalid_queue() -> None:
+    """Verify queue configuration is validated."""
+    with pytest.raises(ValueError, match="at least 1"):
+        PayloadQueue[bytes](0)
+    with pytest.raises(ValueError, match="requires a key function"):
+        PayloadQueue[bytes](1, OverflowPolicy.LATEST_PER_KEY)
+
+
+def test_unsupported_overflow_policy_defaults_to_drop_oldest() -> None:
+    """Verify unsupported overflow policy maps to drop oldest."""
+    assert OverflowPolicy("unsupported") == OverflowPolicy.DROP_OLDEST
@@ -0,0 +1,97 @@
+"""Test RTCP report parsing and generation.
+
+pytest --cov-report term-missing --cov=axis.rtcp tests/test_rtcp.py
+"""
+
+import struct
+
+import pytest
+
+from axis.rtcp import (
+    RECEIVER_REPORT,
+    ReceiverReporter,
+    SenderReport,
+    decode,
+)
+from axis.rtp import RtpPacket, RtpStream
+
+from .test_rtp import SSRC, rtp
+
+NTP_TIMESTAMP = 0xE3A1B2C3D4E5F607
+
+
+def sender_report(ssrc: int = SSRC, blocks: int = 0) -> bytes:
+    """Build RTCP sender report."""
+    return struct.pack(
+        "!BBHIQIII",
+        0x80 | blocks,
+        200,
+        6 + 6 * blocks,
+        ssrc,
+        NTP_TIMESTAMP,
+        1000,
+        10,
+        500,
+    ) + bytes(24 * blocks)
+
+
+SOURCE_DESCRIPTION = struct.pack("!BBHIBB4sH", 0x81, 202, 3, SSRC, 1, 4, b"axis", 0)
+
+
+def test_decode_sender_report() -> None:
+    """Verify sender reports of a compound packet are parsed."""
+    assert decode(sender_report(blocks=1) + SOURCE_DESCRIPTION) == [
+        SenderReport(SSRC, NTP_TIMESTAMP, 1000, 10, 500)
+    ]
+    assert decode(SOURCE_DESCRIPTION) == []
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (sender_report()[:2], "RTCP packet too short"),
+        (b"\x40" + sender_report()[1:], "Unsupported RTCP version 1"),
+        (sender_report()[:20], "RTCP packet exceeds datagram"),
+        (struct.pack("!BBHI", 0x80, 200, 1, SSRC), "RTCP sender report too short"),
+    ],
+)
+def test_decode_malformed(data: bytes, message: str) -> None:
+    """Verify malformed packets are rejected."""
+    with pytest.raises(ValueError, match=message):
+        decode(data)
+
+
+def test_receiver_report() -> None:
+    """Verify receiver report blocks describe loss, sequence and delay."""
+    stream = RtpStream(SSRC)
+    for sequence in (65534, 65535, 2, 3):
+        stream.receive(RtpPacket.decode(rtp(sequence)), 0)
+    stream.flush()
+    assert stream.cycles == 1
+    assert stream.expected == 6
+
+    reporter = ReceiverReporter(ssrc=1)
+    reporter.sender_report(decode(sender_report())[0], 10.0)
+    report = reporter.report([stream], 10.5)
+
+    first, packet_type, length, ssrc = struct.unpack_from("!BBHI", report)
+    assert (first, packet_type, length, ssrc) == (0x81, RECEIVER_REPORT, 7, 1)
+    assert len(report) == 4 * (length + 1)
+    assert struct.unpack_from("!IIIIII", report, 8) == (
+        SSRC,
+        (2 << 8) // 6 << 24 | 2,
+        65536 + 3,
+        0,
+        NTP_TIMESTAMP >> 16 & 0xFFFFFFFF,
+        32768,
+    )
+
+    # Fraction lost only covers packets since previous report
+    stream.receive(RtpPacket.decode(rtp(4)), 0)
+    report = reporter.report([stream], 11.0)
+    assert struct.unpack_from("!I", report, 12) == (2,)
+
+    # Stream without sender report and no streams at all
+    report = ReceiverReporter().report([RtpStream(2)], 0)
+    assert struct.unpack_from("!II", report, 24) == (0, 0)
+    assert len(reporter.report([], 0)) == 8
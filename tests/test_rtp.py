@@ -0,0 +1,208 @@
+"""Test RTP packet parsing and stream tracking.
+
+pytest --cov-report term-missing --cov=axis.rtp tests/test_rtp.py
+"""
+
+import logging
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from axis.rtp import (
+    CLOCK_RATE,
+    REORDER_BUFFER_SIZE,
+    RTP_HEADER_SIZE,
+    RtpPacket,
+    RtpStream,
+)
+
+from .packet_fixtures import (
+    RTP_PACKET1_FULL,
+    RTP_PACKET2_FRAGMENT1,
+    RTP_PACKET2_FRAGMENT2,
+)
+
+SSRC = 0x1F93C2BA
+
+
+def rtp(
+    sequence: int,
+    payload: bytes = b"",
+    *,
+    marker: bool = True,
+    timestamp: int = 0,
+    csrc: tuple[int, ...] = (),
+    extension: bytes | None = None,
+    padding: int = 0,
+) -> bytes:
+    """Build an RTP packet."""
+    first = 0x80 | len(csrc)
+    if extension is not None:
+        first |= 0x10
+    if padding:
+        first |= 0x20
+    data = struct.pack(
+        "!BBHII", first, 0x62 | marker << 7, sequence, timestamp, SSRC
+    ) + struct.pack(f"!{len(csrc)}I", *csrc)
+    if extension is not None:
+        data += struct.pack("!HH", 0xBEDE, len(extension) // 4) + extension
+    data += payload
+    if padding:
+        data += bytes(padding - 1) + bytes([padding])
+    return data
+
+
+def test_decode_packet() -> None:
+    """Verify RTP header fields are decoded."""
+    packet = RtpPacket.decode(RTP_PACKET2_FRAGMENT1)
+    assert not packet.marker
+    assert packet.payload_type == 98
+    assert packet.sequence == 0x0EDA
+    assert packet.timestamp == 0x8CFD03A6
+    assert packet.ssrc == SSRC
+    assert packet.csrc == ()
+    assert packet.extension is None
+    assert packet.payload == RTP_PACKET2_FRAGMENT1[RTP_HEADER_SIZE:]
+
+    assert RtpPacket.decode(RTP_PACKET2_FRAGMENT2).marker
+
+    # Version is not verified
+    packet = RtpPacket.decode(bytes.fromhex("008000000000000000000000AABBCCDD"))
+    assert packet.payload == bytes.fromhex("AABBCCDD")
+
+
+def test_decode_packet_csrc_extension_padding() -> None:
+    """Verify CSRC list, header extension and padding are stripped."""
+    packet = RtpPacket.decode(
+        rtp(7, b"<xml/>", csrc=(1, 2), extension=b"\x01\x02\x03\x04", padding=3)
+    )
+    assert packet.csrc == (1, 2)
+    assert packet.extension == b"\x01\x02\x03\x04"
+    assert packet.payload == b"<xml/>"
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        (RTP_PACKET1_FULL[:11], "RTP packet too short"),
+        (rtp(1, extension=b"")[:14], "RTP header extension exceeds packet"),
+        (rtp(1, extension=b"")[:14] + b"\x00\x05", "RTP header exceeds packet"),
+        (rtp(1, csrc=(1,))[:14], "RTP CSRC list exceeds packet"),
+        (rtp(1, b"ab", padding=1)[:-3] + b"\x09", "RTP header exceeds packet"),
+    ],
+)
+def test_decode_malformed_packet(data: bytes, message: str) -> None:
+    """Verify malformed packets are rejected."""
+    with pytest.raises(ValueError, match=message):
+        RtpPacket.decode(data)
+
+
+def test_reassemble_fragments() -> None:
+    """Verify payload fragmented over many packets is joined once complete."""
+    stream = RtpStream(SSRC)
+    for sequence in range(20):
+        assert (
+            stream.receive(RtpPacket.decode(rtp(sequence, b"ab", marker=False)), 0)
+            == []
+        )
+    assert stream.fragments_size == 40
+
+    assert stream.receive(RtpPacket.decode(rtp(20, b"c")), 0) == [b"ab" * 20 + b"c"]
+    assert stream.fragments == []
+    assert stream.fragments_size == 0
+    assert stream.stats.received == 21
+
+
+def test_payload_size_limit(caplog: pytest.LogCaptureFixture) -> None:
+    """Verify payloads exceeding size limit are discarded up to next marker."""
+    stream = RtpStream(SSRC)
+    packets = [rtp(seq, b"abc", marker=False) for seq in range(4)] + [rtp(4, b"d")]
+
+    with patch("axis.rtp.MAX_PAYLOAD_SIZE", 6):
+        for packet in packets:
+            assert stream.receive(RtpPacket.decode(packet), 0) == []
+        assert "Discarding RTP payload exceeding 6 bytes" in caplog.text
+        assert stream.fragments == []
+
+        assert stream.receive(RtpPacket.decode(rtp(5, b"ab", marker=False)), 0) == []
+        assert stream.receive(RtpPacket.decode(rtp(6, b"c")), 0) == [b"abc"]
+    assert stream.stats.discarded_messages == 1
+
+
+def test_reorder() -> None:
+    """Verify packets arriving out of order are passed along in order."""
+    stream = RtpStream(SSRC)
+    assert stream.receive(RtpPacket.decode(rtp(65534, b"a")), 0) == [b"a"]
+    assert stream.receive(RtpPacket.decode(rtp(0, b"c")), 0) == []
+    assert stream.receive(RtpPacket.decode(rtp(0, b"c")), 0) == []
+    assert stream.receive(RtpPacket.decode(rtp(65535, b"b", marker=False)), 0) == [
+        b"bc"
+    ]
+    assert stream.receive(RtpPacket.decode(rtp(65535, b"b")), 0) == []
+    assert stream.next_sequence == 1
+
+    assert stream.stats.received == 5
+    assert stream.stats.reordered == 1
+    assert stream.stats.duplicates == 1
+    assert stream.stats.late == 1
+    assert stream.stats.lost == 0
+
+
+def test_loss_discards_message() -> None:
+    """Verify a message with a missing fragment is never passed along."""
+    stream = RtpStream(SSRC)
+    assert stream.receive(RtpPacket.decode(rtp(10, b"a", marker=False)), 0) == []
+    for sequence in range(12, 13 + REORDER_BUFFER_SIZE):
+        assert (
+            stream.receive(RtpPacket.decode(rtp(sequence, b"b", marker=False)), 0) == []
+        )
+
+    # Message missing packet 11 is discarded up to its marker
+    last = 13 + REORDER_BUFFER_SIZE
+    assert stream.receive(RtpPacket.decode(rtp(last, b"c")), 0) == []
+    assert stream.receive(RtpPacket.decode(rtp(last + 1, b"d")), 0) == [b"d"]
+    assert stream.stats.lost == 1
+    assert stream.stats.discarded_messages == 1
+    assert stream.reorder_buffer == {}
+
+
+def test_flush() -> None:
+    """Verify flushing gives up on missing packets."""
+    stream = RtpStream(SSRC)
+    assert stream.flush() == []
+    assert stream.receive(RtpPacket.decode(rtp(1, b"a")), 0) == [b"a"]
+    assert stream.receive(RtpPacket.decode(rtp(4, b"b", marker=False)), 0) == []
+    assert stream.receive(RtpPacket.decode(rtp(5, b"c")), 0) == []
+    assert stream.receive(RtpPacket.decode(rtp(6, b"d")), 0) == []
+
+    assert stream.flush() == [b"d"]
+    assert stream.stats.lost == 2
+    assert stream.stats.discarded_messages == 1
+    assert stream.next_sequence == 7
+
+
+def test_resynchronize(caplog: pytest.LogCaptureFixture) -> None:
+    """Verify a large sequence jump restarts tracking."""
+    stream = RtpStream(SSRC)
+    assert stream.receive(RtpPacket.decode(rtp(1, b"a", marker=False)), 0) == []
+    with caplog.at_level(logging.DEBUG):
+        assert stream.receive(RtpPacket.decode(rtp(30000, b"b")), 0) == []
+    assert "resynchronized" in caplog.text
+    assert stream.receive(RtpPacket.decode(rtp(30001, b"c")), 0) == [b"c"]
+    assert stream.stats.discarded_messages == 1
+
+
+def test_jitter() -> None:
+    """Verify interarrival jitter is estimated per message."""
+    stream = RtpStream(SSRC)
+    stream.receive(RtpPacket.decode(rtp(1, timestamp=0)), 10.0)
+    stream.receive(RtpPacket.decode(rtp(2, timestamp=CLOCK_RATE)), 11.0)
+    assert stream.stats.jitter == 0
+
+    stream.receive(
+        RtpPacket.decode(rtp(3, timestamp=2 * CLOCK_RATE, marker=False)), 12.16
+    )
+    # Fragments of the same message don't count
+    stream.receive(RtpPacket.decode(rtp(4, timestamp=2 * CLOCK_RATE)), 13.0)
+    assert stream.stats.jitter == pytest.approx(0.01)
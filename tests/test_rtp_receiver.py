@@ -0,0 +1,150 @@
+"""Test RTP receiver shared by RTSP sessions.
+
+pytest --cov-report term-missing --cov=axis.rtp_receiver tests/test_rtp_receiver.py
+"""
+
+import asyncio
+import socket
+from unittest.mock import Mock, patch
+
+import pytest
+
+from axis.models.configuration import RtspTransport
+from axis.rtcp import RECEIVER_REPORT
+from axis.rtp_receiver import RTPReceiver, close_receivers, get_receiver
+from axis.rtsp import RTPClient
+
+from .conftest import HOST
+from .test_rtcp import sender_report
+from .test_rtp import SSRC, rtp
+
+
+def with_ssrc(packet: bytes, ssrc: int) -> bytes:
+    """Return RTP packet with another SSRC."""
+    return packet[:8] + ssrc.to_bytes(4) + packet[12:]
+
+
+@pytest.fixture
+async def receiver() -> RTPReceiver:
+    """Return started shared RTP receiver."""
+    receiver = get_receiver()
+    await receiver.start()
+    yield receiver
+    close_receivers()
+
+
+async def test_shared_receiver(receiver: RTPReceiver) -> None:
+    """Verify one receiver is shared and started once per event loop."""
+    assert get_receiver() is receiver
+    assert receiver.rtcp_port == receiver.port + 1
+    transport = receiver.rtp_endpoint.transport
+    await receiver.start()
+    assert receiver.rtp_endpoint.transport is transport
+
+
+async def test_route_by_host(receiver: RTPReceiver) -> None:
+    """Verify a single session of a host receives all its datagrams."""
+    rtp_client = RTPClient(asyncio.get_running_loop(), Mock(), bind=False)
+    receiver.register(HOST, rtp_client)
+    assert rtp_client.rtcp.transport is receiver.rtcp_endpoint.transport
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(rtp(1), (HOST, receiver.port))
+        sock.sendto(sender_report(), (HOST, receiver.rtcp_port))
+        sock.settimeout(1)
+        report = await asyncio.get_running_loop().run_in_executor(None, sock.recv, 1500)
+
+    assert report[1] == RECEIVER_REPORT
+    assert rtp_client.client.streams[SSRC].stats.received == 1
+    assert receiver.routes == {(HOST, SSRC): rtp_client}
+
+    receiver.unregister(rtp_client)
+    assert receiver.hosts == {}
+    assert receiver.routes == {}
+    assert rtp_client.rtcp.transport is None
+
+
+async def test_route_by_ssrc(receiver: RTPReceiver) -> None:
+    """Verify sessions to the same host are told apart by SSRC."""
+    loop = asyncio.get_running_loop()
+    first, second = (RTPClient(loop, Mock(), bind=False) for _ in range(2))
+    for rtp_client, ssrc in ((first, 1), (second, 2)):
+        receiver.register(HOST, rtp_client)
+        receiver.add_route(HOST, ssrc, rtp_client)
+
+    addr = (HOST, 50000)
+    receiver.rtp_received(with_ssrc(rtp(1), 2), addr)
+    receiver.rtp_received(with_ssrc(rtp(1), 1), addr)
+    receiver.rtp_received(with_ssrc(rtp(2), 1), addr)
+    receiver.rtcp_received(sender_report(ssrc=2), addr)
+    assert first.client.streams[1].stats.received == 2
+    assert second.client.streams[2].stats.received == 1
+    assert 2 in second.rtcp.reporter.sender_reports
+
+    # Unknown SSRC and unknown host can not be routed
+    receiver.rtp_received(with_ssrc(rtp(1), 3), addr)
+    receiver.rtp_received(rtp(1), ("192.168.0.2", 50000))
+    receiver.rtcp_received(sender_report(ssrc=3), addr)
+    assert receiver.unrouted == 3
+    assert 3 not in first.client.streams
+    assert 3 not in second.client.streams
+
+
+async def test_rtsp_client_uses_receiver(axis_device, receiver: RTPReceiver) -> None:
+    """Verify RTSP client sets up session on the shared receiver."""
+    axis_device.config.shared_rtp_receiver = True
+    rtsp_client = axis_device.stream._build_stream()
+    assert rtsp_client.receiver is receiver
+    assert rtsp_client.rtp.sock is None
+    assert rtsp_client.session.rtp_port == receiver.port
+    assert rtsp_client.session.rtcp_port == receiver.rtcp_port
+
+    transport = Mock()
+    transport.get_extra_info.return_value = (HOST, 554)
+    rtsp_client.connection_made(transport)
+    assert receiver.hosts == {HOST: [rtsp_client.rtp]}
+
+    rtsp_client.session.sequence = 2
+    rtsp_client.data_received(
+        b"RTSP/1.0 200 OK\r\n"
+        b"CSeq: 2\r\n"
+        b"Transport: RTP/AVP;unicast;client_port=50000-50001;ssrc=315460DA\r\n"
+        b"Session: ghLlkf_I9pCBP24t;timeout=60\r\n\r\n"
+    )
+    assert rtsp_client.session.ssrc == 0x315460DA
+    assert receiver.routes == {(HOST, 0x315460DA): rtsp_client.rtp}
+
+    rtsp_client.stop()
+    assert receiver.hosts == {}
+    assert receiver.rtcp_endpoint.transport.is_closing() is False
+
+
+async def test_rtsp_client_starts_receiver(axis_device) -> None:
+    """Verify RTSP client starts the receiver and leaves it on lost connection."""
+    axis_device.config.shared_rtp_receiver = True
+    rtsp_client = axis_device.stream._build_stream()
+    receiver = rtsp_client.receiver
+    assert not receiver.started
+
+    with patch.object(rtsp_client.loop, "create_connection") as create_connection:
+        await rtsp_client.start()
+    create_connection.assert_awaited_once()
+    assert receiver.started
+
+    transport = Mock()
+    transport.get_extra_info.return_value = (HOST, 554)
+    rtsp_client.connection_made(transport)
+    assert receiver.hosts == {HOST: [rtsp_client.rtp]}
+
+    rtsp_client.connection_lost(None)
+    assert receiver.hosts == {}
+    close_receivers()
+
+
+async def test_receiver_requires_udp_transport(axis_device) -> None:
+    """Verify interleaved sessions do not use the shared receiver."""
+    axis_device.config.shared_rtp_receiver = True
+    axis_device.config.rtsp_transport = RtspTransport.TCP
+    rtsp_client = axis_device.stream._build_stream()
+    assert rtsp_client.receiver is None
+    close_receivers()
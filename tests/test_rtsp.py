@@ -4,23 +4,44 @@ pytest --cov-report term-missing --cov=axis.rtsp tests/test_rtsp.py
 """
 
 import asyncio
+from hashlib import md5
 import logging
-from unittest.mock import Mock, patch
+import socket
+from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
 
-from axis.rtsp import RTP_HEADER_SIZE, RTSPClient, Signal, State
+from axis.models.configuration import OverflowPolicy, RtspTransport
+from axis.rtcp import RECEIVER_REPORT
+from axis.rtp import RTP_HEADER_SIZE
+from axis.rtsp import (
+    RTPClient,
+    RTSPClient,
+    RTSPSession,
+    Signal,
+    State,
+    bind_multicast,
+    bind_port_pair,
+    response_length,
+)
 
 from .conftest import HOST, RTSP_PORT
+from .event_fixtures import PIR_INIT
 from .packet_fixtures import (
     RTP_PACKET1_FULL,
     RTP_PACKET2_FRAGMENT1,
     RTP_PACKET2_FRAGMENT2,
 )
+from .test_rtcp import sender_report
 
 LOGGER = logging.getLogger(__name__)
 
 
+def rtp_packet(packet: bytes, sequence: int) -> bytes:
+    """Return packet with another sequence number."""
+    return packet[:2] + sequence.to_bytes(2) + packet[4:]
+
+
 @pytest.fixture
 async def rtsp_client(axis_device) -> RTSPClient:
     """Return the RTSP client."""
@@ -59,7 +80,7 @@ async def test_successful_connect(rtsp_server, rtsp_client):
                 "Content-Base: rtsp://127.0.0.1/axis-media/media.amp/\r\n"
                 "Server: GStreamer RTSP server\r\n"
                 "Date: Sat, 12 Dec 2020 10:44:25 GMT\r\n"
-                "Content-Length: 440\r\n\r\n"
+                "Content-Length: 435\r\n\r\n"
                 "v=0\r\n"
                 "o=- 18302136002250915122 1 IN IP4 host\r\n"
                 "s=Session streamed with GStreamer\r\n"
@@ -248,7 +269,7 @@ async def test_successful_connect(rtsp_server, rtsp_client):
     assert rtsp_client.session.stale is False
     assert rtsp_client.session.content_type == "application/sdp"
     assert rtsp_client.session.content_base == "rtsp://127.0.0.1/axis-media/media.amp/"
-    assert rtsp_client.session.content_length == 440
+    assert rtsp_client.session.content_length == 435
     assert rtsp_client.session.session_id is None
     assert rtsp_client.session.session_timeout == 0
     assert rtsp_client.session.transport_ack is None
@@ -309,7 +330,7 @@ async def test_successful_connect(rtsp_server, rtsp_client):
     assert rtsp_client.session.stale is False
     assert rtsp_client.session.content_type == "application/sdp"
     assert rtsp_client.session.content_base == "rtsp://127.0.0.1/axis-media/media.amp/"
-    assert rtsp_client.session.content_length == 440
+    assert rtsp_client.session.content_length == 435
     assert rtsp_client.session.session_id == "ghLlkf_I9pCBP24t"
     assert rtsp_client.session.session_timeout == 60
     assert (
@@ -374,7 +395,7 @@ async def test_successful_connect(rtsp_server, rtsp_client):
     assert rtsp_client.session.stale is False
     assert rtsp_client.session.content_type == "application/sdp"
     assert rtsp_client.session.content_base == "rtsp://127.0.0.1/axis-media/media.amp/"
-    assert rtsp_client.session.content_length == 440
+    assert rtsp_client.session.content_length == 435
     assert rtsp_client.session.session_id == "ghLlkf_I9pCBP24t"
     assert rtsp_client.session.session_timeout == 60
     assert (
@@ -538,6 +559,29 @@ def test_rtsp_client_data_property(rtsp_client):
     assert rtsp_client.data == b""
 
 
+async def test_rtp_payload_queue_overflow(axis_device):
+    """Verify payloads not consumed are bounded by configured queue size."""
+    axis_device.config.event_buffer_size = 2
+    axis_device.config.event_overflow_policy = OverflowPolicy.DROP_NEWEST
+    axis_device.enable_events()
+    rtsp_client = axis_device.stream._build_stream()
+    axis_device.stream.stream = rtsp_client
+    rtp_client = rtsp_client.rtp
+
+    with patch.object(rtp_client.client, "callback"):
+        for sequence in range(3):
+            rtp_client.client.datagram_received(
+                rtp_packet(RTP_PACKET1_FULL, sequence), "addr"
+            )
+    assert len(rtp_client.client.data) == 2
+    assert axis_device.stream.queue_stats is rtsp_client.queue_stats
+    assert rtsp_client.queue_stats.enqueued == 3
+    assert rtsp_client.queue_stats.dropped == 1
+    assert len(rtsp_client.drain()) == 2
+    assert rtsp_client.drain() == []
+    rtp_client.sock.close()
+
+
 @pytest.mark.parametrize(
     ("packets"),
     [([RTP_PACKET1_FULL]), ([RTP_PACKET2_FRAGMENT1, RTP_PACKET2_FRAGMENT2])],
@@ -555,6 +599,396 @@ def test_rtp_fragment(rtsp_client, packets: list[bytes]):
         assert rtp_client.data == payload
 
 
+async def test_rtp_reorder_timeout(rtsp_client, caplog):
+    """Verify packets held back for a missing packet are flushed in time."""
+    rtp_client = rtsp_client.rtp
+    ssrc = int.from_bytes(RTP_PACKET1_FULL[8:12])
+
+    with (
+        patch("axis.rtsp.REORDER_TIMEOUT", 0),
+        patch.object(rtp_client.client, "callback") as mock_callback,
+        caplog.at_level(logging.DEBUG),
+    ):
+        rtp_client.client.datagram_received(RTP_PACKET1_FULL[:8], "addr")
+        assert rtp_client.client.malformed == 1
+        assert "Ignoring RTP packet: RTP packet too short (8 bytes)" in caplog.text
+
+        for packet in (
+            rtp_packet(RTP_PACKET1_FULL, 1),
+            rtp_packet(RTP_PACKET1_FULL, 3),
+            rtp_packet(RTP_PACKET1_FULL, 4),
+        ):
+            rtp_client.client.datagram_received(packet, "addr")
+        assert mock_callback.call_count == 1
+
+        # Packet following a gap can't be trusted to start a new message
+        await asyncio.sleep(0.01)
+        assert mock_callback.call_count == 2
+
+    assert rtp_client.stats == {ssrc: rtp_client.client.streams[ssrc].stats}
+    assert rtp_client.stats[ssrc].received == 3
+    assert rtp_client.stats[ssrc].lost == 1
+    assert rtp_client.stats[ssrc].discarded_messages == 1
+    assert rtp_client.client._flush_handles == {}
+
+
+async def test_rtp_reorder_timeout_two_gaps(rtsp_client):
+    """Verify packets held back behind a second gap are flushed as well."""
+    rtp_client = rtsp_client.rtp
+    ssrc = int.from_bytes(RTP_PACKET1_FULL[8:12])
+
+    with (
+        patch("axis.rtsp.REORDER_TIMEOUT", 0),
+        patch.object(rtp_client.client, "callback"),
+    ):
+        for sequence in (1, 2, 4, 5, 7, 8):
+            rtp_client.client.datagram_received(
+                rtp_packet(RTP_PACKET1_FULL, sequence), "addr"
+            )
+        assert rtp_client.client.streams[ssrc].reorder_buffer.keys() == {4, 5, 7, 8}
+
+        await asyncio.sleep(0.01)
+
+    assert rtp_client.client.streams[ssrc].reorder_buffer == {}
+    assert rtp_client.stats[ssrc].lost == 2
+    assert rtp_client.client._flush_handles == {}
+
+
+async def test_rtp_connection_lost_cancels_flush(rtsp_client):
+    """Verify pending reorder flush is cancelled when the connection is lost."""
+    client = rtsp_client.rtp.client
+    with patch.object(client, "callback"):
+        for sequence in (1, 3):
+            client.datagram_received(rtp_packet(RTP_PACKET1_FULL, sequence), "addr")
+    handle = next(iter(client._flush_handles.values()))
+
+    client.connection_lost(None)
+    assert handle.cancelled()
+    assert client._flush_handles == {}
+
+
+async def test_rtp_datagram_without_callback(rtsp_client):
+    """Verify datagrams are ignored while there is no callback."""
+    client = rtsp_client.rtp.client
+    client.callback = None
+    client.datagram_received(rtp_packet(RTP_PACKET1_FULL, 1), "addr")
+    assert client.streams == {}
+    assert len(client.data) == 0
+
+
+async def test_rtcp_receiver_report(rtsp_client, caplog):
+    """Verify sender reports are answered with a receiver report."""
+    rtp_client = rtsp_client.rtp
+    assert rtp_client.rtcp_sock.getsockname()[1] == rtp_client.rtcp_port
+    rtcp_transport = Mock()
+    rtp_client.rtcp.connection_made(rtcp_transport)
+
+    with patch.object(rtp_client.client, "callback"):
+        rtp_client.client.datagram_received(RTP_PACKET1_FULL, "addr")
+    rtp_client.rtcp.datagram_received(sender_report(), ("127.0.0.1", 50001))
+    ssrc = int.from_bytes(RTP_PACKET1_FULL[8:12])
+    assert ssrc in rtp_client.rtcp.reporter.sender_reports
+
+    report, addr = rtcp_transport.sendto.call_args.args
+    assert addr == ("127.0.0.1", 50001)
+    assert report[1] == RECEIVER_REPORT
+    assert int.from_bytes(report[8:12]) == ssrc
+
+    with caplog.at_level(logging.DEBUG):
+        rtp_client.rtcp.datagram_received(b"\x00", ("127.0.0.1", 50001))
+    assert rtp_client.rtcp.malformed == 1
+    assert "Ignoring RTCP packet: RTCP packet too short" in caplog.text
+    assert rtcp_transport.sendto.call_count == 1
+
+    rtp_client.stop()
+    rtcp_transport.close.assert_called()
+
+
+async def test_bind_port_pair_without_rtcp():
+    """Verify RTP is still received when no RTCP port is available."""
+    with patch("axis.rtsp.PORT_PAIR_ATTEMPTS", 0):
+        sock, rtcp_sock = bind_port_pair()
+    assert rtcp_sock is None
+    sock.close()
+
+
+@pytest.mark.parametrize("error", [OSError, OverflowError])
+async def test_bind_port_pair_collision(error: type[Exception]) -> None:
+    """Verify another pair of ports is tried when the RTCP port is taken."""
+    taken = Mock()
+    taken.bind.side_effect = error
+    sockets = [
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM),
+        taken,
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM),
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM),
+    ]
+    with patch("axis.rtsp.socket.socket", side_effect=sockets):
+        sock, rtcp_sock = bind_port_pair()
+    assert sockets[0].fileno() == -1
+    taken.close.assert_called_once()
+    assert (sock, rtcp_sock) == (sockets[2], sockets[3])
+    sock.close()
+    rtcp_sock.close()
+
+
+async def test_stream_liveness(axis_device, caplog):
+    """Verify stream fails when no RTP or RTCP data arrives in time."""
+    axis_device.config.stream_timeout = 0.1
+    rtsp_client = axis_device.stream._build_stream()
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.session.sequence = 4
+    rtsp_client.callback = Mock()
+
+    rtsp_client.data_received(b"RTSP/1.0 200 OK\r\nCSeq: 4\r\n\r\n")
+    rtsp_client.callback.assert_called_with(Signal.PLAYING)
+    liveness_handle = rtsp_client.liveness_handle
+    assert liveness_handle
+
+    # Another keep-alive response doesn't schedule a second check
+    rtsp_client.data_received(b"RTSP/1.0 200 OK\r\nCSeq: 4\r\n\r\n")
+    assert rtsp_client.liveness_handle is liveness_handle
+
+    await asyncio.sleep(0.06)
+    rtsp_client.rtp.rtcp.datagram_received(sender_report(), None)
+    await asyncio.sleep(0.06)
+    assert rtsp_client.callback.call_args.args == (Signal.PLAYING,)
+
+    await asyncio.sleep(0.1)
+    rtsp_client.callback.assert_called_with(Signal.FAILED)
+    assert rtsp_client.liveness_handle is None
+    assert f"No stream data from {HOST}" in caplog.text
+    assert rtsp_client.session.state == State.STOPPED
+    rtsp_client.rtp.sock.close()
+    rtsp_client.rtp.rtcp_sock.close()
+
+
+async def test_stream_liveness_stop(axis_device):
+    """Verify pending liveness check is cancelled when stream is stopped."""
+    axis_device.config.stream_timeout = 10
+    rtsp_client = axis_device.stream._build_stream()
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.session.sequence = 4
+    rtsp_client.callback = Mock()
+
+    rtsp_client.data_received(b"RTSP/1.0 200 OK\r\nCSeq: 4\r\n\r\n")
+    liveness_handle = rtsp_client.liveness_handle
+    assert liveness_handle
+
+    rtsp_client.stop()
+    assert liveness_handle.cancelled()
+    rtsp_client.rtp.sock.close()
+    rtsp_client.rtp.rtcp_sock.close()
+
+
+def interleaved(packet: bytes, channel: int = 0) -> bytes:
+    """Frame packet for interleaved transport on RTSP connection."""
+    return b"$" + channel.to_bytes(1) + len(packet).to_bytes(2) + packet
+
+
+async def test_interleaved_transport(rtsp_server, axis_device):
+    """Verify RTP is received interleaved on the RTSP connection."""
+    axis_device.config.rtsp_transport = RtspTransport.TCP
+    axis_device.enable_events()
+    received = asyncio.Event()
+    events = []
+
+    def subscriber(event):
+        events.append(event)
+        received.set()
+
+    axis_device.event.subscribe(subscriber)
+    with patch("axis.rtsp.RTSP_PORT", RTSP_PORT):
+        axis_device.stream.start()
+    await rtsp_server.next_request_received.wait()
+    rtsp_client = axis_device.stream.stream
+    assert rtsp_client.rtp.sock is None
+    assert rtsp_client.session.rtp_port is None
+
+    sdp = (
+        "v=0\r\n"
+        "m=application 0 RTP/AVP 98\r\n"
+        "a=control:rtsp://127.0.0.1/axis-media/media.amp/stream=0?event=on\r\n"
+    )
+    for response in (
+        "RTSP/1.0 200 OK\r\nCSeq: 0\r\n\r\n",
+        (
+            "RTSP/1.0 200 OK\r\n"
+            "CSeq: 1\r\n"
+            "Content-Type: application/sdp\r\n"
+            f"Content-Length: {len(sdp)}\r\n\r\n{sdp}"
+        ),
+    ):
+        rtsp_server.send_response(response)
+        await rtsp_server.next_request_received.wait()
+
+    assert rtsp_server.last_request == (
+        "SETUP rtsp://127.0.0.1/axis-media/media.amp/stream=0?event=on RTSP/1.0\r\n"
+        "CSeq: 2\r\n"
+        "User-Agent: HASS Axis\r\n"
+        "Transport: RTP/AVP/TCP;unicast;interleaved=0-1\r\n\r\n"
+    )
+    rtsp_server.send_response(
+        "RTSP/1.0 200 OK\r\n"
+        "CSeq: 2\r\n"
+        "Transport: RTP/AVP/TCP;unicast;interleaved=2-3;ssrc=315460DA\r\n"
+        "Session: ghLlkf_I9pCBP24t;timeout=60\r\n\r\n"
+    )
+    await rtsp_server.next_request_received.wait()
+    assert rtsp_client.session.rtp_channel == 2
+
+    rtsp_server.send_response(
+        "RTSP/1.0 200 OK\r\nCSeq: 3\r\nSession: ghLlkf_I9pCBP24t;timeout=60\r\n\r\n"
+    )
+    rtsp_server.transport.write(
+        interleaved(RTP_PACKET1_FULL[:RTP_HEADER_SIZE] + PIR_INIT, 2)
+    )
+    await asyncio.wait_for(received.wait(), 1)
+    assert rtsp_client.session.state == State.PLAYING
+    assert [event.topic for event in events] == ["tns1:Device/tnsaxis:Sensor/PIR"]
+
+    axis_device.stream.stop()
+    await asyncio.sleep(0)
+
+
+async def test_interleaved_demultiplexing(axis_device):
+    """Verify interleaved packets and responses are split across reads."""
+    axis_device.config.rtsp_transport = RtspTransport.TCP
+    rtsp_client = axis_device.stream._build_stream()
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.session.sequence = 4
+    rtsp_client.rtp.client.callback = Mock()
+
+    data = (
+        interleaved(rtp_packet(RTP_PACKET2_FRAGMENT1, 1))
+        + b"RTSP/1.0 200 OK\r\nCSeq: 4\r\n\r\n"
+        + interleaved(b"rtcp", 1)
+        + interleaved(rtp_packet(RTP_PACKET2_FRAGMENT2, 2))
+    )
+    for start in range(0, len(data), 1000):
+        rtsp_client.data_received(data[start : start + 1000])
+
+    assert rtsp_client.session.sequence_ack == 4
+    assert rtsp_client._buffer == bytearray()
+    assert rtsp_client.data == (
+        RTP_PACKET2_FRAGMENT1[RTP_HEADER_SIZE:]
+        + RTP_PACKET2_FRAGMENT2[RTP_HEADER_SIZE:]
+    )
+
+    rtsp_client.data_received(interleaved(RTP_PACKET1_FULL)[:3])
+    rtsp_client.data_received(interleaved(RTP_PACKET1_FULL)[3:10])
+    assert len(rtsp_client._buffer) == 10
+
+    assert rtsp_client.rtp.rtcp.malformed == 1
+
+    rtsp_client.connection_lost(None)
+    assert rtsp_client.rtp.client._flush_handles == {}
+
+
+MULTICAST_GROUP = "239.255.12.34"
+
+
+async def test_multicast_transport(axis_device):
+    """Verify multicast group from SETUP response is joined on loopback."""
+    axis_device.config.rtsp_transport = RtspTransport.MULTICAST
+    axis_device.config.multicast_interface = HOST
+    rtsp_client = axis_device.stream._build_stream()
+    assert rtsp_client.rtp.sock is None
+    assert rtsp_client.method.transport == "Transport: RTP/AVP;multicast\r\n"
+
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.session.sequence = 2
+    rtsp_client.callback = rtsp_client.rtp.client.callback = Mock()
+
+    rtsp_client.data_received(
+        b"RTSP/1.0 200 OK\r\n"
+        b"CSeq: 2\r\n"
+        b"Transport: RTP/AVP;multicast;destination=239.255.12.34;"
+        b"port=51234-51235;ttl=5;ssrc=315460DA\r\n"
+        b"Session: ghLlkf_I9pCBP24t;timeout=60\r\n\r\n"
+    )
+    assert rtsp_client.session.destination == MULTICAST_GROUP
+    assert rtsp_client.session.multicast_port == 51234
+    await rtsp_client.join_task
+    assert rtsp_client.rtp.port == 51234
+
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(HOST))
+    sender.sendto(
+        RTP_PACKET1_FULL[:RTP_HEADER_SIZE] + PIR_INIT, (MULTICAST_GROUP, 51234)
+    )
+    sender.close()
+    for _ in range(100):
+        if rtsp_client.callback.called:
+            break
+        await asyncio.sleep(0.01)
+
+    rtsp_client.callback.assert_called_with(Signal.DATA)
+    assert rtsp_client.data == PIR_INIT
+
+    rtsp_client.stop()
+    assert rtsp_client.rtp.client.transport.is_closing()
+    assert rtsp_client.rtp.rtcp.transport.is_closing()
+
+
+async def test_multicast_join_failure(axis_device, caplog):
+    """Verify stream fails when multicast group can not be joined."""
+    axis_device.config.rtsp_transport = RtspTransport.MULTICAST
+    rtsp_client = axis_device.stream._build_stream()
+    rtsp_client.transport = Mock()
+    rtsp_client.callback = Mock()
+    rtsp_client.session.destination = MULTICAST_GROUP
+    rtsp_client.session.multicast_port = 51234
+
+    with patch("axis.rtsp.bind_multicast", side_effect=OSError("No device")):
+        await rtsp_client.join_multicast()
+
+    rtsp_client.callback.assert_called_with(Signal.FAILED)
+    assert f"Failed to join multicast group {MULTICAST_GROUP}" in caplog.text
+
+
+def test_bind_multicast_failure():
+    """Verify socket is closed when multicast group can not be joined."""
+    sock = Mock()
+    sock.setsockopt.side_effect = [None, None, OSError("No device")]
+    with (
+        patch("axis.rtsp.socket.socket", return_value=sock),
+        pytest.raises(OSError, match="No device"),
+    ):
+        bind_multicast(MULTICAST_GROUP, 51234, HOST)
+    sock.close.assert_called_once()
+
+
+async def test_multicast_join_without_rtcp(caplog):
+    """Verify RTP is still received when multicast RTCP port can not be bound."""
+    rtp_client = RTPClient(asyncio.get_running_loop(), Mock(), bind=False)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("", 0))
+
+    with (
+        caplog.at_level(logging.DEBUG),
+        patch("axis.rtsp.bind_multicast", side_effect=[sock, OSError("In use")]),
+    ):
+        await rtp_client.join(MULTICAST_GROUP, 51234)
+
+    assert rtp_client.port == 51234
+    assert rtp_client.rtcp_sock is None
+    assert rtp_client.rtcp_port is None
+    assert rtp_client.client.transport is not None
+    assert "Not receiving multicast RTCP: In use" in caplog.text
+    rtp_client.stop()
+
+
+def test_unicast_ignores_multicast_destination(rtsp_client):
+    """Verify destination is only used for multicast sessions."""
+    rtsp_client.session.update_transport("RTP/AVP;unicast;destination=10.0.0.1")
+    assert rtsp_client.session.destination is None
+
+
 def test_methods(rtsp_client):
     """Verify method attributes."""
     method = rtsp_client.method
@@ -653,11 +1087,69 @@ def test_session_update_status_codes(rtsp_client):
 
     assert session.rtsp_version == 1
     assert session.status_code == 454
-    assert session.status_text == "Session"  # "Session Not Found"
+    assert session.status_text == "Session Not Found"
     assert session.state == State.STARTING
     assert session.sequence == 1
 
 
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"", None),
+        (b"RTS", None),
+        (b"RTSP/1.0 200 OK\r\nCSeq: 1\r\n", None),
+        (b"RTSP/1.0 200 OK\r\nCSeq: 1\r\n\r\n", 28),
+        (b"RTSP/1.0 200 OK\r\ncontent-length: 4\r\n\r\nv=0", None),
+        (b"RTSP/1.0 200 OK\r\ncontent-length: 4\r\n\r\nv=0\nRTSP", 42),
+        (b"Unsupported response", 20),
+        (b"Unsupported\r\nRTSP/1.0 200 OK\r\n\r\n", 13),
+        (b"Unsupported$\x00\x00\x00", 11),
+    ],
+)
+def test_response_length(data: bytes, expected: int | None) -> None:
+    """Verify responses are framed by header terminator and content length."""
+    assert response_length(data) == expected
+
+
+async def test_rtsp_client_buffers_responses(axis_device):
+    """Verify partial and multiple responses per read are handled."""
+    rtsp_client = axis_device.stream._build_stream()
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.session.sequence = 1
+
+    sdp = (
+        "v=0\r\n"
+        "s=Session streamed with GStreamer\r\n"
+        "m=application 0 RTP/AVP 98\r\n"
+        "a=control:rtsp://127.0.0.1/stream=0\r\n"
+    )
+    describe = (
+        "RTSP/1.0 200 OK\r\n"
+        "cseq: 1\r\n"
+        "CONTENT-TYPE: application/sdp\r\n"
+        f"Content-length: {len(sdp)}\r\n\r\n{sdp}"
+    ).encode()
+    setup = (
+        b"RTSP/1.0 200 OK\r\nCSeq: 2\r\nsession: ghLlkf_I9pCBP24t; Timeout=60\r\n\r\n"
+    )
+
+    rtsp_client.data_received(describe[:40])
+    rtsp_client.data_received(describe[40:-10])
+    assert rtsp_client.session.sequence == 1
+    rtsp_client.data_received(describe[-10:] + setup)
+
+    assert rtsp_client.session.sequence == 3
+    assert rtsp_client.session.sequence_ack == 2
+    assert rtsp_client.session.content_type == "application/sdp"
+    assert rtsp_client.session.content_length == len(sdp)
+    assert rtsp_client.session.control_url == "rtsp://127.0.0.1/stream=0"
+    assert rtsp_client.session.session_id == "ghLlkf_I9pCBP24t"
+    assert rtsp_client.session.session_timeout == 60
+    assert rtsp_client.transport.write.call_count == 2
+    rtsp_client.rtp.sock.close()
+
+
 def test_session_generate_digest_auth(rtsp_client):
     """Verify generate digest auth method."""
     session = rtsp_client.session
@@ -683,6 +1175,107 @@ def test_session_generate_digest_auth(rtsp_client):
     )
 
 
+def test_session_generate_digest_auth_qop(rtsp_client):
+    """Verify digest auth with qop against RFC 2617 example."""
+    session = rtsp_client.session
+    session.username = "Mufasa"
+    session.password = "Circle Of Life"
+    session.url = "/dir/index.html"
+    session.cnonce = "0a4f113b"
+    session.update(
+        'WWW-Authenticate: Digest realm="testrealm@host.com", qop="auth,auth-int", '
+        'nonce="dcd98b7102dd2f0e8b11d0f600bfb0c093", '
+        'opaque="5ccc069c403ebaf9f0171e9517f40e41"\r\n'
+    )
+    assert session.qop == "auth"
+
+    with (
+        patch.object(RTSPSession, "method", new_callable=PropertyMock) as method,
+        patch("axis.rtsp.md5", wraps=md5) as mock_md5,
+    ):
+        method.return_value = "GET"
+        assert session.generate_digest() == (
+            'Digest username="Mufasa", '
+            'realm="testrealm@host.com", '
+            'algorithm="MD5", '
+            'nonce="dcd98b7102dd2f0e8b11d0f600bfb0c093", '
+            'uri="/dir/index.html", '
+            'opaque="5ccc069c403ebaf9f0171e9517f40e41", '
+            'qop=auth, nc=00000001, cnonce="0a4f113b", '
+            'response="6629fae49393a05397450978507c4ef1"'
+        )
+        assert mock_md5.call_count == 3
+
+        # HA1 is cached and nonce count increments per request
+        assert 'nc=00000002, cnonce="0a4f113b"' in session.generate_digest()
+        assert mock_md5.call_count == 5
+
+    # New nonce restarts nonce count
+    session.update(
+        'WWW-Authenticate: Digest realm="testrealm@host.com", qop="auth", '
+        'nonce="abc", stale=TRUE\r\n'
+    )
+    assert session.stale is True
+    assert 'nonce="abc"' in session.generate_digest()
+    assert session.nonce_count == 1
+
+
+def test_request_templates(rtsp_client):
+    """Verify requests are built from cached templates."""
+    method = rtsp_client.method
+    assert method.options() == (
+        "OPTIONS "
+        "rtsp://127.0.0.1/axis-media/media.amp?video=0&audio=0&event=on RTSP/1.0\r\n"
+        "CSeq: 0\r\n"
+        "User-Agent: HASS Axis\r\n\r\n"
+    )
+    rtsp_client.session.sequence = 3
+    rtsp_client.session.session_id = "ghLlkf_I9pCBP24t"
+    assert method.options(False) == (
+        "OPTIONS "
+        "rtsp://127.0.0.1/axis-media/media.amp?video=0&audio=0&event=on RTSP/1.0\r\n"
+        "CSeq: 3\r\n"
+        "User-Agent: HASS Axis\r\n"
+        "Session: ghLlkf_I9pCBP24t\r\n\r\n"
+    )
+    assert len(method._templates) == 1
+
+
+async def test_session_resume():
+    """Verify stream resumes from SETUP and falls back to full handshake."""
+    session = RTSPSession("rtsp://127.0.0.1/axis-media/media.amp", HOST, "root", "pass")
+    assert session.resume_state is None
+    session.update(
+        "RTSP/1.0 401 Unauthorized\r\n"
+        "CSeq: 1\r\n"
+        'WWW-Authenticate: Digest realm="AXIS_00408CA51334", nonce="0024e47aY398109708de9ccd8056c58a068a59540a99d3"\r\n\r\n'
+    )
+    session.control_url = "rtsp://127.0.0.1/axis-media/media.amp/stream=0?event=on"
+    resume = session.resume_state
+
+    rtsp_client = RTSPClient(session.url, HOST, "root", "pass", Mock(), resume=resume)
+    assert rtsp_client.session.resume_state == resume
+    assert rtsp_client.session.method == "SETUP"
+    message = rtsp_client.method.message
+    assert message.startswith(f"SETUP {session.control_url} RTSP/1.0\r\nCSeq: 2\r\n")
+    assert 'nonce="0024e47aY398109708de9ccd8056c58a068a59540a99d3"' in message
+
+    rtsp_client.transport = Mock()
+    rtsp_client.time_out_handle = Mock()
+    rtsp_client.data_received(b"RTSP/1.0 454 Session Not Found\r\nCSeq: 2\r\n\r\n")
+    assert rtsp_client.session.resumed is False
+    assert rtsp_client.session.method == "OPTIONS"
+    assert rtsp_client.transport.write.call_args.args[0].startswith(b"OPTIONS ")
+
+    # Errors of a full handshake are not retried from OPTIONS
+    rtsp_client.session.sequence = 2
+    rtsp_client.session.update("RTSP/1.0 454 Session Not Found\r\nCSeq: 2\r\n\r\n")
+    assert rtsp_client.session.method == "SETUP"
+    rtsp_client.stop()
+    rtsp_client.rtp.sock.close()
+    rtsp_client.rtp.rtcp_sock.close()
+
+
 def test_session_generate_basic_auth(rtsp_client):
     """Verify generate basic auth method."""
     session = rtsp_client.session
@@ -3,12 +3,14 @@
 pytest --cov-report term-missing --cov=axis.stream_manager tests/test_stream_manager.py
 """
 
+import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from axis.models.api_discovery import ApiId
+from axis.models.event import EventTopic
 from axis.rtsp import Signal, State
 from axis.stream_manager import RETRY_TIMER, StreamManager
 from axis.websocket import WebSocketClient, WebSocketFailureReason
@@ -47,6 +49,25 @@ async def test_stream_url(stream_manager):
     )
 
 
+async def test_stream_url_event_topic(stream_manager):
+    """Verify RTSP stream url filters event topics of subscriptions."""
+    stream_manager.event = True
+    stream_manager.device.config.rtsp_event_filter = True
+    assert stream_manager.event_topic_query == ""
+
+    stream_manager.device.event.subscribe(
+        MagicMock(), topic_filter=(EventTopic.PIR, EventTopic.OBJECT_ANALYTICS)
+    )
+    assert stream_manager.stream_url == (
+        f"rtsp://{HOST}/axis-media/media.amp?video=0&audio=0&event=on"
+        "&eventtopic=onvif:Device/axis:Sensor/PIR//."
+        "%7Caxis:CameraApplicationPlatform/ObjectAnalytics//."
+    )
+
+    stream_manager.device.config.rtsp_event_filter = False
+    assert stream_manager.event_topic_query == ""
+
+
 async def test_stream_url_companion(stream_manager_companion):
     """Verify stream url."""
     assert stream_manager_companion.video_query == 0
@@ -205,6 +226,7 @@ async def test_data_property_without_stream_returns_empty_bytes(stream_manager):
     """Verify data property returns empty bytes when stream is missing."""
     stream_manager.stream = None
     assert stream_manager.data == b""
+    assert stream_manager.queue_stats is None
 
 
 @patch("axis.stream_manager.RTSPClient")
@@ -248,6 +270,20 @@ async def test_start_noop_when_stream_already_active(
     rtsp_client.assert_not_called()
 
 
+async def test_stop_cancels_debounce(stream_manager):
+    """Verify events held back by debounce are not passed along after stop."""
+    subscriber = MagicMock()
+    stream_manager.device.event.subscribe(subscriber)
+    stream_manager.device.event.debounce[EventTopic.SOUND_TRIGGER_LEVEL] = 0.01
+    stream_manager.device.event.handler(AUDIO_INIT)
+    stream_manager.device.event.handler(AUDIO_INIT)
+
+    stream_manager.stop()
+    await asyncio.sleep(0.02)
+    assert subscriber.call_count == 1
+    assert stream_manager.device.event._debounce_timers == {}
+
+
 async def test_retry_without_active_stream_does_not_call_stop(stream_manager):
     """Verify retry() skips stop() when no stream is active."""
     existing_stream = SimpleNamespace(
@@ -337,3 +373,97 @@ async def test_failed_signal_without_ssl_reason_does_not_disable_websocket(
 
     assert stream_manager._websocket_temporarily_disabled is False
     assert stream_manager.use_websocket is True
+
+
+async def test_playing_rtsp_stream_is_resumed(stream_manager):
+    """Verify a reconnecting RTSP stream resumes the negotiated session."""
+    stream = stream_manager._build_stream()
+    stream.session.control_url = "rtsp://127.0.0.1/axis-media/media.amp/stream=0"
+    stream_manager.stream = stream
+    stream_manager.session_callback(Signal.PLAYING)
+    assert stream_manager.resume == stream.session.resume_state
+
+    resumed = stream_manager._build_stream()
+    assert resumed.session.resumed is True
+    assert resumed.session.control_url == stream.session.control_url
+
+    # Session of another stream url is not resumed
+    stream_manager.event = True
+    restarted = stream_manager._build_stream()
+    assert restarted.session.resumed is False
+    for rtsp_client in (stream, resumed, restarted):
+        rtsp_client.rtp.sock.close()
+        rtsp_client.rtp.rtcp_sock.close()
+
+
+async def test_data_batch_is_handled_in_order(stream_manager):
+    """Verify a batch of stream data is passed to the event layer at once."""
+    stream_manager.device.enable_events()
+    stream_manager.device.event.handle_batch = MagicMock()
+    stream_manager.stream = MagicMock()
+    stream_manager.stream.drain.return_value = [AUDIO_INIT, AUDIO_INIT]
+
+    stream_manager.session_callback(Signal.DATA_BATCH)
+    stream_manager.device.event.handle_batch.assert_called_once_with(
+        [AUDIO_INIT, AUDIO_INIT]
+    )
+
+
+async def test_websocket_event_filter_follows_subscriptions(stream_manager):
+    """Verify websocket filters are derived from and follow subscriptions."""
+    stream_manager.event = True
+    stream_manager.device.config.websocket_force = True
+    event_manager = stream_manager.device.event
+    event_manager.subscribe(MagicMock(), topic_filter=EventTopic.PIR)
+
+    stream = stream_manager._build_stream()
+    assert stream.event_filter_list == [
+        {"topicFilter": "tns1:Device/tnsaxis:Sensor/PIR//."}
+    ]
+    stream._ws = MagicMock(send_json=AsyncMock())
+    stream.session.state = State.PLAYING
+    stream_manager.stream = stream
+
+    event_manager.subscribe(MagicMock(), topic_filter=EventTopic.RELAY)
+    event_manager.subscribe(MagicMock(), topic_filter=EventTopic.PIR)
+    await asyncio.sleep(0)
+    await asyncio.gather(*stream_manager.background_tasks)
+    stream._ws.send_json.assert_called_once()
+    assert stream.event_filter_list == [
+        {"topicFilter": "tns1:Device/Trigger/Relay//."},
+        {"topicFilter": "tns1:Device/tnsaxis:Sensor/PIR//."},
+    ]
+
+    # Unchanged filters are not sent again
+    stream_manager._update_event_filter()
+    assert stream_manager.background_tasks == set()
+
+    # Only websocket streams are refiltered
+    stream_manager.stream = None
+    stream_manager._update_event_filter()
+    assert stream_manager.background_tasks == set()
+
+
+async def test_websocket_event_filter_sent_once_playing(stream_manager):
+    """Verify filters changed while connecting are sent once the stream plays."""
+    stream_manager.event = True
+    stream_manager.device.config.websocket_force = True
+    event_manager = stream_manager.device.event
+    stream = stream_manager.stream = stream_manager._build_stream()
+    stream._ws = MagicMock(send_json=AsyncMock())
+
+    # Subscriptions may change outside of the event loop
+    await asyncio.to_thread(
+        event_manager.subscribe, MagicMock(), topic_filter=EventTopic.PIR
+    )
+    await asyncio.sleep(0)
+    stream._ws.send_json.assert_not_called()
+
+    stream.session.state = State.PLAYING
+    stream_manager.session_callback(Signal.PLAYING)
+    await asyncio.sleep(0)
+    await asyncio.gather(*stream_manager.background_tasks)
+    stream._ws.send_json.assert_called_once()
+    assert stream.event_filter_list == [
+        {"topicFilter": "tns1:Device/tnsaxis:Sensor/PIR//."}
+    ]
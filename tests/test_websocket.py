@@ -13,8 +13,15 @@ import orjson
 import pytest
 
 from axis.models.api_discovery import ApiId
+from axis.models.configuration import OverflowPolicy
+from axis.models.event import Event
 from axis.rtsp import Signal, State
-from axis.websocket import WebSocketClient
+from axis.websocket import (
+    WebSocketClient,
+    _parse_ws_notification,
+    notification_to_event,
+    topic_filter_list,
+)
 
 
 class MockWebSocket:
@@ -165,9 +172,9 @@ async def test_websocket_stream_receives_data(axis_device):
         await client._receiver_task
 
     assert callback.call_args_list[0].args[0] == Signal.PLAYING
-    assert callback.call_args_list[1].args[0] == Signal.DATA
+    assert callback.call_args_list[1].args[0] == Signal.DATA_BATCH
     assert callback.call_args_list[2].args[0] == Signal.FAILED
-    assert client.data == {
+    assert client.data.data == {
         "topic": "tns1:Device/Trigger/Relay",
         "source": "port",
         "source_idx": "2",
@@ -185,6 +192,70 @@ async def test_websocket_stream_receives_data(axis_device):
     )
 
 
+async def test_websocket_notifications_are_batched(axis_device):
+    """Verify notifications of one receive cycle are signalled as one batch."""
+    callback = MagicMock()
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        callback,
+    )
+    for port in ("1", "2", "3"):
+        client._handle_message(
+            _notify_msg("tns1:Device/Trigger/Relay", "port", port, "active", "1").data
+        )
+    callback.assert_not_called()
+
+    await asyncio.sleep(0)
+    callback.assert_called_once_with(Signal.DATA_BATCH)
+    assert [event.id for event in client.drain()] == ["1", "2", "3"]
+    assert client.drain() == []
+
+    # Empty batch is not signalled
+    client._signal_batch()
+    callback.assert_called_once()
+
+
+@pytest.mark.parametrize("policy", list(OverflowPolicy))
+async def test_websocket_burst_larger_than_buffer(axis_device, policy):
+    """Verify a burst read without yielding is signalled before the buffer overflows.
+
+    Overflow policies only apply when the consumer does not drain the buffer.
+    """
+    axis_device.config.event_buffer_size = 2
+    axis_device.config.event_overflow_policy = policy
+    axis_device.enable_events()
+    subscriber = MagicMock()
+    axis_device.event.subscribe(subscriber)
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        axis_device.stream.session_callback,
+    )
+    axis_device.stream.stream = client
+    client._ws = MockWebSocket(
+        _configure_ok_msg(),
+        [
+            *(
+                _notify_msg("tns1:Device/Trigger/Relay", "port", "1", "active", value)
+                for value in ("0", "1") * 5
+            ),
+            SimpleNamespace(type=aiohttp.WSMsgType.CLOSED, data=None),
+        ],
+    )
+    with patch.object(axis_device.stream, "retry"):
+        await client._receiver()
+
+    assert [call.args[0].state for call in subscriber.call_args_list] == [
+        "0",
+        "1",
+    ] * 5
+    assert client.queue_stats.enqueued == 10
+    assert client.queue_stats.dropped == 0
+    assert client.queue_stats.collapsed == 0
+    assert client.queue_stats.paused == 0
+
+
 async def test_websocket_stream_prefers_active_value(axis_device):
     """Verify websocket parsing prefers active when multiple data keys are present."""
     callback = MagicMock()
@@ -225,7 +296,7 @@ async def test_websocket_stream_prefers_active_value(axis_device):
         await client.start()
         await client._receiver_task
 
-    assert client.data == {
+    assert client.data.data == {
         "topic": "tnsaxis:CameraApplicationPlatform/ObjectAnalytics/Device1Scenario1",
         "source": "device",
         "source_idx": "1",
@@ -624,6 +695,32 @@ async def test_websocket_receiver_does_not_signal_failed_when_stopped(axis_devic
     callback.assert_not_called()
 
 
+async def test_websocket_no_events_after_stream_manager_stop(axis_device):
+    """Verify buffered notifications are not dispatched once the stream is stopped."""
+    axis_device.config.websocket_force = True
+    axis_device.enable_events()
+    callback = MagicMock()
+    axis_device.event.subscribe(callback)
+
+    client = axis_device.stream.stream = axis_device.stream._build_stream()
+    assert isinstance(client, WebSocketClient)
+    client._ws = BlockingWebSocket(_configure_ok_msg())
+    client.session.state = State.PLAYING
+    client._receiver_task = asyncio.create_task(client._receiver())
+    await asyncio.sleep(0)
+
+    msg = _notify_msg("tns1:Device/Trigger/Relay", "port", "2", "active", "1")
+    client._handle_message(msg.data)
+    assert client._batch_handle is not None
+
+    axis_device.stream.stop()
+    assert client._batch_handle is None
+    assert len(client._data) == 0
+
+    await asyncio.sleep(0.01)
+    callback.assert_not_called()
+
+
 async def test_websocket_close_with_no_session(axis_device):
     """Verify close() handles missing websocket session branch."""
     client = WebSocketClient(
@@ -654,3 +751,141 @@ async def test_websocket_close_owned_session_is_closed(axis_device):
     await client._close()
 
     owned_session.close.assert_awaited_once()
+
+
+def test_topic_filter_list():
+    """Verify topic filters cover subtopics and default to all topics."""
+    assert topic_filter_list(None) == [{"topicFilter": "//."}]
+    assert topic_filter_list(["tns1:Device/tnsaxis:Sensor/PIR"]) == [
+        {"topicFilter": "tns1:Device/tnsaxis:Sensor/PIR//."}
+    ]
+
+
+async def test_websocket_reconfigure(axis_device):
+    """Verify event filters are sent over the live connection when playing."""
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        MagicMock(),
+    )
+    event_filter_list = topic_filter_list(["tns1:Device/Trigger/Relay"])
+    await client.reconfigure(event_filter_list)
+    assert client.event_filter_list == topic_filter_list(None)
+    assert client._configure_payload["params"] == {"eventFilterList": event_filter_list}
+
+    # Pending filters are sent with events:configure on connect
+    client._ws = MockWebSocket(_configure_ok_msg(), [])
+    await client._configure()
+    assert client.event_filter_list == event_filter_list
+
+    client.session.state = State.PLAYING
+    await client.reconfigure(topic_filter_list(None))
+    client._ws.send_json.assert_called_with(client._configure_payload)
+    client._ws.receive.assert_called_once()
+    assert client.event_filter_list == topic_filter_list(None)
+
+    client._ws.send_json.side_effect = aiohttp.ClientError("closed")
+    await client.reconfigure(event_filter_list)
+    assert client.event_filter_list == topic_filter_list(None)
+
+
+@pytest.mark.parametrize(
+    "notification",
+    [
+        {
+            "topic": "tns1:Device/Trigger/Relay",
+            "message": {
+                "source": {"RelayToken": "3"},
+                "data": {"LogicalState": "active"},
+            },
+        },
+        {
+            "topic": "tns1:Device/tnsaxis:IO/Port",
+            "message": {"source": {"port": "-1"}, "data": {"state": 1}},
+        },
+        {
+            "topic": "tnsaxis:CameraApplicationPlatform/VMD/Camera1ProfileANY",
+            "message": {"source": {}, "data": {"active": "1"}},
+        },
+        {
+            "topic": "tnsaxis:CameraApplicationPlatform/ObjectAnalytics/Device1Scenario1",
+            "message": {"source": {"device": 1}, "data": {"classTypes": "human"}},
+        },
+        {"topic": "tns1:Device/tnsaxis:Sensor/PIR", "message": None},
+    ],
+)
+def test_notification_to_event(notification):
+    """Verify events built from notifications equal the two step decode."""
+    parsed = _parse_ws_notification(notification)
+    assert notification_to_event(notification) == Event.decode(parsed)
+    assert notification_to_event(notification, False) == Event.decode(parsed, False)
+
+
+def _relay_msgs(*ports: str) -> list[SimpleNamespace]:
+    """Build events:notify messages of relay ports."""
+    return [
+        _notify_msg("tns1:Device/Trigger/Relay", "RelayToken", port, "active", "1")
+        for port in ports
+    ]
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected", "dropped", "collapsed"),
+    [
+        (OverflowPolicy.DROP_OLDEST, ["2", "1"], 1, 0),
+        (OverflowPolicy.DROP_NEWEST, ["1", "2"], 1, 0),
+        (OverflowPolicy.LATEST_PER_KEY, ["2", "1"], 0, 1),
+    ],
+)
+async def test_websocket_buffer_overflow(
+    axis_device, policy, expected, dropped, collapsed
+):
+    """Verify buffer size and overflow policy are configurable and counted."""
+    axis_device.config.event_buffer_size = 2
+    axis_device.config.event_overflow_policy = policy
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        MagicMock(),
+    )
+    axis_device.stream.stream = client
+    for msg in _relay_msgs("1", "2", "1"):
+        client._handle_message(msg.data)
+
+    assert [event.id for event in client.drain()] == expected
+    assert axis_device.stream.queue_stats is client.queue_stats
+    assert client.queue_stats.enqueued == 3
+    assert client.queue_stats.dropped == dropped
+    assert client.queue_stats.collapsed == collapsed
+
+
+async def test_websocket_backpressure(axis_device):
+    """Verify reading pauses while the buffer is full instead of dropping."""
+    axis_device.config.event_buffer_size = 2
+    axis_device.config.event_overflow_policy = OverflowPolicy.BACKPRESSURE
+    callback = MagicMock()
+    client = WebSocketClient(
+        axis_device,
+        "ws://127.0.0.1:80/vapix/ws-data-stream?sources=events",
+        callback,
+    )
+    client._ws = MockWebSocket(
+        _configure_ok_msg(),
+        [
+            *_relay_msgs("1", "2", "3"),
+            SimpleNamespace(type=aiohttp.WSMsgType.CLOSED, data=None),
+        ],
+    )
+    receiver = asyncio.create_task(client._receiver())
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert not receiver.done()
+    callback.assert_called_once_with(Signal.DATA_BATCH)
+    assert client.queue_stats.paused == 1
+    assert [event.id for event in client.drain()] == ["1", "2"]
+
+    await receiver
+    assert client.data.id == "3"
+    assert client.queue_stats.dropped == 0
+    assert callback.call_args.args[0] == Signal.FAILED